@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+# benchmarks/__init__.py
+# 性能基准测试包，使用 python -m benchmarks.<模块名> 运行
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_gestures.py
+# 手势判定基准测试：比较逐字段读取的单规则判定与向量化引擎在不同规则数量下的每帧耗时
+#
+# 用法：
+#   python -m benchmarks.bench_gestures --frames 20000 --rules 1 4 16 64 --hands 1 2
+#
+# 使用合成关键点（与MediaPipe结果结构相同的对象），不需要摄像头和模型：
+#   - legacy: 改造前的写法，逐个读取拇指和小指指尖的protobuf字段计算曼哈顿距离
+#   - engine: 关键点一次性转换为(手数, 21, 3)数组后由GestureEngine判定所有规则（含转换耗时）
+# 结果以JSON输出（每帧耗时的均值和p50/p95/p99，单位微秒）。
+
+import argparse
+import json
+import time
+from types import SimpleNamespace
+
+import numpy as np
+from config import CONFIG, GestureConfig
+from modules.gesture_engine import GestureEngine, landmarks_to_array
+
+THUMB_TIP = 4
+PINKY_TIP = 20
+
+def make_hands(count, hands, seed=0):
+    """生成count帧合成检测结果，每帧hands只手"""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for _ in range(count):
+        frames.append([
+            SimpleNamespace(landmark=[
+                SimpleNamespace(x=float(x), y=float(y), z=float(z))
+                for x, y, z in rng.random((21, 3), dtype=np.float32)
+            ])
+            for _ in range(hands)
+        ])
+    return frames
+
+def make_rules(count, seed=0):
+    """生成count条规则，距离、角度、弯曲三种类型轮流出现"""
+    rng = np.random.default_rng(seed)
+    kinds = (("distance", 2), ("angle", 3), ("curl", 3))
+    rules = []
+    for i in range(count):
+        kind, n = kinds[i % len(kinds)]
+        points = tuple(int(p) for p in rng.choice(21, size=n, replace=False))
+        threshold = {"distance": 0.3, "angle": 90.0, "curl": 1.0}[kind]
+        rules.append(GestureConfig(f"rule{i}", kind, points, threshold))
+    return rules
+
+def _legacy(multi_hand_landmarks):
+    """改造前的判定：只看第一只手，逐字段读取"""
+    hand = multi_hand_landmarks[0]
+    thumb = hand.landmark[THUMB_TIP]
+    pinky = hand.landmark[PINKY_TIP]
+    return abs(thumb.x - pinky.x) + abs(thumb.y - pinky.y) < CONFIG.gesture_threshold
+
+def _engine(engine):
+    """改造后的判定：一次转换，所有规则一起求值"""
+    def detect(multi_hand_landmarks):
+        points = landmarks_to_array(multi_hand_landmarks)
+        return bool(engine.detect(engine.reduce(engine.measure(points))).any())
+    return detect
+
+def run_case(name, func, frames, repeat):
+    """对每帧调用func并记录耗时（微秒）"""
+    samples = np.empty(len(frames) * repeat, dtype=np.float64)
+    i = 0
+    for _ in range(repeat):
+        for hands in frames:
+            start = time.perf_counter()
+            func(hands)
+            samples[i] = (time.perf_counter() - start) * 1e6
+            i += 1
+    return {
+        'case': name,
+        'calls': int(samples.size),
+        'per_frame_us': {
+            'mean': float(samples.mean()),
+            'p50': float(np.percentile(samples, 50)),
+            'p95': float(np.percentile(samples, 95)),
+            'p99': float(np.percentile(samples, 99))
+        }
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="手势判定基准测试")
+    parser.add_argument("--frames", type=int, default=2000, help="合成的帧数")
+    parser.add_argument("--repeat", type=int, default=5, help="每帧重复判定的次数")
+    parser.add_argument("--rules", type=int, nargs="+", default=[1, 4, 16, 64], help="测试的规则数量")
+    parser.add_argument("--hands", type=int, nargs="+", default=[1, 2], help="每帧的手数")
+    parser.add_argument("--output", help="结果JSON输出路径，默认打印到标准输出")
+    args = parser.parse_args()
+
+    results = []
+    for hands in args.hands:
+        frames = make_hands(args.frames, hands)
+        # 预热，避免首次调用的内存分配影响结果
+        run_case("warm-up", _legacy, frames[:100], 1)
+        case = run_case("legacy", _legacy, frames, args.repeat)
+        case['hands'] = hands
+        results.append(case)
+        for count in args.rules:
+            engine = GestureEngine(make_rules(count), CONFIG.gesture_threshold)
+            case = run_case(f"engine-{count}", _engine(engine), frames, args.repeat)
+            case.update(hands=hands, rules=count)
+            results.append(case)
+        convert = run_case("convert-only", landmarks_to_array, frames, args.repeat)
+        convert['hands'] = hands
+        results.append(convert)
+
+    text = json.dumps({'results': results}, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_inference_size.py
+# 推理尺寸基准测试：比较不同推理输入尺寸下的检测延迟和手势判定准确率
+#
+# 用法：
+#   python -m benchmarks.bench_inference_size --video recordings/bed1.mp4 --sizes 0 640 480 320 256
+#
+# 尺寸0表示不缩放，作为参照结果。若提供 --labels（CSV，每行"帧序号,是否为目标手势"），
+# 则准确率相对人工标注计算；否则相对不缩放的参照结果计算一致率。
+#
+# 检测路径与应用一致：CONFIG.shared_inference为True时通过共享推理服务（视频模式模型、
+# CONFIG.max_num_hands、摄像头自己的检测置信度），否则使用与VideoProcessor
+# 相同参数的独立模型。每个尺寸使用新的模型，跟踪状态互不影响。
+
+import argparse
+import csv
+import json
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+from config import CONFIG, init_system
+from modules.gesture_engine import GestureEngine, landmarks_to_array
+from modules.inference_service import InferenceService
+
+def load_roi_frames(path, camera_id, max_frames):
+    """读取视频并按摄像头配置裁剪ROI
+
+    Args:
+        path: 视频文件路径
+        camera_id: 使用哪个摄像头的ROI配置
+        max_frames: 最多读取的帧数
+
+    Returns:
+        list: ROI图像列表（BGR）
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"无法打开视频: {path}")
+    roi = CONFIG.cameras[camera_id].roi
+    frames = []
+    try:
+        while len(frames) < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            h, w = frame.shape[:2]
+            x1 = max(0, min(roi["x"], w - 1))
+            y1 = max(0, min(roi["y"], h - 1))
+            x2 = min(x1 + roi["w"], w)
+            y2 = min(y1 + roi["h"], h)
+            frames.append(np.ascontiguousarray(frame[y1:y2, x1:x2]))
+    finally:
+        cap.release()
+    return frames
+
+def load_labels(path):
+    """读取人工标注，返回 {帧序号: 是否为目标手势}"""
+    labels = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) >= 2 and row[0].strip().isdigit():
+                labels[int(row[0])] = row[1].strip() not in ("0", "", "false", "False")
+    return labels
+
+def target_size(width, height, size):
+    """按长边等比缩放后的尺寸，与VideoProcessor的缩放规则一致"""
+    if not size or max(width, height) <= size:
+        return width, height
+    scale = size / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def make_detector(camera_id):
+    """创建与应用相同配置的检测函数
+
+    Returns:
+        tuple: (detect(rgb) -> MediaPipe检测结果, close())
+    """
+    min_confidence = CONFIG.cameras[camera_id].min_confidence
+    if CONFIG.shared_inference:
+        service = InferenceService(1)
+        service.start()
+        service.register(camera_id, min_confidence)
+
+        def close():
+            service.unregister(camera_id)
+            service.shutdown()
+        return lambda rgb: service.submit(camera_id, rgb).result(), close
+
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=CONFIG.max_num_hands,
+        min_detection_confidence=min_confidence,
+        min_tracking_confidence=0.5,
+        model_complexity=0
+    )
+    return hands.process, hands.close
+
+def run_size(frames, size, camera_id):
+    """在指定推理尺寸下运行检测
+
+    Returns:
+        tuple: (每帧延迟列表（毫秒）, 每帧形状为(手数, 21, 3)的关键点数组列表)
+    """
+    h, w = frames[0].shape[:2]
+    dims = target_size(w, h, size)
+    resize_buffer = np.empty((dims[1], dims[0], 3), dtype=np.uint8)
+    rgb_buffer = np.empty((dims[1], dims[0], 3), dtype=np.uint8)
+    latencies, landmarks = [], []
+    detect, close = make_detector(camera_id)
+    try:
+        for frame in frames:
+            start = time.perf_counter()
+            source = frame
+            if dims != (w, h):
+                cv2.resize(frame, dims, dst=resize_buffer, interpolation=cv2.INTER_AREA)
+                source = resize_buffer
+            rgb = cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=rgb_buffer)
+            results = detect(rgb)
+            latencies.append((time.perf_counter() - start) * 1000)
+            landmarks.append(landmarks_to_array(results.multi_hand_landmarks))
+    finally:
+        close()
+    return latencies, landmarks
+
+def is_gesture(points, engine, aspect):
+    """与VideoProcessor._detect_gesture相同的判定规则（不含平滑和ROI划分）"""
+    if not len(points):
+        return False
+    return bool(engine.detect(engine.reduce(engine.measure(points, aspect))).any())
+
+def summarize(size, latencies, landmarks, reference, labels, aspect):
+    """汇总单个尺寸的延迟和准确率指标"""
+    latency = np.asarray(latencies)
+    engine = GestureEngine(CONFIG.gestures, CONFIG.gesture_threshold)
+    gestures = [is_gesture(p, engine, aspect) for p in landmarks]
+    result = {
+        'inference_size': size or None,
+        'frames': len(latencies),
+        'latency_ms': {
+            'mean': float(latency.mean()),
+            'p50': float(np.percentile(latency, 50)),
+            'p95': float(np.percentile(latency, 95)),
+            'p99': float(np.percentile(latency, 99))
+        },
+        'hand_detection_rate': float(np.mean([len(p) > 0 for p in landmarks]))
+    }
+
+    if labels:
+        labelled = [i for i in labels if i < len(gestures)]
+        correct = sum(gestures[i] == labels[i] for i in labelled)
+        result['gesture_accuracy'] = correct / len(labelled) if labelled else None
+    else:
+        ref_gestures = [is_gesture(p, engine, aspect) for p in reference]
+        result['gesture_agreement'] = float(np.mean([a == b for a, b in zip(gestures, ref_gestures)]))
+
+    # 与参照结果都检测到手的帧上，第一只手关键点的平均归一化误差
+    errors = [
+        float(np.linalg.norm(a[0, :, :2] - b[0, :, :2], axis=1).mean())
+        for a, b in zip(landmarks, reference) if len(a) and len(b)
+    ]
+    result['landmark_error'] = float(np.mean(errors)) if errors else None
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="推理尺寸延迟/准确率基准测试")
+    parser.add_argument("--video", required=True, help="录制的视频文件")
+    parser.add_argument("--camera", type=int, default=0, help="使用哪个摄像头的ROI配置")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 640, 480, 320, 256],
+                        help="推理长边尺寸列表，0表示不缩放")
+    parser.add_argument("--max-frames", type=int, default=600)
+    parser.add_argument("--labels", help="可选的人工标注CSV")
+    parser.add_argument("--output", help="结果JSON输出路径，默认打印到标准输出")
+    args = parser.parse_args()
+    init_system()
+
+    frames = load_roi_frames(args.video, args.camera, args.max_frames)
+    if not frames:
+        raise SystemExit("视频中没有可用的帧")
+    labels = load_labels(args.labels) if args.labels else None
+
+    # 先运行不缩放的参照
+    sizes = [0] + [s for s in args.sizes if s]
+    runs = {size: run_size(frames, size, args.camera) for size in sizes}
+    reference = runs[0][1]
+    h, w = frames[0].shape[:2]
+    report = {
+        'video': args.video,
+        'shared_inference': CONFIG.shared_inference,
+        'max_num_hands': CONFIG.max_num_hands,
+        'roi_size': [w, h],
+        'results': [summarize(size, *runs[size], reference, labels, w / h) for size in sizes]
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+
+if __name__ == '__main__':
+    main()
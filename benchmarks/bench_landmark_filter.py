@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_landmark_filter.py
+# 关键点滤波基准测试：在关键点轨迹上比较不同检测间隔下各平滑方式的误报和漏报
+#
+# 用法：
+#   python -m benchmarks.bench_landmark_filter --generate --duration 600
+#   python -m benchmarks.bench_landmark_filter --video recordings/bed1.mp4 --save-trace bed1.npz
+#   python -m benchmarks.bench_landmark_filter --trace bed1.npz --labels bed1_labels.csv --intervals 0.1 0.2 0.4 0.8
+#
+# 轨迹为每帧第一只手的关键点（ROI归一化坐标），没有手的帧为NaN。按各检测间隔对轨迹降采样后，
+# 用CONFIG.gestures判定手势并模拟报警计时（首次达到最短报警时长即视为报警），比较：
+#   - raw:      不做平滑
+#   - ema:      对手势数值做指数平滑（smooth_factor，手消失后不重置，与改造前一致）
+#   - one_euro: LandmarkFilter逐关键点滤波（与VideoProcessor一致）
+# 参照结果：--generate时为合成轨迹的真实手势；提供--labels（CSV，每行"帧序号,是否为目标手势"）时为人工标注；
+# 否则为全帧率原始判定结果经过--truth-window秒中值滤波后的结果。
+# 结果以JSON输出（误报次数、漏报次数、报警延迟和判定翻转次数）。
+
+import argparse
+import csv
+import json
+
+import numpy as np
+from config import CONFIG, init_system
+from modules.gesture_engine import GestureEngine, LANDMARK_COUNT
+from modules.landmark_filter import LandmarkFilter
+
+THUMB_TIP = 4
+PINKY_TIP = 20
+
+def generate_trace(duration, fps, threshold, noise, outlier_rate, seed=0):
+    """生成合成轨迹：手缓慢移动，拇指与小指交替靠近/张开，偶尔离开画面
+
+    拇指与小指指尖的距离在手势时为阈值的0.7倍、张开时为阈值的1.5倍；
+    noise为每个坐标分量的抖动标准差（归一化坐标），离群帧的抖动为其5倍。
+
+    Returns:
+        tuple: (时间戳, 关键点(N, 21, 3)，无手时为NaN, 真实手势(N,))
+    """
+    rng = np.random.default_rng(seed)
+    count = int(duration * fps)
+    timestamps = np.arange(count) / fps
+    template = rng.normal(0, 0.04, size=(LANDMARK_COUNT, 3)).astype(np.float32)
+    template[0] = (0.0, 0.08, 0.0)
+
+    # 按片段生成真实状态：0=无手，1=张开，2=手势（拇指小指靠近）
+    states = np.empty(count, dtype=np.int8)
+    i = 0
+    while i < count:
+        state = rng.choice([0, 1, 2], p=[0.1, 0.45, 0.45])
+        length = {0: rng.uniform(0.5, 3), 1: rng.uniform(2, 15), 2: rng.uniform(2, 20)}[state]
+        end = min(count, i + int(length * fps))
+        states[i:end] = state
+        i = end
+
+    points = np.empty((count, LANDMARK_COUNT, 3), dtype=np.float32)
+    center = np.stack([
+        0.5 + 0.1 * np.sin(2 * np.pi * 0.05 * timestamps),
+        0.5 + 0.05 * np.sin(2 * np.pi * 0.11 * timestamps + 1.0)
+    ], axis=1)
+    points[:] = template
+    points[:, :, :2] += center[:, None, :]
+    spread = np.where(states == 2, 0.7 * threshold, 1.5 * threshold)
+    points[:, THUMB_TIP, 0] = center[:, 0] - spread / 2
+    points[:, PINKY_TIP, 0] = center[:, 0] + spread / 2
+    points[:, THUMB_TIP, 1] = points[:, PINKY_TIP, 1] = center[:, 1]
+
+    points += rng.normal(0, noise, size=points.shape).astype(np.float32)
+    outliers = rng.random(count) < outlier_rate
+    points[outliers] += rng.normal(0, 5 * noise, size=(outliers.sum(), LANDMARK_COUNT, 3)).astype(np.float32)
+    points[states == 0] = np.nan
+    return timestamps, points, states == 2
+
+def record_trace(path, camera_id, max_frames):
+    """在录像的每一帧上运行MediaPipe（视频模式），记录第一只手的关键点"""
+    import cv2
+    import mediapipe as mp
+    from benchmarks.bench_inference_size import load_roi_frames
+
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    cap.release()
+    frames = load_roi_frames(path, camera_id, max_frames)
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=1,
+        min_detection_confidence=CONFIG.cameras[camera_id].min_confidence,
+        min_tracking_confidence=0.5,
+        model_complexity=0
+    )
+    points = np.full((len(frames), LANDMARK_COUNT, 3), np.nan, dtype=np.float32)
+    try:
+        for i, frame in enumerate(frames):
+            results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            if results.multi_hand_landmarks:
+                landmarks = results.multi_hand_landmarks[0].landmark
+                points[i] = [(p.x, p.y, p.z) for p in landmarks]
+    finally:
+        hands.close()
+    return np.arange(len(frames)) / fps, points
+
+def load_labels(path, count):
+    """读取人工标注，未标注的帧视为非手势"""
+    labels = np.zeros(count, dtype=bool)
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if row and int(row[0]) < count:
+                labels[int(row[0])] = row[1].strip().lower() in ("1", "true", "yes")
+    return labels
+
+def detect_trace(timestamps, points, engine, interval, method, smooth_factor, filter_args):
+    """按检测间隔降采样并逐次判定手势
+
+    Returns:
+        tuple: (采样帧索引, 各采样点的判定结果)
+    """
+    indices = []
+    next_time = timestamps[0]
+    for i, t in enumerate(timestamps):
+        if t >= next_time:
+            indices.append(i)
+            next_time = max(next_time + interval, t)
+    indices = np.asarray(indices)
+
+    landmark_filter = LandmarkFilter(**filter_args) if method == "one_euro" else None
+    smoothed = None
+    detected = np.zeros(len(indices), dtype=bool)
+    for k, i in enumerate(indices):
+        hand = points[i]
+        hand = hand[None] if not np.isnan(hand[0, 0]) else hand[:0]
+        if landmark_filter is not None:
+            hand = landmark_filter(hand, timestamps[i])
+        if not len(hand):
+            continue
+        values = engine.reduce(engine.measure(hand))
+        if method == "ema":
+            if smoothed is not None:
+                values = smooth_factor * values + (1 - smooth_factor) * smoothed
+            smoothed = values
+        detected[k] = engine.detect(values).any()
+    return indices, detected
+
+def alarm_times(times, detected, trigger):
+    """模拟报警计时：连续检测到手势达到trigger秒时报警，未检测到时立即重置"""
+    alarms = []
+    start = None
+    fired = False
+    for t, hit in zip(times, detected):
+        if not hit:
+            start, fired = None, False
+            continue
+        if start is None:
+            start = t
+        if not fired and t - start >= trigger:
+            alarms.append(t)
+            fired = True
+    return alarms
+
+def truth_episodes(timestamps, truth):
+    """真实手势片段 [(开始, 结束)]"""
+    episodes = []
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], truth.astype(np.int8), [0]))))
+    for start, end in zip(edges[::2], edges[1::2]):
+        episodes.append((timestamps[start], timestamps[end - 1]))
+    return episodes
+
+def evaluate(timestamps, truth, indices, detected, trigger):
+    """统计误报、漏报、报警延迟和判定翻转次数"""
+    times = timestamps[indices]
+    alarms = alarm_times(times, detected, trigger)
+    episodes = [(s, e) for s, e in truth_episodes(timestamps, truth) if e - s >= trigger]
+    false_alarms = [
+        a for a in alarms
+        if not any(s + trigger - 0.5 <= a <= e + 0.5 for s, e in episodes)
+    ]
+    latencies = []
+    missed = 0
+    for s, e in episodes:
+        hits = [a for a in alarms if s + trigger - 0.5 <= a <= e + 0.5]
+        if hits:
+            latencies.append(hits[0] - (s + trigger))
+        else:
+            missed += 1
+    sample_truth = truth[indices]
+    return {
+        'samples': int(len(indices)),
+        'true_alarms': len(episodes),
+        'false_alarms': len(false_alarms),
+        'missed_alarms': missed,
+        'alarm_latency_s': float(np.mean(latencies)) if latencies else None,
+        'sample_accuracy': float(np.mean(sample_truth == detected)),
+        'flips': int(np.count_nonzero(np.diff(detected.astype(np.int8))))
+    }
+
+def median_truth(timestamps, raw, window):
+    """对全帧率原始判定做中值滤波，作为没有人工标注时的参照"""
+    fps = 1.0 / np.median(np.diff(timestamps))
+    half = max(1, int(window * fps / 2))
+    padded = np.pad(raw.astype(np.float32), half, mode='edge')
+    cumsum = np.concatenate(([0.0], np.cumsum(padded)))
+    mean = (cumsum[2 * half + 1:] - cumsum[:-2 * half - 1]) / (2 * half + 1)
+    return mean > 0.5
+
+def main():
+    parser = argparse.ArgumentParser(description="关键点滤波误报/漏报基准测试")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--generate", action="store_true", help="使用合成轨迹")
+    source.add_argument("--video", help="录像文件，逐帧运行MediaPipe生成轨迹")
+    source.add_argument("--trace", help="之前保存的轨迹（.npz）")
+    parser.add_argument("--save-trace", help="保存轨迹的路径（.npz）")
+    parser.add_argument("--labels", help="人工标注CSV")
+    parser.add_argument("--camera", type=int, default=0, help="使用哪个摄像头的ROI配置")
+    parser.add_argument("--max-frames", type=int, default=100000)
+    parser.add_argument("--duration", type=float, default=600, help="合成轨迹时长（秒）")
+    parser.add_argument("--fps", type=float, default=30, help="合成轨迹帧率")
+    parser.add_argument("--noise", type=float, default=0.008, help="合成抖动标准差（归一化坐标）")
+    parser.add_argument("--outlier-rate", type=float, default=0.02, help="合成离群帧比例")
+    parser.add_argument("--threshold", type=float,
+                        help="覆盖CONFIG.gesture_threshold；合成轨迹默认使用0.08（接近真实手部尺寸）")
+    parser.add_argument("--intervals", type=float, nargs="+", default=[0.1, 0.2, 0.4, 0.8], help="检测间隔（秒）")
+    parser.add_argument("--truth-window", type=float, default=0.5, help="参照结果的中值滤波窗口（秒）")
+    parser.add_argument("--output", help="结果JSON输出路径，默认打印到标准输出")
+    args = parser.parse_args()
+
+    init_system()
+    threshold = args.threshold if args.threshold is not None else (0.08 if args.generate else CONFIG.gesture_threshold)
+    engine = GestureEngine(CONFIG.gestures, threshold)
+    truth = None
+    if args.generate:
+        timestamps, points, truth = generate_trace(
+            args.duration, args.fps, float(engine.thresholds[0]), args.noise, args.outlier_rate
+        )
+    elif args.video:
+        timestamps, points = record_trace(args.video, args.camera, args.max_frames)
+    else:
+        data = np.load(args.trace)
+        timestamps, points = data['timestamps'], data['points']
+        truth = data['truth'] if 'truth' in data else None
+    if args.save_trace:
+        extra = {'truth': truth} if truth is not None else {}
+        np.savez_compressed(args.save_trace, timestamps=timestamps, points=points, **extra)
+
+    if args.labels:
+        truth = load_labels(args.labels, len(timestamps))
+    elif truth is None:
+        _, raw = detect_trace(timestamps, points, engine, 0, "raw", 1.0, {})
+        truth = median_truth(timestamps, raw, args.truth_window)
+
+    trigger = min(CONFIG.alarm_triggers)
+    filter_args = dict(
+        min_cutoff=CONFIG.landmark_min_cutoff, beta=CONFIG.landmark_beta, d_cutoff=CONFIG.landmark_d_cutoff,
+        max_gap=CONFIG.landmark_max_gap, match_distance=CONFIG.landmark_match_distance
+    )
+    results = []
+    for interval in args.intervals:
+        for method in ("raw", "ema", "one_euro"):
+            indices, detected = detect_trace(
+                timestamps, points, engine, interval, method, CONFIG.smooth_factor, filter_args
+            )
+            result = {'interval': interval, 'method': method}
+            result.update(evaluate(timestamps, truth, indices, detected, trigger))
+            results.append(result)
+
+    report = {
+        'frames': int(len(timestamps)),
+        'duration_s': float(timestamps[-1] - timestamps[0]),
+        'alarm_trigger_s': trigger,
+        'results': results
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_logging.py
+# 日志开销基准测试：比较同步文件日志与异步队列日志在处理线程上的每帧耗时
+#
+# 用法：
+#   python -m benchmarks.bench_logging --frames 20000 --threads 4
+#
+# 模拟处理循环每帧的日志调用（一条INFO级别以下被过滤的DEBUG和一条INFO），
+# 分别测量：
+#   - sync:  处理器直接挂载RotatingFileHandler，使用f-string（改造前）
+#   - queue: 挂载DroppingQueueHandler，由后台线程写文件，使用惰性格式化（改造后）
+# 结果以JSON输出（每帧耗时的均值和p50/p95/p99，单位微秒）。
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+from threading import Thread, Barrier
+
+import numpy as np
+from config import create_log_handlers, create_queue_logging
+
+def _eager_frame(logger, camera_id, duration):
+    """改造前的写法：无论级别是否生效都会先构造字符串"""
+    logger.debug(f"Camera {camera_id} 检测时长: {duration:.1f}秒")
+    logger.info(f"Camera {camera_id} 触发 {duration:.0f}秒 报警")
+
+def _lazy_frame(logger, camera_id, duration):
+    """改造后的写法：只有级别生效时才格式化"""
+    logger.debug("Camera %s 检测时长: %.1f秒", camera_id, duration)
+    logger.info("Camera %s 触发 %.0f秒 报警", camera_id, duration)
+
+def _drive(logger, frame_func, camera_id, frames, barrier, samples):
+    """在单个线程上模拟frames帧的日志调用，记录每帧耗时（微秒）"""
+    barrier.wait()
+    for i in range(frames):
+        start = time.perf_counter()
+        frame_func(logger, camera_id, i * 0.033)
+        samples.append((time.perf_counter() - start) * 1e6)
+
+def run_mode(mode, frames, threads, queue_size, log_dir):
+    """运行一种日志配置
+
+    Args:
+        mode: "sync" 或 "queue"
+        frames: 每个线程模拟的帧数
+        threads: 并发的处理线程数
+        queue_size: 队列模式下的队列容量
+        log_dir: 日志输出目录
+
+    Returns:
+        dict: 该配置的测试结果
+    """
+    logger = logging.getLogger(f"bench_logging.{mode}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    # 只保留文件处理器，避免控制台输出干扰测量
+    file_handler = create_log_handlers(os.path.join(log_dir, f"{mode}.log"))[0]
+    listener = None
+    if mode == "sync":
+        logger.addHandler(file_handler)
+        frame_func = _eager_frame
+    else:
+        handler, listener = create_queue_logging([file_handler], queue_size)
+        logger.addHandler(handler)
+        frame_func = _lazy_frame
+
+    samples = [[] for _ in range(threads)]
+    barrier = Barrier(threads + 1)
+    workers = [
+        Thread(target=_drive, args=(logger, frame_func, i, frames, barrier, samples[i]))
+        for i in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    wall_time = time.perf_counter() - start
+
+    dropped = 0
+    if listener is not None:
+        dropped = logger.handlers[0].dropped
+        listener.stop()
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    file_handler.close()
+
+    data = np.asarray([v for thread in samples for v in thread], dtype=np.float64)
+    return {
+        'mode': mode,
+        'frames': int(data.size),
+        'wall_time_s': wall_time,
+        'per_frame_us': {
+            'mean': float(data.mean()),
+            'p50': float(np.percentile(data, 50)),
+            'p95': float(np.percentile(data, 95)),
+            'p99': float(np.percentile(data, 99)),
+            'max': float(data.max())
+        },
+        'dropped': dropped
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="日志开销基准测试")
+    parser.add_argument("--frames", type=int, default=20000, help="每个线程模拟的帧数")
+    parser.add_argument("--threads", type=int, default=4, help="并发的处理线程数")
+    parser.add_argument("--queue-size", type=int, default=10000, help="队列模式下的队列容量")
+    parser.add_argument("--output", help="结果JSON输出路径，默认打印到标准输出")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        report = {
+            'threads': args.threads,
+            'queue_size': args.queue_size,
+            'results': [
+                run_mode(mode, args.frames, args.threads, args.queue_size, log_dir)
+                for mode in ("sync", "queue")
+            ]
+        }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_startup.py
+# 启动时间基准测试：测量导入耗时和控制面板首次可交互的时间
+#
+# 用法：
+#   python -m benchmarks.bench_startup --runs 5 --output startup.json
+#
+# 每次测量都在全新的Python解释器中运行，记录：
+#   - config_s:  导入config并执行init_system()的耗时
+#   - ui_import_s: 导入modules.ui（控制面板及其依赖）的耗时
+#   - first_window_s: 从开始导入到控制面板窗口完成首次绘制的耗时
+#   - warm_up_s: 后台预加载的重量级模块总耗时（窗口显示之后才发生）
+#   - heavy_modules_at_window: 窗口显示时已被加载的重量级模块，应为空
+#   - process_s: 包含解释器启动在内的总耗时
+# 需要图形显示环境；结果以JSON输出，可逐版本对比。
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+def probe():
+    """在当前进程中执行一次启动过程并输出JSON结果"""
+    start = time.perf_counter()
+    import config
+    config.init_system()
+    config_done = time.perf_counter()
+
+    from modules.ui import ControlPanel
+    ui_done = time.perf_counter()
+
+    app = ControlPanel()
+    app.root.update()
+    window_done = time.perf_counter()
+
+    from modules.startup import HEAVY_MODULES, warm_up
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    timings = warm_up()
+
+    app.manager.shutdown()
+    app.root.destroy()
+    print(json.dumps({
+        'config_s': config_done - start,
+        'ui_import_s': ui_done - config_done,
+        'first_window_s': window_done - start,
+        'warm_up_s': sum(t for t in timings.values() if t is not None),
+        'warm_up_modules_s': timings,
+        'heavy_modules_at_window': loaded
+    }))
+
+def run_once():
+    """在新解释器中运行一次probe
+
+    Returns:
+        dict: 单次测量结果
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--probe"],
+        capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        return {'error': (proc.stderr.strip().splitlines() or ['unknown'])[-1], 'process_s': elapsed}
+    # 控制台日志也输出到标准输出，结果是其中唯一的JSON行
+    line = next(l for l in reversed(proc.stdout.splitlines()) if l.startswith('{'))
+    result = json.loads(line)
+    result['process_s'] = elapsed
+    return result
+
+def summarize(runs, key):
+    """计算某项指标在多次运行中的最小值、中位数和最大值"""
+    values = sorted(run[key] for run in runs if key in run)
+    if not values:
+        return None
+    return {'min': values[0], 'median': values[len(values) // 2], 'max': values[-1]}
+
+def main():
+    parser = argparse.ArgumentParser(description="启动时间基准测试")
+    parser.add_argument("--runs", type=int, default=5, help="测量次数")
+    parser.add_argument("--output", help="结果JSON输出路径，默认打印到标准输出")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        probe()
+        return
+
+    runs = [run_once() for _ in range(args.runs)]
+    keys = ('config_s', 'ui_import_s', 'first_window_s', 'warm_up_s', 'process_s')
+    report = {
+        'python': sys.version.split()[0],
+        'runs': runs,
+        'summary': {key: summarize(runs, key) for key in keys}
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+
+if __name__ == '__main__':
+    main()
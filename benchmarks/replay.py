@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+# benchmarks/replay.py
+# 无头回放基准测试：不需要摄像头、显示器和声卡，评估处理管线的吞吐量和延迟
+#
+# 用法：
+#   python -m benchmarks.replay --video recordings/bed1.mp4 --max-cameras 8
+#   python -m benchmarks.replay --generate --max-cameras 4 --frames 300 --output result.json
+#
+# 对1..N个并发摄像头分别运行真实的 _process_frame / _detect_gesture / 报警状态机，
+# 显示和音频被替换为空实现，结果以JSON输出（吞吐量和每帧延迟的p50/p95/p99）。
+
+import argparse
+import dataclasses
+import json
+import time
+from threading import Thread, Event, Barrier
+
+import cv2
+import numpy as np
+from config import CONFIG, init_system
+from modules.video_processor import VideoProcessor
+from modules.inference_service import InferenceService
+
+class ReplayCapture:
+    """cv2.VideoCapture的替身，循环回放内存中的帧"""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.index = 0
+        self.opened = True
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self, image=None):
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        return True, frame
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.frames[0].shape[1]
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.frames[0].shape[0]
+        return 0
+
+    def set(self, prop, value):
+        return False
+
+    def release(self):
+        self.opened = False
+
+class NullChannel:
+    """AlarmChannel的替身，只记录播放次数"""
+
+    def __init__(self):
+        self.plays = 0
+
+    def play(self, sound_key, loops=0):
+        self.plays += 1
+
+    def stop(self):
+        pass
+
+    def close(self):
+        pass
+
+class HeadlessVideoProcessor(VideoProcessor):
+    """替换了采集、显示和音频的VideoProcessor，其余处理逻辑保持不变"""
+
+    def __init__(self, camera_id, stop_event, frames, inference_service=None):
+        # 必须在父类初始化之前设置，_init_components会调用_init_capture
+        self._replay_frames = frames
+        super().__init__(camera_id, stop_event, inference_service)
+
+    def _init_capture(self):
+        return ReplayCapture(self._replay_frames)
+
+    def _init_audio(self):
+        self.alarm_channel = NullChannel()
+
+    def _display_frame(self, frame):
+        pass
+
+    def _release_audio(self):
+        pass
+
+    def _release_display(self):
+        pass
+
+def load_video(path, max_frames):
+    """将视频的前max_frames帧读入内存"""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise RuntimeError(f"无法打开视频: {path}")
+    frames = []
+    try:
+        while len(frames) < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+    finally:
+        cap.release()
+    if not frames:
+        raise RuntimeError(f"视频中没有可用的帧: {path}")
+    return frames
+
+def generate_frames(count, resolution):
+    """生成带移动方块的合成帧，用于在没有录像时测试非检测路径和运动门控"""
+    width, height = resolution
+    rng = np.random.default_rng(0)
+    frames = []
+    for i in range(count):
+        frame = np.full((height, width, 3), 96, dtype=np.uint8)
+        frame += rng.integers(0, 8, size=frame.shape, dtype=np.uint8)
+        x = int((i / max(1, count - 1)) * (width - 120))
+        cv2.rectangle(frame, (x, height // 2 - 60), (x + 120, height // 2 + 60), (200, 180, 160), -1)
+        frames.append(frame)
+    return frames
+
+def ensure_cameras(count, template_id):
+    """确保CONFIG.cameras中至少有count个摄像头配置，不足时复制模板配置"""
+    template = CONFIG.cameras[template_id]
+    while len(CONFIG.cameras) < count:
+        CONFIG.cameras.append(dataclasses.replace(template, roi=dict(template.roi)))
+
+def percentiles(values):
+    """计算延迟统计（毫秒）"""
+    data = np.asarray(values, dtype=np.float64)
+    if data.size == 0:
+        return {}
+    return {
+        'mean': float(data.mean()),
+        'p50': float(np.percentile(data, 50)),
+        'p95': float(np.percentile(data, 95)),
+        'p99': float(np.percentile(data, 99)),
+        'max': float(data.max())
+    }
+
+def _drive_camera(processor, frame_count, fps, barrier, latencies):
+    """按回放节奏驱动单个处理器，记录每帧处理延迟"""
+    interval = 1.0 / fps if fps else 0
+    barrier.wait()
+    next_time = time.perf_counter()
+    for _ in range(frame_count):
+        _, source = processor.cap.read()
+        frame = source.copy()  # 处理过程会在帧上绘制，回放帧需要保持不变
+        start = time.perf_counter()
+        processor._process_frame(frame)
+        end = time.perf_counter()
+        latencies.append((end - start) * 1000)
+        processor.fps_counter.tick(end)
+        if interval:
+            next_time += interval
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+def run_scenario(camera_count, sources, frame_count, fps):
+    """运行一个并发摄像头数量下的基准测试
+
+    Args:
+        camera_count: 并发摄像头数量
+        sources: 帧序列列表，第i个摄像头使用 sources[i % len(sources)]
+        frame_count: 每个摄像头处理的帧数
+        fps: 回放帧率，0表示不限速
+
+    Returns:
+        dict: 该场景的测试结果
+    """
+    service = None
+    if CONFIG.shared_inference:
+        service = InferenceService(CONFIG.thread_pool_size)
+        service.start()
+
+    stop_event = Event()
+    processors = [
+        HeadlessVideoProcessor(i, stop_event, sources[i % len(sources)], service)
+        for i in range(camera_count)
+    ]
+    latencies = [[] for _ in processors]
+    barrier = Barrier(camera_count + 1)
+    threads = [
+        Thread(target=_drive_camera, args=(p, frame_count, fps, barrier, latencies[i]))
+        for i, p in enumerate(processors)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    wall_time = time.perf_counter() - start
+
+    statuses = [p.get_status() for p in processors]
+    result = {
+        'cameras': camera_count,
+        'frames_per_camera': frame_count,
+        'wall_time_s': wall_time,
+        'throughput_fps': camera_count * frame_count / wall_time if wall_time > 0 else 0,
+        'latency_ms': percentiles([v for camera in latencies for v in camera]),
+        'per_camera': [
+            {
+                'camera_id': p.camera_id,
+                'latency_ms': percentiles(latencies[i]),
+                'inference_runs': statuses[i].get('inference_runs'),
+                'inference_skipped': statuses[i].get('inference_skipped'),
+                'alarms_played': p.alarm_channel.plays
+            }
+            for i, p in enumerate(processors)
+        ]
+    }
+
+    for processor in processors:
+        processor._release_resources()
+    if service is not None:
+        service.shutdown()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="无头回放基准测试")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--video", nargs="+", help="录制的视频文件，多个文件按摄像头轮流分配")
+    source.add_argument("--generate", action="store_true", help="使用合成帧")
+    parser.add_argument("--max-cameras", type=int, default=4, help="测试1..N个并发摄像头")
+    parser.add_argument("--frames", type=int, default=300, help="每个摄像头处理的帧数")
+    parser.add_argument("--preload", type=int, default=120, help="每个视频预加载到内存的帧数")
+    parser.add_argument("--fps", type=float, default=0, help="回放帧率，0表示不限速")
+    parser.add_argument("--template-camera", type=int, default=0, help="摄像头数量不足时复制的配置")
+    parser.add_argument("--output", help="结果JSON输出路径，默认打印到标准输出")
+    args = parser.parse_args()
+    init_system()
+
+    if args.video:
+        sources = [load_video(path, args.preload) for path in args.video]
+    else:
+        sources = [generate_frames(args.preload, CONFIG.cameras[args.template_camera].resolution)]
+    ensure_cameras(args.max_cameras, args.template_camera)
+
+    report = {
+        'sources': args.video or ['generated'],
+        'shared_inference': CONFIG.shared_inference,
+        'thread_pool_size': CONFIG.thread_pool_size,
+        'fps': args.fps,
+        'scenarios': [
+            run_scenario(n, sources, args.frames, args.fps)
+            for n in range(1, args.max_cameras + 1)
+        ]
+    }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# benchmarks/stream_server.py
+# 本地MJPEG网络流服务：把录像或合成帧以HTTP MJPEG推送，代替网络摄像机测试网络流接入
+#
+# 用法：
+#   python -m benchmarks.stream_server --video recordings/bed1.mp4 --port 8081
+#   python -m benchmarks.stream_server --generate --fps 15 --drop-every 30
+#
+# 启动后将摄像头配置为 CameraConfig(source="http://127.0.0.1:8081/stream.mjpg", ...)，
+# --drop-every 会定期断开所有客户端，用于验证断线重连。
+
+import argparse
+import logging
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread, Condition
+
+import cv2
+from config import init_system
+from benchmarks.replay import load_video, generate_frames
+
+BOUNDARY = "frame"
+
+class FrameSource:
+    """按指定帧率循环播放预先编码的JPEG帧，所有客户端共享同一时间线"""
+
+    def __init__(self, jpegs, fps, drop_every=0):
+        self.jpegs = jpegs
+        self.interval = 1.0 / fps
+        self.drop_every = drop_every
+        self._cond = Condition()
+        self._seq = 0
+        self._generation = 0  # 每次模拟断流时递增，客户端据此断开
+        self._running = True
+
+    def run(self):
+        """推进帧序号，由后台线程调用"""
+        started = time.monotonic()
+        while self._running:
+            time.sleep(self.interval)
+            with self._cond:
+                self._seq += 1
+                if self.drop_every and time.monotonic() - started >= self.drop_every:
+                    started = time.monotonic()
+                    self._generation += 1
+                    logging.info("模拟断流，断开所有客户端")
+                self._cond.notify_all()
+
+    def wait_next(self, last_seq, generation):
+        """等待下一帧
+
+        Returns:
+            tuple: (帧序号, JPEG数据)，模拟断流或服务停止时JPEG数据为None
+        """
+        with self._cond:
+            while self._seq == last_seq and self._running and self._generation == generation:
+                self._cond.wait(1.0)
+            if not self._running or self._generation != generation:
+                return self._seq, None
+            return self._seq, self.jpegs[self._seq % len(self.jpegs)]
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+def make_handler(source, path):
+    """创建请求处理类"""
+
+    class MJPEGHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != path:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            generation = source.generation
+            seq = -1
+            try:
+                while True:
+                    seq, jpeg = source.wait_next(seq, generation)
+                    if jpeg is None:
+                        break
+                    self.wfile.write(
+                        f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                        f"Content-Length: {len(jpeg)}\r\n\r\n".encode("ascii")
+                    )
+                    self.wfile.write(jpeg)
+                    self.wfile.write(b"\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, fmt, *args):
+            logging.debug("%s - %s", self.address_string(), fmt % args)
+
+    return MJPEGHandler
+
+def encode_frames(frames, quality):
+    """预先将帧编码为JPEG，推流时不再占用CPU"""
+    params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+    jpegs = []
+    for frame in frames:
+        ok, buf = cv2.imencode(".jpg", frame, params)
+        if ok:
+            jpegs.append(buf.tobytes())
+    if not jpegs:
+        raise RuntimeError("没有可推送的帧")
+    return jpegs
+
+def main():
+    parser = argparse.ArgumentParser(description="本地MJPEG网络流服务")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--video", help="循环推送的视频文件")
+    source.add_argument("--generate", action="store_true", help="推送合成帧")
+    parser.add_argument("--frames", type=int, default=300, help="预加载/生成的帧数")
+    parser.add_argument("--resolution", type=int, nargs=2, default=(1280, 720), help="合成帧分辨率")
+    parser.add_argument("--fps", type=float, default=25, help="推流帧率")
+    parser.add_argument("--quality", type=int, default=80, help="JPEG质量")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--path", default="/stream.mjpg")
+    parser.add_argument("--drop-every", type=float, default=0, help="每隔多少秒断开所有客户端，0表示不断开")
+    args = parser.parse_args()
+
+    init_system()
+    frames = (load_video(args.video, args.frames) if args.video
+              else generate_frames(args.frames, tuple(args.resolution)))
+    frame_source = FrameSource(encode_frames(frames, args.quality), args.fps, args.drop_every)
+    Thread(target=frame_source.run, name="StreamClock", daemon=True).start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(frame_source, args.path))
+    server.daemon_threads = True
+    logging.info(f"MJPEG流已启动: http://{args.host}:{args.port}{args.path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        frame_source.stop()
+        server.server_close()
+
+if __name__ == '__main__':
+    main()
@@ -7,19 +7,21 @@
 # - 报警设置（触发阈值、音频文件等）
 # - 日志配置（文件路径、大小限制等）
 
+import atexit
 import logging
 import os
-from dataclasses import dataclass
-from logging.handlers import RotatingFileHandler
+import queue
+from dataclasses import dataclass, field
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 import sys
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 
 @dataclass
 class CameraConfig:
     """摄像头配置类
     
     Attributes:
-        source: 视频源（摄像头ID或视频文件路径）
+        source: 视频源（摄像头ID、视频文件路径，或 rtsp:// / http:// 网络流地址）
         roi: 感兴趣区域，格式为 {"x": int, "y": int, "w": int, "h": int}
         min_confidence: 手势检测的最小置信度阈值
         resolution: 视频分辨率，格式为 (width, height)
@@ -27,8 +29,18 @@ class CameraConfig:
         buffer_size: 视频缓冲区大小（帧数）
         auto_reconnect: 断开连接后是否自动重连
         reconnect_delay: 重连等待时间（秒）
+        inference_size: 推理输入的长边像素数，ROI超过该尺寸时先等比缩小再检测，None表示不缩放
+        tracking_crop: 检测到手后只在手部附近的区域推理，跟踪丢失时回退到完整ROI
+        stream_transport: RTSP传输协议，"tcp"或"udp"，仅对rtsp://地址生效
+        stream_open_timeout: 打开网络流的超时时间（秒）
+        stream_read_timeout: 读取网络流的超时时间（秒），超时视为断流并触发重连
+        read_timeout: 等待本地摄像头或视频文件新帧的超时时间（秒），超时视为断流并触发重连；
+            出帧慢的USB摄像头或首帧较慢的设备需要调大
+        roi_name: roi的名称，用于状态显示和日志
+        regions: 同一画面中的其他命名ROI（如相邻床位），格式与roi相同；
+            所有ROI在同一次推理中检测，各自独立计时和报警
     """
-    source: int
+    source: Union[int, str]
     roi: dict
     min_confidence: float
     resolution: tuple
@@ -36,6 +48,59 @@ class CameraConfig:
     buffer_size: int = 3
     auto_reconnect: bool = True
     reconnect_delay: float = 1.0
+    inference_size: Optional[int] = None
+    tracking_crop: bool = False
+    stream_transport: str = "tcp"
+    stream_open_timeout: float = 10.0
+    stream_read_timeout: float = 5.0
+    read_timeout: float = 2.0
+    roi_name: str = "床位"
+    regions: Dict[str, dict] = field(default_factory=dict)
+
+    def named_rois(self) -> Dict[str, dict]:
+        """获取全部命名ROI，roi始终排在第一位"""
+        return {self.roi_name: self.roi, **self.regions}
+
+    @property
+    def is_network_stream(self) -> bool:
+        """视频源是否为网络流地址（rtsp://、http://等）"""
+        return isinstance(self.source, str) and "://" in self.source
+
+    @property
+    def ffmpeg_options(self) -> str:
+        """打开网络流时传给OpenCV FFmpeg后端的选项（OPENCV_FFMPEG_CAPTURE_OPTIONS格式）
+
+        低延迟选项：不在FFmpeg内部缓存数据包，RTSP地址按stream_transport选择传输协议
+        """
+        options = ["fflags;nobuffer", "flags;low_delay"]
+        if self.source.lower().startswith(("rtsp://", "rtsps://")):
+            options.insert(0, f"rtsp_transport;{self.stream_transport}")
+        return "|".join(options)
+
+@dataclass(frozen=True)
+class GestureConfig:
+    """手势规则配置类
+    
+    关键点索引与MediaPipe Hands一致：0为手腕，4/8/12/16/20依次为拇指到小指的指尖，
+    5/9/13/17为食指到小指的指根。坐标为ROI归一化坐标。
+    
+    Attributes:
+        name: 手势名称，用于日志和状态显示
+        kind: 规则类型
+            - "distance": 两点在图像平面上的曼哈顿距离
+            - "angle": 以中间点为顶点的夹角（度）
+            - "curl": 指尖到手腕的距离与指根到手腕的距离之比，越小表示手指越弯曲
+        points: 关键点索引，distance为(a, b)，angle为(a, 顶点, c)，curl为(手腕, 指根, 指尖)
+        threshold: 判定阈值，None表示使用SystemConfig.gesture_threshold（界面中的检测灵敏度）
+        below: True表示数值低于阈值时判定为手势，False表示高于阈值时
+        enabled: 是否启用该规则
+    """
+    name: str
+    kind: str
+    points: Tuple[int, ...]
+    threshold: Optional[float] = None
+    below: bool = True
+    enabled: bool = True
 
 class SystemConfig:
     """系统配置类
@@ -71,8 +136,40 @@ class SystemConfig:
         
         # 手势检测参数
         self.gesture_threshold: float = 0.8
-        self.detection_interval: float = 0.1  # 检测间隔（秒）
-        self.smooth_factor: float = 0.3  # 平滑因子（0-1）
+        self.max_num_hands: int = 2  # 每次推理最多检测的手数（同一摄像头所有ROI合计）
+        self.detection_interval: float = 0.1  # 检测间隔（秒），检测进行中时使用
+        self.adaptive_detection: bool = True  # 空闲时自动降低检测频率
+        self.idle_detection_interval: float = 0.4  # 空闲检测间隔（秒）
+        self.active_detection_cooldown: float = 3.0  # 手势消失后保持全速检测的时间（秒）
+        self.smooth_factor: float = 0.3  # 手势数值的平滑因子（0-1），仅在关闭关键点滤波时使用
+        # 手势规则，任一规则成立即开始报警计时；所有规则在一次向量化计算中求值
+        self.gestures: List[GestureConfig] = [
+            GestureConfig("拇指小指靠近", "distance", (4, 20)),
+        ]
+        
+        # 关键点滤波参数（One-Euro滤波，逐关键点自适应平滑）
+        self.landmark_filter_enabled: bool = True  # 关闭时改为对手势数值做指数平滑（smooth_factor）
+        self.landmark_min_cutoff: float = 0.3  # 静止时的截止频率（Hz），越小越平滑
+        self.landmark_beta: float = 0.5  # 速度系数，越大快速运动时延迟越小
+        self.landmark_d_cutoff: float = 1.0  # 速度估计的截止频率（Hz）
+        self.landmark_max_gap: float = 1.0  # 两次检测间隔超过该时间（秒）视为跟踪丢失，重置滤波
+        self.landmark_match_distance: float = 0.2  # 同一只手两次检测间手掌中心的最大位移（归一化坐标）
+        self.landmark_prediction: bool = True  # 两次检测之间按速度外推关键点，每帧都绘制骨架
+        self.landmark_max_extrapolation: float = 0.15  # 最长外推时间（秒），超过后停在最后的预测位置
+        self.landmark_hold_time: float = 0.5  # 检测结果超过该时间（秒）未更新时不再绘制骨架
+        
+        # 跟踪裁剪参数（CameraConfig.tracking_crop启用时生效）
+        self.tracking_padding: float = 0.5  # 裁剪框相对手部尺寸的单侧余量比例
+        self.tracking_min_size: int = 128  # 裁剪框最小边长（像素）
+        self.tracking_min_confidence: float = 0.6  # 低于该置信度视为跟踪丢失
+        
+        # 运动门控参数（ROI静止时跳过推理）
+        self.motion_gate_enabled: bool = True
+        self.motion_threshold: float = 0.02  # 变化像素占比阈值（0-1）
+        self.motion_pixel_threshold: int = 25  # 单像素灰度变化阈值
+        self.motion_gate_size: Tuple[int, int] = (64, 48)  # 差分图像尺寸 (宽, 高)
+        self.motion_learning_rate: float = 0.05  # 背景更新速率
+        self.motion_force_interval: float = 2.0  # 最长未推理时间（秒），超过后强制推理
         
         # 报警设置
         self.alarm_triggers: List[int] = [5, 10, 15, 30]
@@ -82,17 +179,48 @@ class SystemConfig:
         }
         self.fallback_sound: str = "sounds/fallback_beep.wav"
         self.alarm_volume: float = 1.0  # 音量（0-1）
+        self.audio_driver: Optional[str] = None  # SDL音频驱动，None为系统默认，无声卡环境可设为"dummy"
+        
+        # 报警录像（报警触发时保存报警前后的视频片段）
+        self.clip_recording_enabled: bool = False
+        self.clip_dir: str = "clips"
+        self.clip_pre_seconds: float = 10.0  # 报警前保留的时长（秒）
+        self.clip_post_seconds: float = 5.0  # 报警后继续录制的时长（秒）
+        self.clip_fps: float = 5.0  # 缓冲区采样帧率，也是片段的播放帧率
+        self.clip_max_width: int = 640  # 缓冲帧的最大宽度（像素），超过时等比缩小
+        self.clip_buffer_max_mb: float = 64.0  # 每个摄像头缓冲区的内存上限（MB），640x360的帧按默认时长和帧率约占52MB
+        self.clip_queue_size: int = 4  # 等待编码的片段数上限，队列满时丢弃新片段
+        self.clip_dir_max_mb: float = 2048.0  # 录像目录容量上限（MB），超过时删除最早的片段
         
         # 日志设置
         self.log_file: str = os.path.join("logs", "system.log")
         self.log_max_size: int = 10 * 1024 * 1024  # 10MB
         self.log_backup_count: int = 5
         self.log_level: int = logging.INFO
+        self.log_queue_size: int = 10000  # 异步日志队列容量，队列满时丢弃新日志
         
         # 性能优化参数
-        self.thread_pool_size: int = 4
+        self.thread_pool_size: int = 4  # 共享推理服务的工作线程数，每个线程按置信度各持有一个共用的模型
+        self.inference_timeout: float = 2.0  # 等待共享推理结果的最长时间（秒），超时的帧跳过检测，报警状态保持不变
+        self.shared_inference: bool = True  # 所有摄像头共用推理服务和固定数量的模型，而非各自加载模型
+        self.hands_pool_size: int = 2  # 预先创建的Hands模型数量（共享推理时供各工作线程租用），0表示不使用模型池
+        self.execution_mode: str = "thread"  # 运行模式："thread"（线程）或"process"（每个摄像头独立子进程）
         self.frame_buffer_size: int = 3
         self.max_fps: Optional[int] = None  # None表示不限制
+        self.fps_window: int = 120  # FPS统计保留的帧间隔数量
+        self.reconnect_max_delay: float = 30.0  # 断线重连的最长等待时间（秒），首次等待为CameraConfig.reconnect_delay
+        self.reconnect_jitter: float = 0.3  # 重连等待时间的随机抖动比例
+        self.camera_lifecycle_workers: int = 4  # 并发启动/停止摄像头的工作线程数
+        self.camera_start_timeout: float = 15.0  # 启动超过该时间（秒）报告超时
+        self.camera_stop_timeout: float = 5.0  # 等待处理线程退出的最长时间（秒）
+        self.stage_timing_enabled: bool = False  # 是否统计处理循环各阶段耗时
+        self.stage_timing_dump_dir: str = "logs"  # 阶段耗时导出目录
+        self.startup_warm_up: bool = True  # 窗口显示后在后台预加载OpenCV/MediaPipe等重量级模块
+        
+        # 监控指标接口（Prometheus文本格式）
+        self.metrics_enabled: bool = False
+        self.metrics_host: str = "127.0.0.1"
+        self.metrics_port: int = 9108
 
     def validate(self) -> None:
         """验证所有配置参数的有效性
@@ -108,12 +236,29 @@ class SystemConfig:
         """
         # 验证摄像头配置
         for i, cam in enumerate(self.cameras):
-            if not (0 <= cam.roi["x"] < cam.resolution[0] and 
-                    0 <= cam.roi["y"] < cam.resolution[1]):
-                raise ValueError(f"摄像头{cam.source} ROI 超出分辨率范围")
+            if cam.roi_name in cam.regions:
+                raise ValueError(f"摄像头{cam.source} ROI名称重复: {cam.roi_name}")
+            for name, roi in cam.named_rois().items():
+                if not (0 <= roi["x"] < cam.resolution[0] and 
+                        0 <= roi["y"] < cam.resolution[1]):
+                    raise ValueError(f"摄像头{cam.source} ROI {name} 超出分辨率范围")
+                if roi["w"] <= 0 or roi["h"] <= 0:
+                    raise ValueError(f"摄像头{cam.source} ROI {name} 尺寸无效")
             
             if not (0 < cam.min_confidence <= 1):
                 raise ValueError(f"摄像头{cam.source} 置信度阈值必须在0-1之间")
+            
+            if cam.inference_size is not None and cam.inference_size < 32:
+                raise ValueError(f"摄像头{cam.source} 推理尺寸过小")
+            
+            if cam.read_timeout <= 0:
+                raise ValueError(f"摄像头{cam.source} 读取超时时间必须大于0")
+            
+            if cam.is_network_stream:
+                if cam.stream_transport not in ("tcp", "udp"):
+                    raise ValueError(f"摄像头{cam.source} 网络流传输协议必须为 tcp 或 udp")
+                if cam.stream_open_timeout <= 0 or cam.stream_read_timeout <= 0:
+                    raise ValueError(f"摄像头{cam.source} 网络流超时时间必须大于0")
         
         # 验证音频文件
         for path in self.alarm_sounds.values():
@@ -128,23 +273,99 @@ class SystemConfig:
         if not (0 < self.gesture_threshold <= 1):
             raise ValueError("手势检测阈值必须在0-1之间")
         
+        # 验证手势规则
+        point_counts = {"distance": 2, "angle": 3, "curl": 3}
+        names = set()
+        for gesture in self.gestures:
+            if gesture.kind not in point_counts:
+                raise ValueError(f"手势 {gesture.name} 的规则类型无效: {gesture.kind}")
+            if len(gesture.points) != point_counts[gesture.kind]:
+                raise ValueError(f"手势 {gesture.name} 需要 {point_counts[gesture.kind]} 个关键点")
+            if not all(0 <= i < 21 for i in gesture.points):
+                raise ValueError(f"手势 {gesture.name} 的关键点索引必须在0-20之间")
+            if gesture.name in names:
+                raise ValueError(f"手势名称重复: {gesture.name}")
+            names.add(gesture.name)
+        
+        if self.landmark_min_cutoff <= 0 or self.landmark_d_cutoff <= 0 or self.landmark_beta < 0:
+            raise ValueError("关键点滤波的截止频率必须大于0，速度系数不能为负")
+        
+        if self.landmark_max_extrapolation < 0 or self.landmark_hold_time <= 0:
+            raise ValueError("关键点外推时间不能为负，保持时间必须大于0")
+        
+        if self.max_num_hands < 1:
+            raise ValueError("最多检测手数必须大于0")
+        
+        if self.inference_timeout <= 0:
+            raise ValueError("推理超时时间必须大于0")
+        
         if not (0 < self.alarm_volume <= 1):
             raise ValueError("音量必须在0-1之间")
+        
+        if not (0 <= self.motion_threshold <= 1):
+            raise ValueError("运动门控阈值必须在0-1之间")
+        
+        if self.clip_pre_seconds < 0 or self.clip_post_seconds < 0 or self.clip_fps <= 0:
+            raise ValueError("报警录像时长不能为负，采样帧率必须大于0")
+        
+        if self.execution_mode not in ("thread", "process"):
+            raise ValueError("运行模式必须为 thread 或 process")
 
 # 全局配置实例
 CONFIG = SystemConfig()
 
-def setup_logging() -> None:
-    """配置日志系统
+class DroppingQueueHandler(QueueHandler):
+    """非阻塞的日志队列处理器
     
-    设置日志格式、输出位置和级别，包括：
-    - 文件日志（带大小限制和备份）
-    - 控制台输出
-    - 第三方库日志级别调整
+    在调用线程中只把日志记录放入有界队列，格式化和文件I/O由后台监听线程完成。
+    队列已满时丢弃该条日志并计数，保证摄像头线程不会被日志阻塞。
+    """
+    
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record):
+        # 同一进程内传递，无需预先格式化，格式化留给监听线程
+        return record
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class ProcessQueueHandler(DroppingQueueHandler):
+    """子进程使用的日志队列处理器
+    
+    日志记录通过multiprocessing.Queue发送给父进程，由父进程统一写入日志文件，
+    避免多个进程各自轮转同一个日志文件。跨进程传递前需要先格式化消息并去掉
+    不可序列化的参数和异常对象。
     """
-    # 创建日志目录
-    os.makedirs(os.path.dirname(CONFIG.log_file), exist_ok=True)
     
+    def prepare(self, record):
+        return QueueHandler.prepare(self, record)
+
+class _ParentLogForwarder(logging.Handler):
+    """将子进程发来的日志记录交给父进程同名日志记录器处理"""
+    
+    def handle(self, record):
+        logging.getLogger(record.name).handle(record)
+        return True
+
+# 当前生效的异步日志组件
+_log_queue_handler = None
+_log_listener = None
+
+def create_log_handlers(log_file):
+    """创建文件和控制台日志处理器
+    
+    Args:
+        log_file: 日志文件路径
+        
+    Returns:
+        list: [文件处理器, 控制台处理器]
+    """
     # 创建格式化器
     formatter = logging.Formatter(
         '%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s',
@@ -153,7 +374,7 @@ def setup_logging() -> None:
     
     # 配置文件处理器
     file_handler = RotatingFileHandler(
-        CONFIG.log_file,
+        log_file,
         maxBytes=CONFIG.log_max_size,
         backupCount=CONFIG.log_backup_count,
         encoding='utf-8'
@@ -163,21 +384,107 @@ def setup_logging() -> None:
     # 配置控制台处理器
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
+    return [file_handler, console_handler]
+
+def create_queue_logging(handlers, maxsize):
+    """创建异步日志队列处理器及其后台监听器
+    
+    Args:
+        handlers: 实际输出日志的处理器列表
+        maxsize: 队列容量
+        
+    Returns:
+        tuple: (DroppingQueueHandler, 已启动的QueueListener)
+    """
+    log_queue = queue.Queue(maxsize=maxsize)
+    queue_handler = DroppingQueueHandler(log_queue)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return queue_handler, listener
+
+def create_process_log_listener(log_queue):
+    """创建接收子进程日志的后台监听器
+    
+    子进程的日志记录进入父进程的日志系统，和父进程自己的日志经过同一个队列处理器
+    写入文件，日志文件只由父进程轮转。
+    
+    Args:
+        log_queue: 子进程写入的multiprocessing.Queue
+        
+    Returns:
+        QueueListener: 已启动的监听器，子进程退出后需调用stop()
+    """
+    listener = QueueListener(log_queue, _ParentLogForwarder())
+    listener.start()
+    return listener
+
+def get_dropped_log_count() -> int:
+    """获取因队列已满而丢弃的日志条数"""
+    return _log_queue_handler.dropped if _log_queue_handler is not None else 0
+
+def shutdown_logging() -> None:
+    """停止后台日志线程，输出队列中剩余的日志"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+    if _log_queue_handler is not None and _log_queue_handler.dropped:
+        sys.stderr.write(f"日志队列已满，共丢弃 {_log_queue_handler.dropped} 条日志\n")
+
+def setup_logging(log_queue=None) -> None:
+    """配置日志系统
+    
+    设置日志格式、输出位置和级别，包括：
+    - 文件日志（带大小限制和备份）
+    - 控制台输出
+    - 第三方库日志级别调整
+    
+    根日志记录器只挂载一个非阻塞的队列处理器，文件写入、日志轮转和控制台输出
+    都在后台监听线程中完成，不占用摄像头处理线程的时间。
+    
+    Args:
+        log_queue: 子进程传入父进程的日志队列，此时不创建文件处理器，
+                   日志全部交给父进程写入
+    """
+    global _log_queue_handler, _log_listener
+    
+    if log_queue is not None:
+        _log_queue_handler = ProcessQueueHandler(log_queue)
+    else:
+        # 创建日志目录
+        os.makedirs(os.path.dirname(CONFIG.log_file), exist_ok=True)
+        
+        handlers = create_log_handlers(CONFIG.log_file)
+        _log_queue_handler, _log_listener = create_queue_logging(handlers, CONFIG.log_queue_size)
+        atexit.register(shutdown_logging)
     
     # 配置根日志记录器
     root_logger = logging.getLogger()
     root_logger.setLevel(CONFIG.log_level)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(_log_queue_handler)
     
     # 设置第三方库的日志级别
     logging.getLogger('mediapipe').setLevel(logging.WARNING)
     logging.getLogger('pygame').setLevel(logging.WARNING)
 
-# 系统初始化
-os.makedirs("sounds", exist_ok=True)
-os.makedirs("logs", exist_ok=True)
-setup_logging()
-CONFIG.validate()
+_system_initialized = False
 
-logging.info("系统配置初始化完成")
\ No newline at end of file
+def init_system(log_queue=None) -> None:
+    """初始化系统运行环境
+    
+    创建音频和日志目录、配置日志系统并校验配置。导入本模块不再产生任何副作用，
+    程序入口（main.py、基准测试脚本、子进程）需显式调用一次，重复调用会被忽略。
+    
+    Args:
+        log_queue: 子进程传入父进程的日志队列，见setup_logging
+    """
+    global _system_initialized
+    if _system_initialized:
+        return
+    _system_initialized = True
+    os.makedirs("sounds", exist_ok=True)
+    if log_queue is None:
+        os.makedirs("logs", exist_ok=True)
+    setup_logging(log_queue)
+    CONFIG.validate()
+    logging.info("系统配置初始化完成")
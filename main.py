@@ -3,36 +3,43 @@
 
 import os
 import logging
-import numpy as np
-import wave
-import pygame
-from config import CONFIG
+from config import CONFIG, init_system
 from modules.ui import ControlPanel
+from modules.startup import start_warm_up
+
+
+def ensure_fallback_sound():
+    """确保备用音频文件存在"""
+    if os.path.exists(CONFIG.fallback_sound):
+        return
+    # 只有首次运行需要生成，numpy在此处才导入，避免拖慢常规启动
+    import wave
+    import numpy as np
+    logging.info("创建备用音频文件")
+    sample_rate = 44100
+    duration = 0.5
+    t = np.linspace(0, duration, int(sample_rate * duration))
+    data = np.sin(2 * np.pi * 1000 * t).astype(np.float32)
+    with wave.open(CONFIG.fallback_sound, 'w') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(data.tobytes())
 
 
 if __name__ == '__main__':
     try:
-        # 确保备用音频文件存在
-        if not os.path.exists(CONFIG.fallback_sound):
-            logging.info("创建备用音频文件")
-            sample_rate = 44100
-            duration = 0.5
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            data = np.sin(2 * np.pi * 1000 * t).astype(np.float32)
-            with wave.open(CONFIG.fallback_sound, 'w') as wav_file:
-                wav_file.setnchannels(1)
-                wav_file.setsampwidth(2)
-                wav_file.setframerate(sample_rate)
-                wav_file.writeframes(data.tobytes())
-        
-        # 初始化音频系统
-        pygame.init()
+        init_system()
+        ensure_fallback_sound()
         logging.info("系统启动中...")
-        
-        # 启动应用
+
+        # 启动应用；音频由AudioEngine在启动摄像头时初始化，
+        # OpenCV/MediaPipe及共享模型在窗口创建后由后台线程预加载
         app = ControlPanel()
+        if CONFIG.startup_warm_up:
+            start_warm_up(on_complete=app.manager.prewarm)
         app.run()
     except Exception as e:
         logging.critical(f"系统崩溃: {str(e)}")
         from tkinter import messagebox
-        messagebox.showerror("致命错误", f"系统发生不可恢复错误: {str(e)}")
\ No newline at end of file
+        messagebox.showerror("致命错误", f"系统发生不可恢复错误: {str(e)}")
@@ -2,7 +2,19 @@
 # modules/__init__.py
 # 模块包初始化文件
 
-# 导出所有模块中的类，保持与原始processor.py相同的导入接口
-from .video_processor import VideoProcessor
-from .fps_counter import FPSCounter
-from .camera_manager import CameraManager
\ No newline at end of file
+import importlib
+
+# 导出所有模块中的类，保持与原始processor.py相同的导入接口。
+# 类在首次访问时才导入，避免导入包时加载OpenCV/MediaPipe等重量级依赖
+_EXPORTS = {
+    'VideoProcessor': '.video_processor',
+    'FPSCounter': '.fps_counter',
+    'CameraManager': '.camera_manager',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+# modules/audio_engine.py
+# 报警音频引擎模块
+
+import logging
+import os
+import queue
+import traceback
+from threading import Thread
+
+import pygame
+from config import CONFIG
+
+class AlarmChannel:
+    """单个摄像头的报警声道句柄
+
+    只向音频引擎发送命令，不直接调用SDL，摄像头线程调用时不会阻塞。
+    """
+
+    def __init__(self, engine, camera_id):
+        self._engine = engine
+        self.camera_id = camera_id
+
+    def play(self, sound_path, loops=0):
+        """播放报警音，声道正在播放时忽略
+
+        Args:
+            sound_path: 音频文件路径（由调用方的配置快照给出）
+            loops: 循环次数，-1表示持续播放
+        """
+        self._engine.send('play', self.camera_id, sound_path, loops)
+
+    def stop(self):
+        """停止本声道的报警音"""
+        self._engine.send('stop', self.camera_id)
+
+    def close(self):
+        """停止播放并归还声道"""
+        self._engine.send('close', self.camera_id)
+
+class AudioEngine:
+    """报警音频引擎类，由CameraManager持有，供所有摄像头共用
+
+    主要功能：
+    - 在独立线程中初始化并独占pygame.mixer，其他线程不调用任何SDL接口
+    - 每个音频文件只解码一次，所有摄像头共用同一个Sound对象
+    - 为每个摄像头分配独立的声道
+    - 通过命令队列接收播放/停止命令
+
+    可通过CONFIG.audio_driver（或driver参数）指定SDL音频驱动，
+    无声卡的环境中使用"dummy"驱动即可正常运行。
+    引擎线程不读取CONFIG：预加载的音频和音量在创建时确定，播放的音频路径随命令传入。
+    """
+
+    def __init__(self, driver=None, sound_paths=None):
+        """初始化音频引擎
+
+        Args:
+            driver: SDL音频驱动名称，默认为CONFIG.audio_driver
+            sound_paths: 启动时预先解码的音频路径，默认为CONFIG.alarm_sounds中的全部音频
+        """
+        self.driver = driver or CONFIG.audio_driver
+        self.sound_paths = tuple(CONFIG.alarm_sounds.values() if sound_paths is None else sound_paths)
+        self.fallback_sound = CONFIG.fallback_sound
+        self.volume = CONFIG.alarm_volume
+        self._commands = queue.Queue()
+        self._thread = None
+        # 以下状态只在引擎线程中访问
+        self._sounds = {}    # 音频路径 -> Sound
+        self._channels = {}  # camera_id -> (声道索引, Channel)
+        self._available = False
+
+    def start(self):
+        """启动音频引擎线程"""
+        if self._thread is not None:
+            return
+        self._thread = Thread(target=self._run, name="AudioEngine", daemon=True)
+        self._thread.start()
+
+    def open_channel(self, camera_id):
+        """为摄像头分配报警声道
+
+        Args:
+            camera_id: 摄像头ID
+
+        Returns:
+            AlarmChannel: 该摄像头的声道句柄
+        """
+        self.send('open', camera_id)
+        return AlarmChannel(self, camera_id)
+
+    def send(self, command, camera_id, *args):
+        """向引擎线程发送命令（非阻塞）
+
+        Args:
+            command: 命令名称（open/play/stop/close）
+            camera_id: 摄像头ID
+            *args: 命令参数
+        """
+        self._commands.put((command, camera_id) + args)
+
+    def _run(self):
+        """引擎线程主循环"""
+        try:
+            self._init_mixer()
+        except Exception as e:
+            logging.error(f"音频系统初始化失败，报警音将不可用: {str(e)}")
+
+        while True:
+            task = self._commands.get()
+            if task is None:
+                break
+            if not self._available:
+                continue
+            try:
+                command, camera_id, *args = task
+                getattr(self, f'_handle_{command}')(camera_id, *args)
+            except Exception as e:
+                logging.error(f"音频命令执行失败 {task}: {str(e)}\n{traceback.format_exc()}")
+
+        if self._available:
+            pygame.mixer.quit()
+            self._available = False
+
+    def _init_mixer(self):
+        """初始化混音器并预先解码所有报警音频"""
+        if self.driver:
+            os.environ['SDL_AUDIODRIVER'] = self.driver
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+        self._available = True
+        for path in self.sound_paths:
+            self._get_sound(path)
+        logging.info(f"音频引擎已启动，已加载 {len(self._sounds)} 个报警音频")
+
+    def _get_sound(self, path):
+        """获取已解码的音频，首次使用时加载
+
+        Args:
+            path: 音频文件路径
+
+        Returns:
+            pygame.mixer.Sound: 解码后的音频
+        """
+        sound = self._sounds.get(path)
+        if sound is None:
+            try:
+                sound = pygame.mixer.Sound(path)
+            except FileNotFoundError:
+                logging.warning(f"加载 {path} 失败，使用备用音")
+                sound = pygame.mixer.Sound(self.fallback_sound)
+            self._sounds[path] = sound
+        return sound
+
+    def _handle_open(self, camera_id):
+        """分配声道，复用已关闭摄像头释放的声道索引"""
+        if camera_id in self._channels:
+            return
+        used = {channel_id for channel_id, _ in self._channels.values()}
+        index = next(i for i in range(len(used) + 1) if i not in used)
+        if index >= pygame.mixer.get_num_channels():
+            pygame.mixer.set_num_channels(index + 1)
+        channel = pygame.mixer.Channel(index)
+        channel.set_volume(self.volume)
+        self._channels[camera_id] = (index, channel)
+
+    def _handle_play(self, camera_id, sound_path, loops):
+        """播放报警音，与原逻辑一致：声道正在播放时不打断"""
+        if camera_id not in self._channels:
+            self._handle_open(camera_id)
+        channel = self._channels[camera_id][1]
+        if not channel.get_busy():
+            channel.play(self._get_sound(sound_path), loops=loops)
+
+    def _handle_stop(self, camera_id):
+        """停止声道播放"""
+        if camera_id in self._channels:
+            self._channels[camera_id][1].stop()
+
+    def _handle_close(self, camera_id):
+        """停止播放并释放声道"""
+        entry = self._channels.pop(camera_id, None)
+        if entry is not None:
+            entry[1].stop()
+
+    def shutdown(self):
+        """停止引擎线程并关闭混音器"""
+        if self._thread is None:
+            return
+        self._commands.put(None)
+        self._thread.join(timeout=5)
+        self._thread = None
+        logging.info("音频引擎已停止")
@@ -2,30 +2,146 @@
 # modules/camera_manager.py
 # 摄像头管理器模块
 
+import json
 import logging
-from threading import Thread, Event
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from threading import Thread, Event, Lock, Condition
 from config import CONFIG
 
-# 导入VideoProcessor类，这里使用相对导入
-from .video_processor import VideoProcessor
+from .metrics_server import MetricsServer
+
+# VideoProcessor、InferenceService等依赖OpenCV/MediaPipe/pygame，
+# 在首次启动摄像头时才导入，使控制面板无需等待这些模块加载即可显示
 
 class CameraManager:
     """摄像头管理器类，负责管理多个摄像头的生命周期
     
     主要功能：
     - 创建和管理VideoProcessor实例
-    - 控制摄像头的启动和停止
+    - 控制摄像头的启动和停止，支持在后台线程池中并发执行并报告进度
     - 提供摄像头状态查询接口
+    - 持有所有摄像头共用的推理服务、Hands模型池和音频引擎
     """
     
+    # 摄像头生命周期状态
+    STARTING = "starting"
+    RUNNING = "running"
+    STOPPING = "stopping"
+    STOPPED = "stopped"
+    FAILED = "failed"
+    TIMEOUT = "timeout"
+    STATE_NAMES = {
+        STARTING: "启动中",
+        RUNNING: "运行中",
+        STOPPING: "停止中",
+        STOPPED: "已停止",
+        FAILED: "启动失败",
+        TIMEOUT: "操作超时",
+    }
+    
     def __init__(self):
         """初始化摄像头管理器"""
         self.processors = {}
         self.stop_events = {}
         self.threads = {}
+        self.states = {}  # camera_id -> STARTING/STOPPING/TIMEOUT，启动、停止过程中或停止超时后存在
+        self._lock = Lock()  # 保护processors/stop_events/threads/states
+        self._state_changed = Condition(self._lock)  # 启动/停止过程结束时通知
+        self._lifecycle_pool = None
+        self.inference_service = None
+        self.hands_pool = None
+        self.audio_engine = None
+        self.clip_recorder = None
+        self.metrics_server = None
+        self._services_lock = Lock()  # 共享服务可能由预热线程和UI线程同时创建
+        if CONFIG.metrics_enabled:
+            self._start_metrics_server()
+        
+    def _start_metrics_server(self):
+        """启动本地监控指标服务，启动失败不影响摄像头运行"""
+        try:
+            self.metrics_server = MetricsServer(self, CONFIG.metrics_host, CONFIG.metrics_port)
+            self.metrics_server.start()
+        except OSError as e:
+            logging.error(f"监控指标服务启动失败: {str(e)}")
+            self.metrics_server = None
+        
+    def _get_inference_service(self):
+        """获取共享推理服务，首次使用时创建并启动
+        
+        Returns:
+            InferenceService: 共享推理服务，未启用共享推理时返回None
+        """
+        if not CONFIG.shared_inference:
+            return None
+        # 每个摄像头的模型从模型池租用，先取得模型池（不能在持有_services_lock时获取）
+        hands_pool = self._get_hands_pool()
+        with self._services_lock:
+            if self.inference_service is None:
+                from .inference_service import InferenceService
+                self.inference_service = InferenceService(CONFIG.thread_pool_size, hands_pool)
+                self.inference_service.start()
+            return self.inference_service
+        
+    def _get_hands_pool(self):
+        """获取Hands模型池，首次使用时创建并在后台预热
+        
+        共享推理服务和独立运行的摄像头都从该池租用模型。
+        
+        Returns:
+            HandsPool: 模型池，池大小为0时返回None
+        """
+        if CONFIG.hands_pool_size <= 0:
+            return None
+        with self._services_lock:
+            if self.hands_pool is None:
+                from .hands_pool import HandsPool
+                self.hands_pool = HandsPool(CONFIG.hands_pool_size)
+                self.hands_pool.start()
+            return self.hands_pool
+        
+    def _get_audio_engine(self):
+        """获取共享音频引擎，首次使用时创建并启动
+        
+        Returns:
+            AudioEngine: 共享音频引擎
+        """
+        with self._services_lock:
+            if self.audio_engine is None:
+                from .audio_engine import AudioEngine
+                self.audio_engine = AudioEngine()
+                self.audio_engine.start()
+            return self.audio_engine
+        
+    def _get_clip_recorder(self):
+        """获取共享报警录像编码器，首次使用时创建并启动
+        
+        Returns:
+            ClipRecorder: 共享编码器，未启用报警录像时返回None
+        """
+        if not CONFIG.clip_recording_enabled:
+            return None
+        with self._services_lock:
+            if self.clip_recorder is None:
+                from .clip_recorder import ClipRecorder
+                self.clip_recorder = ClipRecorder()
+                self.clip_recorder.start()
+            return self.clip_recorder
+        
+    def prewarm(self):
+        """预先创建共享服务，使首次启动摄像头时无需等待模型和音频加载
+        
+        多进程模式下每个子进程加载自己的模型，不做预热。
+        """
+        if CONFIG.execution_mode == "process":
+            return
+        self._get_inference_service()  # 同时创建并预热模型池
+        self._get_audio_engine()
         
     def start_camera(self, camera_id):
-        """启动指定摄像头
+        """启动指定摄像头（阻塞直到启动完成）
         
         Args:
             camera_id: 摄像头ID
@@ -35,53 +151,306 @@ class CameraManager:
             
         Raises:
             ValueError: 当摄像头ID无效时
-            RuntimeError: 当摄像头已在运行或初始化失败时
+            RuntimeError: 当摄像头已在运行或正在启动/停止时
         """
         if not isinstance(camera_id, int) or camera_id < 0:
             logging.error(f"无效的摄像头ID: {camera_id}")
             raise ValueError(f"无效的摄像头ID: {camera_id}")
             
-        if camera_id in self.processors:
-            logging.warning(f"摄像头{camera_id}已在运行")
-            raise RuntimeError(f"摄像头{camera_id}已在运行")
+        with self._lock:
+            self._reap_locked(camera_id)
+            if camera_id in self.processors:
+                logging.warning(f"摄像头{camera_id}已在运行")
+                raise RuntimeError(f"摄像头{camera_id}已在运行")
+            if camera_id in self.states:
+                logging.warning(f"摄像头{camera_id}正在{self.STATE_NAMES[self.states[camera_id]]}")
+                raise RuntimeError(f"摄像头{camera_id}正在{self.STATE_NAMES[self.states[camera_id]]}")
+            self.states[camera_id] = self.STARTING
             
         try:
             if camera_id >= len(CONFIG.cameras):
                 raise ValueError(f"摄像头{camera_id}未配置")
                 
+            if CONFIG.execution_mode == "process":
+                return self._start_camera_process(camera_id)
+                
+            from .video_processor import VideoProcessor
             stop_event = Event()
-            processor = VideoProcessor(camera_id, stop_event)
-            thread = Thread(target=processor.process_stream)
+            processor = VideoProcessor(
+                camera_id, stop_event,
+                inference_service=self._get_inference_service(),
+                audio_engine=self._get_audio_engine(),
+                hands_pool=None if CONFIG.shared_inference else self._get_hands_pool(),
+                clip_recorder=self._get_clip_recorder()
+            )
+            thread = Thread(target=processor.process_stream, name=f"Camera-{camera_id}")
             
-            self.processors[camera_id] = processor
-            self.stop_events[camera_id] = stop_event
-            self.threads[camera_id] = thread
+            with self._lock:
+                self.processors[camera_id] = processor
+                self.stop_events[camera_id] = stop_event
+                self.threads[camera_id] = thread
             
             thread.start()
             return True
         except Exception as e:
             logging.error(f"启动摄像头{camera_id}失败: {str(e)}")
             return False
+        finally:
+            with self._lock:
+                self.states.pop(camera_id, None)
+                self._state_changed.notify_all()
             
-    def stop_camera(self, camera_id):
-        """停止指定摄像头
+    def _start_camera_process(self, camera_id):
+        """以子进程方式启动指定摄像头
+        
+        子进程句柄同时充当处理器和线程的角色，保持get_processor/get_status接口不变。
         
         Args:
             camera_id: 摄像头ID
+            
+        Returns:
+            bool: 启动是否成功
         """
-        if camera_id in self.stop_events:
-            self.stop_events[camera_id].set()
-            if camera_id in self.threads:
-                self.threads[camera_id].join()
-                del self.threads[camera_id]
-            if camera_id in self.processors:
-                del self.processors[camera_id]
-            del self.stop_events[camera_id]
+        from .process_runner import ProcessCameraHandle
+        handle = ProcessCameraHandle(camera_id)
+        try:
+            handle.start()
+        except Exception:
+            handle.release()
+            raise
+        with self._lock:
+            self.processors[camera_id] = handle
+            self.stop_events[camera_id] = handle.stop_event
+            self.threads[camera_id] = handle
+        return True
+        
+    def stop_camera(self, camera_id, timeout=None):
+        """停止指定摄像头（阻塞直到停止完成或超时）
+        
+        Args:
+            camera_id: 摄像头ID
+            timeout: 等待处理线程退出的时间（秒），默认为CONFIG.camera_stop_timeout
+            
+        超时后处理线程仍在运行（仍占用摄像头设备），保留其记录并标记为TIMEOUT，
+        在线程真正退出之前不能再次启动该摄像头；可以再次调用本方法继续等待。
+        摄像头正在启动或正由其他调用停止时，先等待该过程结束（最长CONFIG.camera_start_timeout），
+        仍未结束则不做任何操作并返回False。
+        
+        Returns:
+            bool: 是否已停止（未运行的摄像头返回True）
+        """
+        deadline = time.monotonic() + CONFIG.camera_start_timeout
+        with self._lock:
+            self._reap_locked(camera_id)
+            while self.states.get(camera_id) in (self.STARTING, self.STOPPING):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logging.warning("摄像头%s 仍在%s，本次停止未执行",
+                                    camera_id, self.STATE_NAMES[self.states[camera_id]])
+                    return False
+                self._state_changed.wait(remaining)
+            if camera_id not in self.stop_events:
+                return True
+            self.states[camera_id] = self.STOPPING
+            stop_event = self.stop_events[camera_id]
+            thread = self.threads.get(camera_id)
+            
+        stopped = True
+        try:
+            stop_event.set()
+            if thread is not None:
+                thread.join(CONFIG.camera_stop_timeout if timeout is None else timeout)
+                if thread.is_alive():
+                    # 线程已收到停止信号，会在当前帧结束后自行释放资源
+                    logging.warning("摄像头%s 未在超时时间内停止", camera_id)
+                    stopped = False
+        finally:
+            with self._lock:
+                if stopped:
+                    self.threads.pop(camera_id, None)
+                    self.processors.pop(camera_id, None)
+                    self.stop_events.pop(camera_id, None)
+                    self.states.pop(camera_id, None)
+                else:
+                    self.states[camera_id] = self.TIMEOUT
+                self._state_changed.notify_all()
+        return stopped
+        
+    def _reap_locked(self, camera_id):
+        """清除停止超时、但处理线程之后已经退出的摄像头记录（调用方需持有_lock）"""
+        if self.states.get(camera_id) != self.TIMEOUT:
+            return
+        thread = self.threads.get(camera_id)
+        if thread is None or not thread.is_alive():
+            self.threads.pop(camera_id, None)
+            self.processors.pop(camera_id, None)
+            self.stop_events.pop(camera_id, None)
+            self.states.pop(camera_id, None)
+        
+    def get_state(self, camera_id):
+        """获取摄像头的生命周期状态
+        
+        Args:
+            camera_id: 摄像头ID
+            
+        Returns:
+            str: STARTING、STOPPING、TIMEOUT、RUNNING或STOPPED
+        """
+        with self._lock:
+            self._reap_locked(camera_id)
+            if camera_id in self.states:
+                return self.states[camera_id]
+            return self.RUNNING if camera_id in self.processors else self.STOPPED
+        
+    def _get_lifecycle_pool(self):
+        """获取执行启动/停止任务的线程池，首次使用时创建"""
+        with self._lock:
+            if self._lifecycle_pool is None:
+                self._lifecycle_pool = ThreadPoolExecutor(
+                    max_workers=max(1, CONFIG.camera_lifecycle_workers),
+                    thread_name_prefix="CameraLifecycle"
+                )
+            return self._lifecycle_pool
+        
+    def _run_lifecycle_task(self, camera_id, action, states, callback):
+        """在工作线程中执行启动或停止，并通过回调报告进度
+        
+        Args:
+            camera_id: 摄像头ID
+            action: start_camera或stop_camera
+            states: (开始时, 成功时, 失败时) 报告的状态
+            callback: 进度回调 callback(camera_id, state, message)
+            
+        Returns:
+            bool: action的返回值
+        """
+        progress, succeeded, failed = states
+        if callback is not None:
+            callback(camera_id, progress, None)
+        try:
+            ok = action(camera_id)
+            message = None
+        except Exception as e:
+            ok, message = False, str(e)
+        if callback is not None:
+            callback(camera_id, succeeded if ok else failed, message)
+        return ok
+        
+    def _submit_lifecycle(self, camera_ids, action, states, timeout, callback):
+        """并发执行一批启动或停止任务
+        
+        超过timeout仍未完成的摄像头通过回调报告TIMEOUT；任务本身不会被中断，
+        之后完成时仍会报告最终状态。
+        
+        Returns:
+            dict: {camera_id: Future}，Future结果为是否成功
+        """
+        pool = self._get_lifecycle_pool()
+        futures = {
+            camera_id: pool.submit(self._run_lifecycle_task, camera_id, action, states, callback)
+            for camera_id in camera_ids
+        }
+        if callback is not None and futures:
+            Thread(
+                target=self._watch_timeouts,
+                args=(futures, timeout, callback),
+                name="CameraLifecycleWatch",
+                daemon=True
+            ).start()
+        return futures
+        
+    @staticmethod
+    def _watch_timeouts(futures, timeout, callback):
+        """等待一批任务，对超时未完成的摄像头报告TIMEOUT"""
+        wait(futures.values(), timeout=timeout)
+        for camera_id, future in futures.items():
+            if not future.done():
+                callback(camera_id, CameraManager.TIMEOUT, None)
+        
+    def start_cameras(self, camera_ids, callback=None):
+        """在后台并发启动多个摄像头，立即返回
+        
+        Args:
+            camera_ids: 摄像头ID列表
+            callback: 进度回调 callback(camera_id, state, message)，在工作线程中调用
+            
+        Returns:
+            dict: {camera_id: Future}
+        """
+        return self._submit_lifecycle(
+            camera_ids, self.start_camera, (self.STARTING, self.RUNNING, self.FAILED),
+            CONFIG.camera_start_timeout, callback
+        )
+        
+    def stop_cameras(self, camera_ids=None, callback=None):
+        """在后台并发停止多个摄像头，立即返回
+        
+        Args:
+            camera_ids: 摄像头ID列表，默认为所有运行中的摄像头
+            callback: 进度回调 callback(camera_id, state, message)，在工作线程中调用
+            
+        Returns:
+            dict: {camera_id: Future}
+        """
+        if camera_ids is None:
+            with self._lock:
+                camera_ids = list(self.stop_events.keys())
+        return self._submit_lifecycle(
+            camera_ids, self.stop_camera, (self.STOPPING, self.STOPPED, self.TIMEOUT),
+            CONFIG.camera_stop_timeout, callback
+        )
+            
+    def restart_cameras(self, camera_ids, callback=None):
+        """在后台先并发停止、再并发启动指定摄像头，立即返回
+        
+        未能在超时前停止的摄像头不重新启动，以免两个处理器同时打开同一个设备。
+        
+        Args:
+            camera_ids: 摄像头ID列表
+            callback: 进度回调 callback(camera_id, state, message)，在工作线程中调用
+        """
+        def run():
+            futures = self.stop_cameras(camera_ids, callback)
+            wait(futures.values())
+            stopped = []
+            for camera_id in camera_ids:
+                if futures[camera_id].result():
+                    stopped.append(camera_id)
+                else:
+                    logging.error("摄像头%s 未能停止，跳过重新启动", camera_id)
+            self.start_cameras(stopped, callback)
+        Thread(target=run, name="CameraRestart", daemon=True).start()
             
     def stop_all(self):
-        """停止所有摄像头"""
-        for camera_id in list(self.stop_events.keys()):
-            self.stop_camera(camera_id)
+        """并发停止所有摄像头，阻塞直到全部停止或超时
+        
+        共享服务（推理服务、模型池、音频引擎、录像编码器）保持运行，
+        重新启动摄像头（如应用ROI设置）时无需重新加载模型。
+        """
+        wait(self.stop_cameras().values())
+            
+    def shutdown(self):
+        """停止所有摄像头，关闭共享服务和监控指标服务"""
+        self.stop_all()
+        if self._lifecycle_pool is not None:
+            self._lifecycle_pool.shutdown(wait=False)
+            self._lifecycle_pool = None
+        with self._services_lock:
+            if self.inference_service is not None:
+                self.inference_service.shutdown()
+                self.inference_service = None
+            if self.hands_pool is not None:
+                self.hands_pool.shutdown()
+                self.hands_pool = None
+            if self.audio_engine is not None:
+                self.audio_engine.shutdown()
+                self.audio_engine = None
+            if self.clip_recorder is not None:
+                self.clip_recorder.shutdown()
+                self.clip_recorder = None
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
             
     def get_processor(self, camera_id):
         """获取指定摄像头的处理器
@@ -92,4 +461,61 @@ class CameraManager:
         Returns:
             VideoProcessor: 摄像头处理器实例
         """
-        return self.processors.get(camera_id)
\ No newline at end of file
+        return self.processors.get(camera_id)
+        
+    def _processor_snapshot(self):
+        """获取运行中处理器的副本，生命周期线程同时增删摄像头时也可以安全遍历"""
+        with self._lock:
+            return dict(self.processors)
+        
+    def set_stage_timing(self, enabled):
+        """开启或关闭所有运行中摄像头的阶段耗时统计
+        
+        Args:
+            enabled: 是否启用
+        """
+        CONFIG.stage_timing_enabled = enabled
+        for processor in self._processor_snapshot().values():
+            timer = getattr(processor, 'stage_timer', None)
+            if timer is not None:
+                timer.enabled = enabled
+            elif hasattr(processor, 'set_stage_timing'):
+                # 多进程模式下通过命令队列通知子进程
+                processor.set_stage_timing(enabled)
+        logging.info(f"阶段耗时统计已{'开启' if enabled else '关闭'}")
+        
+    def dump_stage_timings(self, path=None):
+        """导出所有运行中摄像头的阶段耗时统计
+        
+        Args:
+            path: 导出的JSON文件路径，默认写入CONFIG.stage_timing_dump_dir
+            
+        Returns:
+            str: 导出的文件路径
+        """
+        timings = {}
+        for camera_id, processor in self._processor_snapshot().items():
+            timer = getattr(processor, 'stage_timer', None)
+            if timer is not None:
+                timings[camera_id] = timer.summary()
+            elif hasattr(processor, 'dump_stage_timings'):
+                # 子进程的统计不在本进程内，由子进程输出到日志
+                processor.dump_stage_timings()
+        
+        if path is None:
+            os.makedirs(CONFIG.stage_timing_dump_dir, exist_ok=True)
+            path = os.path.join(
+                CONFIG.stage_timing_dump_dir,
+                time.strftime("stage_timings_%Y%m%d_%H%M%S.json")
+            )
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(timings, f, ensure_ascii=False, indent=2)
+        
+        for camera_id, summary in timings.items():
+            for stage, stats in summary.items():
+                logging.info(
+                    f"摄像头{camera_id} {stage}: p50={stats['p50']:.2f}ms "
+                    f"p95={stats['p95']:.2f}ms p99={stats['p99']:.2f}ms"
+                )
+        logging.info(f"阶段耗时统计已导出到 {path}")
+        return path
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+# modules/clip_recorder.py
+# 报警录像模块：报警前帧缓冲区和后台片段编码
+
+import logging
+import os
+import queue
+import time
+from collections import deque
+from threading import Thread
+
+import cv2
+from config import CONFIG
+
+class PreAlarmBuffer:
+    """单个摄像头的报警前帧缓冲区，只在处理线程中访问
+
+    主要功能：
+    - 按CONFIG.clip_fps采样，缩小到CONFIG.clip_max_width后保存原始像素，
+      处理线程不做任何编码，非采样帧只做一次时间比较
+    - 保留最近window秒的帧，同时限制总字节数，超出时丢弃最旧的帧
+    - 按时间范围取出帧，返回数组的引用而不复制（存入后不再修改，可交给编码线程）
+    """
+
+    def __init__(self, window, fps, max_width, max_bytes):
+        """初始化缓冲区
+
+        Args:
+            window: 保留的时长（秒），应覆盖报警前和报警后两段
+            fps: 采样帧率
+            max_width: 缓冲帧的最大宽度（像素）
+            max_bytes: 缓冲区占用的字节数上限
+        """
+        self.window = window
+        self.interval = 1.0 / fps
+        self.max_width = max_width
+        self.max_bytes = max_bytes
+        self._frames = deque()  # (时间戳, BGR数组)
+        self._next_sample = 0.0
+        self.nbytes = 0
+        self.evicted_frames = 0  # 因超出内存上限被提前丢弃的帧数
+
+    def should_sample(self, timestamp):
+        """判断当前帧是否需要采样"""
+        return timestamp >= self._next_sample
+
+    def add(self, frame, timestamp):
+        """缩小一帧后加入缓冲区
+
+        Args:
+            frame: BGR图像帧（不会被保留引用）
+            timestamp: 帧时间戳（time.time()）
+        """
+        # 按采样间隔推进，处理循环偶尔变慢时不会连续补采
+        self._next_sample = max(self._next_sample + self.interval, timestamp)
+        h, w = frame.shape[:2]
+        if w > self.max_width:
+            scale = self.max_width / w
+            image = cv2.resize(frame, (self.max_width, max(1, round(h * scale))),
+                               interpolation=cv2.INTER_AREA)
+        else:
+            # 采集缓冲区会被复用，必须复制
+            image = frame.copy()
+        self._frames.append((timestamp, image))
+        self.nbytes += image.nbytes
+
+        frames = self._frames
+        while frames and frames[0][0] < timestamp - self.window:
+            self.nbytes -= frames.popleft()[1].nbytes
+        while self.nbytes > self.max_bytes and len(frames) > 1:
+            self.nbytes -= frames.popleft()[1].nbytes
+            self.evicted_frames += 1
+
+    def frames_between(self, start, end):
+        """取出时间范围内的帧
+
+        Args:
+            start: 起始时间戳
+            end: 结束时间戳
+
+        Returns:
+            list: [(时间戳, BGR数组)]，按时间升序
+        """
+        return [item for item in self._frames if start <= item[0] <= end]
+
+    def get_stats(self):
+        """获取缓冲区统计"""
+        return {
+            'clip_buffer_frames': len(self._frames),
+            'clip_buffer_kb': self.nbytes // 1024,
+            'clip_buffer_evicted': self.evicted_frames
+        }
+
+class ClipRecorder:
+    """报警录像编码器类，由CameraManager持有，供所有摄像头共用
+
+    主要功能：
+    - 在独立线程中把缓冲的帧编码写入视频文件，处理线程只做一次非阻塞入队
+    - 等待编码的片段数量有上限，队列满时丢弃新片段并计数，不会反压处理循环
+    - 先写入临时文件再重命名，不会出现写了一半的片段
+    - 录像目录超过容量上限时删除最早的片段
+    """
+
+    def __init__(self, output_dir=None, max_pending=None, max_disk_mb=None):
+        """初始化编码器
+
+        Args:
+            output_dir: 片段保存目录，默认为CONFIG.clip_dir
+            max_pending: 等待编码的片段数上限，默认为CONFIG.clip_queue_size
+            max_disk_mb: 录像目录容量上限（MB），默认为CONFIG.clip_dir_max_mb
+        """
+        self.output_dir = output_dir or CONFIG.clip_dir
+        self.max_disk_bytes = int((CONFIG.clip_dir_max_mb if max_disk_mb is None else max_disk_mb) * 1024 * 1024)
+        self._jobs = queue.Queue(maxsize=max(1, CONFIG.clip_queue_size if max_pending is None else max_pending))
+        self._thread = None
+        self.clips_written = 0
+        self.clips_dropped = 0
+
+    def start(self):
+        """创建录像目录并启动编码线程"""
+        if self._thread is not None:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._thread = Thread(target=self._run, name="ClipRecorder", daemon=True)
+        self._thread.start()
+
+    def submit(self, camera_id, level, trigger_time, frames, fps):
+        """提交一个片段等待编码（非阻塞）
+
+        Args:
+            camera_id: 摄像头ID
+            level: 触发的报警级别（秒）
+            trigger_time: 报警触发时间戳
+            frames: [(时间戳, BGR数组)]，数组在入队后不能再被修改
+            fps: 片段帧率
+
+        Returns:
+            bool: 是否已入队，队列满或没有帧时返回False
+        """
+        if not frames:
+            return False
+        try:
+            self._jobs.put_nowait((camera_id, level, trigger_time, frames, fps))
+            return True
+        except queue.Full:
+            self.clips_dropped += 1
+            logging.warning("录像队列已满，丢弃摄像头%s的报警片段", camera_id)
+            return False
+
+    def _run(self):
+        """编码线程主循环"""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            try:
+                path = self._write_clip(*job)
+                self.clips_written += 1
+                logging.info("报警片段已保存: %s", path)
+                self._enforce_quota()
+            except Exception as e:
+                logging.error("报警片段保存失败: %s", e)
+
+    def _write_clip(self, camera_id, level, trigger_time, frames, fps):
+        """将帧序列编码写入视频文件
+
+        Returns:
+            str: 片段文件路径
+        """
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(trigger_time))
+        name = f"cam{camera_id}_{stamp}_{level}s.mp4"
+        path = os.path.join(self.output_dir, name)
+        # OpenCV按扩展名选择封装格式，临时文件保留.mp4后缀，以"."开头与完成的片段区分
+        tmp_path = os.path.join(self.output_dir, "." + name)
+        size = frames[0][1].shape[1::-1]
+        writer = cv2.VideoWriter(tmp_path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+        if not writer.isOpened():
+            raise RuntimeError(f"无法创建视频文件: {tmp_path}")
+        try:
+            for _, image in frames:
+                if image.shape[1::-1] != size:
+                    # ROI或分辨率在录制期间变化时统一到首帧尺寸
+                    image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+                writer.write(image)
+        finally:
+            writer.release()
+        os.replace(tmp_path, path)
+        return path
+
+    def _enforce_quota(self):
+        """录像目录超过容量上限时删除最早的片段"""
+        clips = []
+        for entry in os.scandir(self.output_dir):
+            if entry.is_file() and entry.name.endswith(".mp4") and not entry.name.startswith("."):
+                stat = entry.stat()
+                clips.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in clips)
+        for _, size, path in sorted(clips):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                logging.info("录像目录超过容量上限，删除旧片段: %s", path)
+            except OSError as e:
+                logging.warning("删除旧片段失败: %s", e)
+
+    def get_stats(self):
+        """获取编码统计"""
+        return {
+            'clips_written': self.clips_written,
+            'clips_dropped': self.clips_dropped,
+            'clips_pending': self._jobs.qsize()
+        }
+
+    def shutdown(self, timeout=10.0):
+        """写完已入队的片段后停止编码线程
+
+        Args:
+            timeout: 等待编码线程退出的时间（秒）
+        """
+        if self._thread is None:
+            return
+        # 队列满时阻塞等待空位，保证停止命令排在已入队片段之后
+        try:
+            self._jobs.put(None, timeout=timeout)
+        except queue.Full:
+            logging.warning("录像队列未能在超时前清空，部分片段未保存")
+        self._thread.join(timeout)
+        self._thread = None
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# modules/detection_scheduler.py
+# 自适应检测调度模块
+
+import logging
+
+class DetectionScheduler:
+    """自适应检测调度器类，根据检测状态切换每个摄像头的推理频率
+
+    主要功能：
+    - 空闲时以较低频率检测，节省CPU
+    - 检测到目标手势或报警计时开始后切换到全速检测，保证报警计时精度
+    - 手势消失并经过冷却时间后回落到低频率
+    - 记录频率切换日志并提供状态查询
+    """
+
+    IDLE = "idle"
+    ACTIVE = "active"
+
+    def __init__(self, camera_id, active_interval, idle_interval, cooldown):
+        """初始化调度器
+
+        Args:
+            camera_id: 摄像头ID，用于日志
+            active_interval: 全速检测间隔（秒）
+            idle_interval: 空闲检测间隔（秒）
+            cooldown: 从全速回落到空闲前需要保持无检测的时间（秒）
+        """
+        self.camera_id = camera_id
+        self.active_interval = active_interval
+        self.idle_interval = max(idle_interval, active_interval)
+        self.cooldown = cooldown
+        self.mode = self.IDLE
+        self._last_run = 0
+        self._last_activity = 0
+        self.transitions = 0
+
+    @property
+    def interval(self):
+        """当前检测间隔（秒）"""
+        return self.active_interval if self.mode == self.ACTIVE else self.idle_interval
+
+    def should_detect(self, current_time):
+        """判断当前是否到了检测时间
+
+        Args:
+            current_time: 当前时间戳（秒）
+
+        Returns:
+            bool: 是否应执行检测
+        """
+        return current_time - self._last_run >= self.interval
+
+    def mark_run(self, current_time):
+        """记录一次检测调度
+
+        Args:
+            current_time: 当前时间戳（秒）
+        """
+        self._last_run = current_time
+
+    def update(self, current_time, gesture_detected, detection_active):
+        """根据检测结果更新调度状态
+
+        Args:
+            current_time: 当前时间戳（秒）
+            gesture_detected: 本次检测是否发现目标手势
+            detection_active: 报警计时是否已开始
+        """
+        if gesture_detected or detection_active:
+            self._last_activity = current_time
+            if self.mode != self.ACTIVE:
+                self._switch(self.ACTIVE)
+        elif self.mode == self.ACTIVE and current_time - self._last_activity >= self.cooldown:
+            self._switch(self.IDLE)
+
+    def _switch(self, mode):
+        """切换调度模式并记录日志"""
+        previous = self.interval
+        self.mode = mode
+        self.transitions += 1
+        logging.info(
+            "摄像头%s 检测频率切换为 %s: %.2fs -> %.2fs",
+            self.camera_id, mode, previous, self.interval
+        )
+
+    def get_stats(self):
+        """获取调度状态
+
+        Returns:
+            dict: 当前模式、检测间隔和切换次数
+        """
+        return {
+            'detection_mode': self.mode,
+            'detection_interval': self.interval,
+            'rate_transitions': self.transitions
+        }
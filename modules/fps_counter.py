@@ -2,34 +2,134 @@
 # modules/fps_counter.py
 # FPS计数器模块
 
+import time
+
 import numpy as np
 
 class FPSCounter:
-    """FPS计数器类，用于计算和平滑帧率显示
-    
+    """FPS计数器类，基于预分配的环形缓冲区记录帧间隔
+
     主要功能：
-    - 记录最近的帧率历史
-    - 计算平均帧率用于显示
+    - O(1)记录帧间隔（tick/add_interval），适合每帧调用
+    - 真实帧率：窗口内帧数 / 窗口内总时长，而非瞬时帧率的平均值
+    - 指数加权滑动平均（EWMA）帧率
+    - 指定窗口内帧时间的p50/p95/p99分位数
     """
 
-    def __init__(self):
-        """初始化FPS计数器"""
-        self.fps_history = []
+    def __init__(self, capacity=120, alpha=0.1):
+        """初始化FPS计数器
+
+        Args:
+            capacity: 环形缓冲区容量（保留最近多少个帧间隔）
+            alpha: EWMA平滑系数（0-1），越大越灵敏
+        """
+        self.capacity = max(2, int(capacity))
+        self.alpha = alpha
+        self._intervals = np.zeros(self.capacity, dtype=np.float64)
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self._ewma_interval = 0.0
+        self._last_timestamp = None
+
+    def reset(self):
+        """清空所有记录"""
+        self._intervals[:] = 0
+        self._index = 0
+        self._count = 0
+        self._sum = 0.0
+        self._ewma_interval = 0.0
+        self._last_timestamp = None
+
+    def tick(self, timestamp=None):
+        """记录一帧完成的时间点
+
+        Args:
+            timestamp: 时间戳（秒），默认使用time.perf_counter()
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        if self._last_timestamp is not None:
+            self.add_interval(timestamp - self._last_timestamp)
+        self._last_timestamp = timestamp
+
+    def add_interval(self, interval):
+        """直接记录一个帧间隔
+
+        Args:
+            interval: 帧间隔（秒）
+        """
+        if interval <= 0:
+            return
+        index = self._index
+        self._sum += interval - self._intervals[index]
+        self._intervals[index] = interval
+        self._index = index + 1
+        if self._index == self.capacity:
+            self._index = 0
+            # 每轮重新求和，消除浮点累计误差
+            self._sum = float(self._intervals.sum())
+        if self._count < self.capacity:
+            self._count += 1
+        if self._ewma_interval:
+            self._ewma_interval += self.alpha * (interval - self._ewma_interval)
+        else:
+            self._ewma_interval = interval
 
     def update(self, fps):
-        """更新帧率历史
-        
+        """按瞬时帧率记录一帧（兼容旧接口）
+
         Args:
             fps: 当前帧率
         """
-        self.fps_history.append(fps)
-        if len(self.fps_history) > 10:
-            self.fps_history.pop(0)
+        if fps > 0:
+            self.add_interval(1.0 / fps)
+
+    def _window(self, window):
+        """返回最近window个帧间隔（未指定时返回全部）"""
+        count = self._count if window is None else min(int(window), self._count)
+        if count <= 0:
+            return self._intervals[:0]
+        start = self._index - count
+        if start >= 0:
+            return self._intervals[start:self._index]
+        return np.concatenate((self._intervals[start:], self._intervals[:self._index]))
+
+    def get_average(self, window=None):
+        """获取真实帧率（帧数 / 总时长）
+
+        Args:
+            window: 统计最近多少帧，默认使用整个缓冲区（O(1)）
+
+        Returns:
+            float: 帧率
+        """
+        if window is None:
+            return self._count / self._sum if self._count and self._sum > 0 else 0
+        intervals = self._window(window)
+        total = float(intervals.sum())
+        return len(intervals) / total if total > 0 else 0
+
+    def get_ewma(self):
+        """获取指数加权滑动平均帧率
+
+        Returns:
+            float: 帧率
+        """
+        return 1.0 / self._ewma_interval if self._ewma_interval > 0 else 0
+
+    def get_frame_time_percentiles(self, percentiles=(50, 95, 99), window=None):
+        """获取帧时间分位数
+
+        Args:
+            percentiles: 需要的分位数列表
+            window: 统计最近多少帧，默认使用整个缓冲区
 
-    def get_average(self):
-        """获取平均帧率
-        
         Returns:
-            float: 平均帧率
+            dict: {'p50': 毫秒, ...}，没有数据时为空字典
         """
-        return np.mean(self.fps_history) if self.fps_history else 0
\ No newline at end of file
+        intervals = self._window(window)
+        if not len(intervals):
+            return {}
+        values = np.percentile(intervals, percentiles) * 1000
+        return {f"p{p:g}": float(v) for p, v in zip(percentiles, values)}
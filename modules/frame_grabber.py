@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+# modules/frame_grabber.py
+# 帧采集线程模块
+
+import logging
+import time
+from threading import Thread, Condition
+
+class FrameGrabber:
+    """帧采集器类，在独立线程中持续读取摄像头，处理循环总是取最新帧
+
+    主要功能：
+    - 持续从设备读取帧，避免驱动内部积压过期帧
+    - 使用预分配的环形缓冲区，采集时直接写入缓冲区，不额外分配内存
+    - 处理循环读取时总是拿到最新帧，并统计被跳过（丢弃）的帧数
+
+    处理循环当前持有的槽位和最新写入的槽位都不会被采集线程覆盖，
+    其余槽位轮换写入，因此缓冲区至少需要3个槽位。
+    """
+
+    def __init__(self, cap, buffer_size=3, name="FrameGrabber"):
+        """初始化帧采集器
+
+        Args:
+            cap: 已打开的cv2.VideoCapture对象
+            buffer_size: 环形缓冲区槽位数（至少为3）
+            name: 采集线程名称
+        """
+        self.cap = cap
+        self.slots = max(3, int(buffer_size))
+        self.name = name
+        self._buffers = [None] * self.slots
+        self._latest_slot = -1  # 最新写入完成的槽位
+        self._write_seq = -1  # 最新写入的帧序号
+        self._read_seq = -1  # 处理循环最近读取的帧序号
+        self._in_use = -1  # 处理循环当前持有的槽位
+        self._cond = Condition()
+        self._running = False
+        self._thread = None
+        self.stream_error = False
+        self.grabbed_frames = 0
+        self.dropped_frames = 0
+
+    def start(self):
+        """启动采集线程
+
+        Raises:
+            RuntimeError: 当上一个采集线程仍未退出时
+        """
+        if self._thread is not None and self._thread.is_alive():
+            # 旧线程可能还在读取，再启动一个会出现两个线程同时读取同一个视频源
+            raise RuntimeError(f"{self.name} 上一个采集线程仍在运行")
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self.stream_error = False
+        self._thread = Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """停止采集线程
+
+        采集线程可能阻塞在cap.read()中，超时后线程仍在运行时保留线程引用，
+        调用方在本方法返回True之前不能释放或替换cap。
+
+        Args:
+            timeout: 等待线程退出的超时时间（秒）
+
+        Returns:
+            bool: 采集线程是否已经退出
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logging.warning("%s 未在%.1f秒内退出", self.name, timeout)
+                return False
+            self._thread = None
+        return True
+
+    def restart(self, cap):
+        """使用新的摄像头对象重新启动采集（用于断线重连）
+
+        Args:
+            cap: 新打开的cv2.VideoCapture对象
+
+        Raises:
+            RuntimeError: 当旧的采集线程仍未退出时
+        """
+        if not self.stop():
+            raise RuntimeError(f"{self.name} 采集线程仍在读取旧视频源")
+        self.cap = cap
+        with self._cond:
+            # 分辨率可能改变，丢弃旧缓冲区
+            self._buffers = [None] * self.slots
+            self._latest_slot = -1
+            self._in_use = -1
+        self.start()
+
+    def _next_slot(self):
+        """选择下一个可写入的槽位，跳过最新槽位和处理循环正在使用的槽位"""
+        for offset in range(1, self.slots):
+            slot = (self._latest_slot + offset) % self.slots
+            if slot != self._in_use:
+                return slot
+        return (self._latest_slot + 1) % self.slots
+
+    def _run(self):
+        """采集线程主循环"""
+        while True:
+            with self._cond:
+                if not self._running:
+                    break
+                slot = self._next_slot()
+                buffer = self._buffers[slot]
+
+            try:
+                ret, frame = self.cap.read(buffer) if buffer is not None else self.cap.read()
+            except Exception as e:
+                logging.error("%s 读取帧失败: %s", self.name, e)
+                ret, frame = False, None
+
+            with self._cond:
+                if not ret or frame is None:
+                    self.stream_error = True
+                    self._running = False
+                    self._cond.notify_all()
+                    break
+                self._buffers[slot] = frame
+                self._write_seq += 1
+                self._latest_slot = slot
+                self.grabbed_frames += 1
+                self._cond.notify_all()
+
+    def read(self, timeout=2.0):
+        """获取最新帧，若没有比上次更新的帧则等待
+
+        返回的帧在下一次调用read之前不会被采集线程覆盖。
+
+        Args:
+            timeout: 等待新帧的超时时间（秒）
+
+        Returns:
+            tuple: (是否成功, 图像帧)，与cv2.VideoCapture.read的返回格式一致
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._in_use = -1
+            while self._write_seq <= self._read_seq:
+                if self.stream_error or not self._running:
+                    return False, None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False, None
+                self._cond.wait(remaining)
+
+            seq = self._write_seq
+            slot = self._latest_slot
+            if self._read_seq >= 0:
+                self.dropped_frames += seq - self._read_seq - 1
+            self._read_seq = seq
+            self._in_use = slot
+            return True, self._buffers[slot]
+
+    def get_stats(self):
+        """获取采集统计信息
+
+        Returns:
+            dict: 已采集帧数和丢弃帧数
+        """
+        return {
+            'grabbed_frames': self.grabbed_frames,
+            'dropped_frames': self.dropped_frames
+        }
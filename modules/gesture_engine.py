@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# modules/gesture_engine.py
+# 向量化手势判定模块
+
+import numpy as np
+
+LANDMARK_COUNT = 21
+
+def landmarks_to_array(multi_hand_landmarks):
+    """将MediaPipe检测结果中的关键点一次性转换为NumPy数组
+
+    每次推理只转换一次，之后的坐标换算、手势判定和绘制都使用该数组，
+    不再逐个读取protobuf字段。
+
+    Args:
+        multi_hand_landmarks: results.multi_hand_landmarks，可以为None
+
+    Returns:
+        numpy.ndarray: 形状为(手数, 21, 3)的float32数组，没有检测到手时第一维为0
+    """
+    if not multi_hand_landmarks:
+        return np.empty((0, LANDMARK_COUNT, 3), dtype=np.float32)
+    return np.array(
+        [[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in multi_hand_landmarks],
+        dtype=np.float32
+    )
+
+class GestureEngine:
+    """向量化手势判定引擎，由配置中的手势规则编译而成
+
+    主要功能：
+    - 距离、角度、手指弯曲三类规则统一编译为关键点索引数组
+    - 每次判定对所有手、所有规则共用一次取点和一组数组运算，增加规则几乎不增加每帧开销
+    - 多只手时每条规则取最接近成立的一只手的数值，再与各自的阈值比较
+
+    距离规则使用ROI归一化坐标，阈值与ROI大小无关；角度和弯曲规则先按ROI宽高比把
+    x、z换算为与y相同的长度单位，同一手势在不同形状的ROI中得到相同的数值。
+    规则定义见config.GestureConfig。
+    """
+
+    def __init__(self, gestures, default_threshold):
+        """编译手势规则
+
+        Args:
+            gestures: GestureConfig序列，未启用的规则被忽略
+            default_threshold: 规则未指定阈值时使用的阈值
+        """
+        rules = [g for g in gestures if g.enabled]
+        self.names = tuple(g.name for g in rules)
+        self.thresholds = np.array(
+            [default_threshold if g.threshold is None else g.threshold for g in rules],
+            dtype=np.float32
+        )
+        # 低于阈值成立的规则符号为+1，高于阈值成立的为-1，
+        # 乘以符号后所有规则都变为"越小越接近成立"，可以统一取最小值和比较
+        self._sign = np.array([1.0 if g.below else -1.0 for g in rules], dtype=np.float32)
+        self._signed_thresholds = self.thresholds * self._sign
+        # 每条规则编译为三个关键点 (p, q, r)，统一计算向量 u = p - q 和 w = r - q：
+        #   distance (a, b)           -> p=a, q=b, r=b，取u在图像平面上的曼哈顿长度
+        #   angle (a, 顶点, c)         -> p=a, q=顶点, r=c，取u与w的夹角
+        #   curl (手腕, 指根, 指尖)     -> p=指尖, q=手腕, r=指根，取|u| / |w|
+        # 所有规则一次取点、一次计算，再按类型选择结果
+        indices = []
+        for g in rules:
+            if g.kind == "distance":
+                indices.append((g.points[0], g.points[1], g.points[1]))
+            elif g.kind == "angle":
+                indices.append(tuple(g.points))
+            else:
+                wrist, base, tip = g.points
+                indices.append((tip, wrist, base))
+        self._indices = np.array(indices, dtype=np.intp).reshape(-1, 3)
+        self._is_distance = np.array([g.kind == "distance" for g in rules])
+        self._is_angle = np.array([g.kind == "angle" for g in rules])
+
+    def __len__(self):
+        return len(self.names)
+
+    def measure(self, points, aspect=1.0):
+        """计算每只手每条规则的数值
+
+        Args:
+            points: 形状为(..., 手数, 21, 3)的ROI归一化关键点数组
+            aspect: ROI的宽高比（宽/高），标量或形状为points.shape[:-3]的数组
+
+        Returns:
+            numpy.ndarray: 形状为(..., 手数, 规则数)的数值
+        """
+        selected = points[..., self._indices, :]  # (..., 手数, 规则数, 3, 3)
+        u = selected[..., 0, :] - selected[..., 1, :]
+        w = selected[..., 2, :] - selected[..., 1, :]
+        distance = np.abs(u[..., :2]).sum(axis=-1)
+        # 关键点的x、z按ROI宽度归一化，y按高度归一化，非正方形ROI中先换算为同一单位
+        aspect = np.asarray(aspect, dtype=np.float32)
+        scale = np.stack([aspect, np.ones_like(aspect), aspect], axis=-1)[..., None, None, :]
+        u = u * scale
+        w = w * scale
+        uu = (u * u).sum(axis=-1)
+        ww = np.maximum((w * w).sum(axis=-1), 1e-12)
+        cos = (u * w).sum(axis=-1) / np.sqrt(np.maximum(uu * ww, 1e-12))
+        angle = np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+        curl = np.sqrt(uu / ww)
+        return np.where(self._is_distance, distance, np.where(self._is_angle, angle, curl))
+
+    def reduce(self, values):
+        """多只手时每条规则取最接近成立的数值
+
+        Args:
+            values: measure的返回值，至少包含一只手
+
+        Returns:
+            numpy.ndarray: 形状为(规则数,)的数值
+        """
+        return (values * self._sign).min(axis=0) * self._sign
+
+    def reduce_by_group(self, values, membership):
+        """按分组（如手所在的ROI）分别取每条规则最接近成立的数值
+
+        Args:
+            values: measure的返回值，形状为(手数, 规则数)，或各组分别计算的(组数, 手数, 规则数)
+            membership: 形状为(手数, 组数)的布尔数组，表示每只手属于哪些组
+
+        Returns:
+            numpy.ndarray: 形状为(组数, 规则数)的数值，没有手的组为不成立方向的无穷大
+        """
+        signed = np.where(membership.T[:, :, None], values * self._sign, np.inf)
+        return signed.min(axis=1) * self._sign
+
+    def detect(self, values):
+        """将规则数值与各自的阈值比较
+
+        Args:
+            values: 形状为(..., 规则数)的数值
+
+        Returns:
+            numpy.ndarray: 与values形状相同的布尔数组，True表示规则成立
+        """
+        return values * self._sign < self._signed_thresholds
+
+    def active_names(self, detected):
+        """成立的规则名称
+
+        Args:
+            detected: 形状为(规则数,)的布尔数组
+
+        Returns:
+            tuple: 成立的手势名称
+        """
+        return tuple(self.names[i] for i in np.flatnonzero(detected))
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# modules/hands_pool.py
+# 预热的Hands模型池模块
+
+import logging
+from threading import Thread, Lock
+
+import mediapipe as mp
+from config import CONFIG
+
+class HandsPool:
+    """预先创建的MediaPipe Hands模型池，由CameraManager持有
+
+    主要功能：
+    - 在后台线程中预先创建CONFIG.hands_pool_size个视频模式的Hands模型
+    - 摄像头启动时租用一个模型，停止时归还，避免每次启动重新加载模型；
+      启用共享推理时由InferenceService为工作线程租用
+    - 按min_detection_confidence分组保存，租用时总是得到以指定置信度创建的模型，
+      摄像头的检测阈值与独立创建模型时完全一致
+    - 归还时重置模型的跟踪状态，下一个摄像头不会继承上一个摄像头的跟踪结果
+    - 池中没有空闲模型时同步创建，超出池大小的归还模型直接关闭
+    """
+
+    def __init__(self, size=None):
+        """初始化模型池
+
+        Args:
+            size: 预先创建的模型数量，默认为CONFIG.hands_pool_size
+        """
+        self.size = max(0, CONFIG.hands_pool_size if size is None else size)
+        self.mp_hands = mp.solutions.hands
+        # 预热时按启用的摄像头中出现的置信度轮流创建
+        self.confidences = sorted(
+            {cam.min_confidence for cam in CONFIG.cameras if cam.enabled}
+        ) or [0.5]
+        self._idle = {}  # 置信度 -> 空闲模型列表
+        self._leased = {}  # id(模型) -> 创建时使用的置信度
+        self._lock = Lock()
+        self._thread = None
+        self._closed = False
+
+    def start(self):
+        """在后台线程中填充模型池"""
+        if self._thread is not None:
+            return
+        self._thread = Thread(target=self._fill, name="HandsPoolWarmUp", daemon=True)
+        self._thread.start()
+
+    def _create(self, min_confidence):
+        """创建一个视频模式的Hands模型
+
+        Args:
+            min_confidence: 模型的min_detection_confidence
+        """
+        return self.mp_hands.Hands(
+            static_image_mode=False,  # 视频模式
+            max_num_hands=CONFIG.max_num_hands,
+            min_detection_confidence=min_confidence,
+            min_tracking_confidence=0.5,
+            model_complexity=0
+        )
+
+    def _idle_count(self):
+        """空闲模型总数（调用方需持有锁）"""
+        return sum(len(models) for models in self._idle.values())
+
+    def _fill(self):
+        """按置信度轮流创建模型，直到空闲数量达到池大小"""
+        try:
+            created = 0
+            while True:
+                with self._lock:
+                    if self._closed or self._idle_count() >= self.size:
+                        break
+                min_confidence = self.confidences[created % len(self.confidences)]
+                hands = self._create(min_confidence)
+                created += 1
+                with self._lock:
+                    if not self._closed:
+                        self._idle.setdefault(min_confidence, []).append(hands)
+                        continue
+                hands.close()
+                break
+            logging.info("Hands模型池预热完成，空闲模型数: %d", created)
+        except Exception as e:
+            logging.error("Hands模型池预热失败: %s", e)
+
+    def lease(self, min_confidence):
+        """租用一个以指定置信度创建的模型
+
+        Args:
+            min_confidence: 需要的min_detection_confidence
+
+        Returns:
+            Hands: 跟踪状态已清空的模型
+        """
+        with self._lock:
+            idle = self._idle.get(min_confidence)
+            hands = idle.pop() if idle else None
+        if hands is None:
+            logging.debug("Hands模型池没有置信度为%s的空闲模型，同步创建", min_confidence)
+            hands = self._create(min_confidence)
+        with self._lock:
+            self._leased[id(hands)] = min_confidence
+        return hands
+
+    def release(self, hands):
+        """归还模型，重置跟踪状态后放回对应置信度的分组
+
+        Args:
+            hands: 通过lease获得的模型
+        """
+        with self._lock:
+            min_confidence = self._leased.pop(id(hands), None)
+        try:
+            hands.reset()
+        except Exception as e:
+            logging.warning("重置Hands模型失败，关闭该模型: %s", e)
+            hands.close()
+            return
+        with self._lock:
+            if not self._closed and min_confidence is not None and self._idle_count() < self.size:
+                self._idle.setdefault(min_confidence, []).append(hands)
+                return
+        hands.close()
+
+    def shutdown(self):
+        """关闭池中所有空闲模型"""
+        with self._lock:
+            self._closed = True
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for models in idle.values():
+            for hands in models:
+                hands.close()
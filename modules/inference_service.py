@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+# modules/inference_service.py
+# 共享推理服务模块
+
+import logging
+import queue
+import traceback
+from concurrent.futures import Future
+from threading import Thread, Lock
+
+import mediapipe as mp
+from config import CONFIG
+
+class InferenceService:
+    """共享MediaPipe推理服务类，由CameraManager持有，供所有摄像头共用
+
+    主要功能：
+    - 使用固定大小的工作线程池（CONFIG.thread_pool_size）执行手部检测，
+      摄像头数量增加时同时运行的推理数不增加
+    - 每个工作线程按置信度各持有一个视频模式的Hands模型，绑定到该线程、置信度相同的
+      摄像头共用同一个模型，模型数量不超过 工作线程数 × 置信度种类，不随摄像头数量增加
+    - 每个摄像头固定绑定到一个工作线程，同一摄像头的帧按时间顺序处理；
+      模型只服务一个摄像头时保留跨帧的跟踪状态，在不同摄像头之间切换前先重置跟踪状态，
+      不会把一个摄像头的跟踪结果带入另一个摄像头
+    - 模型以摄像头自己的min_detection_confidence创建，检测阈值与独立运行时一致；
+      提供Hands模型池时从池中租用预热好的模型，不再使用时重置跟踪状态后归还
+    - 通过Future返回检测结果，服务停止后提交的任务立即失败
+    """
+
+    def __init__(self, pool_size=None, hands_pool=None):
+        """初始化推理服务
+
+        Args:
+            pool_size: 工作线程数量，默认为CONFIG.thread_pool_size
+            hands_pool: 预热的Hands模型池，为None时在需要时创建模型
+        """
+        self.pool_size = max(1, pool_size or CONFIG.thread_pool_size)
+        self.hands_pool = hands_pool
+        self.mp_hands = mp.solutions.hands
+        self._queues = [queue.Queue() for _ in range(self.pool_size)]
+        self._workers = []
+        self._assignments = {}  # camera_id -> 工作线程索引
+        self._confidences = {}  # camera_id -> 最小置信度
+        self._graphs = {}  # (工作线程索引, 置信度) -> 共用的Hands模型
+        self._lock = Lock()
+        self._running = False
+
+    def start(self):
+        """启动工作线程池"""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            for index in range(self.pool_size):
+                worker = Thread(
+                    target=self._worker_loop,
+                    args=(index,),
+                    name=f"InferenceWorker-{index}",
+                    daemon=True
+                )
+                self._workers.append(worker)
+                worker.start()
+        logging.info("共享推理服务已启动，工作线程数: %d", self.pool_size)
+
+    def _create_graph(self, min_confidence):
+        """创建或租用一个视频模式的Hands模型
+
+        Args:
+            min_confidence: 模型的min_detection_confidence
+        """
+        if self.hands_pool is not None:
+            return self.hands_pool.lease(min_confidence)
+        return self.mp_hands.Hands(
+            static_image_mode=False,  # 视频模式，只服务一个摄像头时保留跟踪状态
+            max_num_hands=CONFIG.max_num_hands,
+            min_detection_confidence=min_confidence,
+            min_tracking_confidence=0.5,
+            model_complexity=0
+        )
+
+    def _release_graph(self, hands):
+        """归还或关闭一个Hands模型"""
+        try:
+            if self.hands_pool is not None:
+                self.hands_pool.release(hands)
+            else:
+                hands.close()
+        except Exception as e:
+            logging.warning("释放Hands模型失败: %s", e)
+
+    def _pick_worker(self, min_confidence):
+        """选择绑定的工作线程：摄像头最少的线程优先，其次是已有该置信度模型的线程
+
+        调用方需持有锁。
+        """
+        loads = [0] * self.pool_size
+        for index in self._assignments.values():
+            loads[index] += 1
+        return min(
+            range(self.pool_size),
+            key=lambda index: (loads[index], (index, min_confidence) not in self._graphs)
+        )
+
+    def _release_unused_locked(self, key):
+        """没有摄像头再使用该模型时，交给其工作线程在处理完已提交的帧后释放
+
+        调用方需持有锁。
+
+        Args:
+            key: (工作线程索引, 置信度)
+        """
+        for camera_id, index in self._assignments.items():
+            if (index, self._confidences[camera_id]) == key:
+                return
+        hands = self._graphs.pop(key, None)
+        if hands is not None:
+            # 交给工作线程释放，避免与正在进行的推理同时使用该模型
+            self._queues[key[0]].put((None, hands, None, None))
+
+    def register(self, camera_id, min_confidence):
+        """注册摄像头，绑定到一个工作线程并准备该线程上对应置信度的模型
+
+        已注册的摄像头以新的置信度再次调用时改用对应置信度的模型，
+        不再使用的旧模型在处理完已提交的帧后释放。
+
+        Args:
+            camera_id: 摄像头ID
+            min_confidence: 该摄像头的最小检测置信度
+
+        Raises:
+            RuntimeError: 当服务未启动时
+        """
+        with self._lock:
+            if not self._running:
+                raise RuntimeError("推理服务未启动")
+            if self._confidences.get(camera_id) == min_confidence:
+                return
+            index = self._assignments.get(camera_id)
+            if index is None:
+                index = self._pick_worker(min_confidence)
+            key = (index, min_confidence)
+            need_graph = key not in self._graphs
+        # 模型加载较慢，不在锁内进行
+        hands = self._create_graph(min_confidence) if need_graph else None
+        stale = None
+        with self._lock:
+            running = self._running
+            if not running:
+                stale = hands
+            else:
+                if hands is not None:
+                    if key in self._graphs:
+                        # 其他摄像头已同时创建了该模型
+                        stale = hands
+                    else:
+                        self._graphs[key] = hands
+                previous = self._confidences.get(camera_id)
+                self._assignments[camera_id] = index
+                self._confidences[camera_id] = min_confidence
+                if previous is not None:
+                    self._release_unused_locked((index, previous))
+            graph_count = len(self._graphs)
+        if stale is not None:
+            self._release_graph(stale)
+        if not running:
+            raise RuntimeError("推理服务未启动")
+        logging.info("摄像头%s 已绑定到推理线程 %s，当前模型数: %d", camera_id, index, graph_count)
+
+    def unregister(self, camera_id):
+        """注销摄像头，没有其他摄像头使用的模型在处理完已提交的帧后释放
+
+        Args:
+            camera_id: 摄像头ID
+        """
+        with self._lock:
+            index = self._assignments.pop(camera_id, None)
+            min_confidence = self._confidences.pop(camera_id, None)
+            if index is not None and self._running:
+                self._release_unused_locked((index, min_confidence))
+
+    def submit(self, camera_id, rgb_frame):
+        """提交一帧RGB图像进行手部检测
+
+        Args:
+            camera_id: 摄像头ID（必须已注册）
+            rgb_frame: RGB格式的ROI图像
+
+        Returns:
+            Future: 完成后结果为MediaPipe手部检测结果
+
+        Raises:
+            RuntimeError: 当服务未启动或摄像头未注册时
+        """
+        future = Future()
+        with self._lock:
+            # 检查和入队在同一把锁内完成，shutdown之后不会再有任务进入队列
+            if not self._running:
+                raise RuntimeError("推理服务未启动")
+            index = self._assignments.get(camera_id)
+            if index is None:
+                raise RuntimeError(f"摄像头{camera_id}未注册到推理服务")
+            hands = self._graphs[(index, self._confidences[camera_id])]
+            self._queues[index].put((camera_id, hands, rgb_frame, future))
+        return future
+
+    def _worker_loop(self, index):
+        """工作线程主循环，顺序处理绑定到该线程的摄像头帧
+
+        Args:
+            index: 工作线程索引
+        """
+        task_queue = self._queues[index]
+        owners = {}  # id(模型) -> 上一帧所属的摄像头，只在本线程中访问
+        try:
+            while True:
+                task = task_queue.get()
+                if task is None:
+                    break
+                camera_id, hands, rgb_frame, future = task
+                if future is None:
+                    # 模型已不再使用，释放
+                    owners.pop(id(hands), None)
+                    self._release_graph(hands)
+                    continue
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    previous = owners.get(id(hands))
+                    if previous is not None and previous != camera_id:
+                        # 切换到另一个摄像头，清空上一个摄像头的跟踪状态
+                        hands.reset()
+                    owners[id(hands)] = camera_id
+                    future.set_result(hands.process(rgb_frame))
+                except Exception as e:
+                    logging.error("推理线程%d 处理摄像头%s失败: %s", index, camera_id, e)
+                    future.set_exception(e)
+        except Exception as e:
+            logging.error("推理线程%d 异常退出: %s\n%s", index, e, traceback.format_exc())
+
+    def shutdown(self):
+        """停止所有工作线程并释放模型"""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            graphs = list(self._graphs.values())
+            self._assignments.clear()
+            self._confidences.clear()
+            self._graphs.clear()
+        for task_queue in self._queues:
+            # 取消尚未处理的任务，避免调用方一直等待
+            while True:
+                try:
+                    task = task_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if task is None:
+                    continue
+                future = task[3]
+                if future is None:
+                    graphs.append(task[1])
+                elif future.set_running_or_notify_cancel():
+                    # 让等待结果的调用方立即失败，而不是一直等待
+                    future.set_exception(RuntimeError("推理服务已停止"))
+            task_queue.put(None)
+        for worker in self._workers:
+            worker.join(timeout=5)
+        alive = [worker.name for worker in self._workers if worker.is_alive()]
+        self._workers.clear()
+        if alive:
+            # 仍在推理中的模型不能关闭，进程退出时由系统回收
+            logging.warning("推理线程未按时退出: %s，跳过模型释放", ", ".join(alive))
+        else:
+            for hands in graphs:
+                self._release_graph(hands)
+        logging.info("共享推理服务已停止")
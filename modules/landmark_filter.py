@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# modules/landmark_filter.py
+# 关键点滤波模块
+
+import math
+
+import numpy as np
+
+# 手掌中心取手腕和四个指根的平均位置，用于前后两次检测之间匹配同一只手
+PALM_POINTS = np.array([0, 5, 9, 13, 17], dtype=np.intp)
+
+def _alpha(dt, cutoff):
+    """一阶低通滤波在截止频率cutoff（Hz，可为数组）下的平滑系数"""
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+class LandmarkFilter:
+    """One-Euro关键点滤波器类，每个摄像头一个，只在处理线程中使用
+
+    主要功能：
+    - 对所有手的21个关键点的每个坐标分量同时做One-Euro滤波（一组数组运算）
+    - 静止时截止频率低、抖动被充分抑制；运动越快截止频率越高、延迟越小
+    - 按实际时间间隔计算平滑系数，检测间隔变化（如空闲降频）时滤波强度保持一致
+    - 按手掌中心匹配前后两次检测中的同一只手，新出现的手从原始位置开始滤波
+    - 没有检测到手或两次检测间隔过长时重置，不会把旧位置带到新出现的手上
+
+    参考：Casiez et al., "1€ Filter: A Simple Speed-based Low-pass Filter for
+    Noisy Input in Interactive Systems", CHI 2012。
+    """
+
+    def __init__(self, min_cutoff=0.3, beta=0.5, d_cutoff=1.0, max_gap=1.0, match_distance=0.2):
+        """初始化滤波器
+
+        Args:
+            min_cutoff: 静止时的截止频率（Hz），越小越平滑
+            beta: 速度系数，越大快速运动时延迟越小
+            d_cutoff: 速度估计的截止频率（Hz）
+            max_gap: 两次检测间隔超过该时间（秒）视为跟踪丢失
+            match_distance: 同一只手的手掌中心在两次检测之间的最大位移（归一化坐标）
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_gap = max_gap
+        self.match_distance = match_distance
+        self.reset_count = 0
+        self.reset()
+
+    def reset(self):
+        """清空滤波状态"""
+        self._x = None   # 滤波后的位置，形状为(手数, 21, 3)
+        self._dx = None  # 滤波后的速度
+        self._timestamp = None
+
+    @property
+    def velocity(self):
+        """最近一次滤波后的速度（每秒归一化坐标），与上一次返回的关键点一一对应，重置后为None"""
+        return self._dx
+
+    def _match(self, points):
+        """为每只新检测到的手找到上一次检测中的同一只手
+
+        Returns:
+            numpy.ndarray: 每只手对应的上一次索引，没有匹配时为-1
+        """
+        centers = points[:, PALM_POINTS, :2].mean(axis=1)
+        previous = self._x[:, PALM_POINTS, :2].mean(axis=1)
+        distances = np.linalg.norm(centers[:, None] - previous[None], axis=-1)
+        matches = np.full(len(points), -1, dtype=np.intp)
+        # 手数很少（不超过max_num_hands），按距离从小到大贪心匹配即可
+        for flat in np.argsort(distances, axis=None):
+            i, j = divmod(int(flat), distances.shape[1])
+            if distances[i, j] > self.match_distance:
+                break
+            if matches[i] < 0 and j not in matches:
+                matches[i] = j
+        return matches
+
+    def __call__(self, points, timestamp):
+        """滤波一次检测结果
+
+        Args:
+            points: 形状为(手数, 21, 3)的关键点数组
+            timestamp: 检测时间戳（秒）
+
+        Returns:
+            numpy.ndarray: 滤波后的关键点，形状与points相同
+        """
+        if not len(points):
+            if self._x is not None:
+                self.reset_count += 1
+            self.reset()
+            return points
+        dt = None if self._timestamp is None else timestamp - self._timestamp
+        if dt is None or dt <= 0 or dt > self.max_gap:
+            if self._x is not None:
+                self.reset_count += 1
+            self._x = points.copy()
+            self._dx = np.zeros_like(points)
+            self._timestamp = timestamp
+            return points
+
+        matches = self._match(points)
+        matched = matches >= 0
+        previous = np.where(matched[:, None, None], self._x[matches], points)
+        previous_dx = np.where(matched[:, None, None], self._dx[matches], 0.0)
+
+        dx = (points - previous) / dt
+        dx_hat = previous_dx + _alpha(dt, self.d_cutoff) * (dx - previous_dx)
+        alpha = _alpha(dt, self.min_cutoff + self.beta * np.abs(dx_hat))
+        x_hat = previous + alpha * (points - previous)
+
+        self._x = x_hat.astype(np.float32)
+        self._dx = dx_hat.astype(np.float32)
+        self._timestamp = timestamp
+        return self._x.copy()
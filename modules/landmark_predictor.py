@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# modules/landmark_predictor.py
+# 关键点外推模块
+
+class LandmarkPredictor:
+    """关键点外推类，每个摄像头一个，只在处理线程中使用
+
+    主要功能：
+    - 保存最近一次检测的关键点和速度（来自关键点滤波器）
+    - 按当前帧时间戳沿速度方向外推，两次检测之间的每一帧都能绘制骨架
+    - 外推时长有上限，超过后停在最后的预测位置，避免手停下后骨架继续漂移
+    - 检测结果过旧时不再给出预测，骨架随之消失
+
+    只做外推而不做内插：内插需要等到下一次检测才能绘制，会让画面整体延迟一个检测间隔。
+    """
+
+    def __init__(self, max_extrapolation=0.15, hold_time=1.0):
+        """初始化外推器
+
+        Args:
+            max_extrapolation: 最长外推时间（秒）
+            hold_time: 检测结果的有效时间（秒），超过后不再绘制
+        """
+        self.max_extrapolation = max_extrapolation
+        self.hold_time = hold_time
+        self.reset()
+
+    def reset(self):
+        """清空保存的检测结果"""
+        self._points = None  # 最近一次检测的关键点，形状为(手数, 21, 3)
+        self._velocity = None  # 对应的速度（每秒归一化坐标），没有速度时只保持位置
+        self._timestamp = None
+
+    def update(self, points, timestamp, velocity=None):
+        """保存一次检测结果
+
+        Args:
+            points: 形状为(手数, 21, 3)的关键点数组，没有手时清空
+            timestamp: 检测时间戳（秒）
+            velocity: 与points形状相同的速度数组，为None时不外推
+        """
+        if points is None or not len(points):
+            self.reset()
+            return
+        self._points = points
+        self._velocity = velocity
+        self._timestamp = timestamp
+
+    def predict(self, timestamp):
+        """预测指定时刻的关键点
+
+        Args:
+            timestamp: 当前帧时间戳（秒）
+
+        Returns:
+            numpy.ndarray: 预测的关键点，形状为(手数, 21, 3)；没有有效的检测结果时为None
+        """
+        if self._points is None:
+            return None
+        dt = timestamp - self._timestamp
+        if dt > self.hold_time:
+            return None
+        if self._velocity is None or dt <= 0:
+            return self._points
+        return self._points + self._velocity * min(dt, self.max_extrapolation)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# modules/metrics_server.py
+# Prometheus格式的本地监控指标接口
+
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from config import get_dropped_log_count
+
+# (指标名, 类型, 说明, get_metrics中的字段)
+METRICS = (
+    ('icu_camera_fps', 'gauge', '摄像头处理帧率', 'fps'),
+    ('icu_camera_processing_latency_seconds', 'gauge', '单帧处理耗时（滑动平均）', 'processing_latency'),
+    ('icu_camera_dropped_frames_total', 'counter', '采集线程丢弃的过期帧数', 'dropped_frames'),
+    ('icu_camera_inference_total', 'counter', '执行的手部检测次数', 'inference_count'),
+    ('icu_camera_inference_timeouts_total', 'counter', '等待推理结果超时而跳过检测的次数', 'inference_timeouts'),
+    ('icu_camera_alarm_level', 'gauge', '当前报警级别', 'alarm_level'),
+    ('icu_camera_detection_duration_seconds', 'gauge', '当前手势持续时间', 'detection_duration'),
+    ('icu_camera_reconnects_total', 'counter', '摄像头重连次数', 'reconnect_count'),
+    ('icu_camera_connected', 'gauge', '摄像头是否已连接', 'connected'),
+)
+
+def render_metrics(processors):
+    """将处理器指标渲染为Prometheus文本格式
+
+    Args:
+        processors: {camera_id: 处理器} 字典，处理器需提供get_metrics()
+
+    Returns:
+        str: Prometheus文本格式的指标
+    """
+    samples = {}
+    for camera_id, processor in list(processors.items()):
+        try:
+            samples[camera_id] = processor.get_metrics()
+        except Exception as e:
+            logging.debug("读取摄像头%s指标失败: %s", camera_id, e)
+
+    lines = []
+    for name, metric_type, help_text, field in METRICS:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for camera_id, metrics in sorted(samples.items()):
+            value = metrics.get(field)
+            if value is not None:
+                lines.append(f'{name}{{camera="{camera_id}"}} {float(value):g}')
+    lines.append("# HELP icu_log_dropped_total 日志队列已满时丢弃的日志条数")
+    lines.append("# TYPE icu_log_dropped_total counter")
+    lines.append(f"icu_log_dropped_total {get_dropped_log_count()}")
+    lines.append("# HELP icu_cameras_running 运行中的摄像头数量")
+    lines.append("# TYPE icu_cameras_running gauge")
+    lines.append(f"icu_cameras_running {len(samples)}")
+    return "\n".join(lines) + "\n"
+
+class MetricsServer:
+    """本地HTTP监控指标服务
+
+    在后台线程中提供 /metrics 接口，按请求读取各处理器的计数器快照，
+    不在处理循环上加锁，也不修改处理器状态。
+    """
+
+    def __init__(self, manager, host="127.0.0.1", port=9108):
+        """初始化指标服务
+
+        Args:
+            manager: CameraManager实例
+            host: 监听地址
+            port: 监听端口，0表示由系统分配
+        """
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """启动HTTP服务"""
+        manager = self.manager
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = render_metrics(manager.processors).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # 避免每次抓取都写入系统日志
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+        logging.info("监控指标服务已启动: http://%s:%s/metrics", self.host, self.port)
+
+    def stop(self):
+        """停止HTTP服务"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+# modules/motion_gate.py
+# 运动门控模块，ROI静止时跳过MediaPipe推理
+
+import cv2
+import numpy as np
+
+class MotionGate:
+    """运动门控类，在推理前用低成本的帧差判断ROI是否有运动
+
+    主要功能：
+    - 将ROI缩小为低分辨率灰度图，与滑动平均背景做差分
+    - 变化像素占比超过阈值时才允许推理
+    - 检测进行中时始终推理，长时间未推理时强制推理一次作为兜底
+    - 统计推理执行和跳过的次数
+    """
+
+    def __init__(self, threshold=0.02, pixel_threshold=25, size=(64, 48),
+                 learning_rate=0.05, force_interval=2.0):
+        """初始化运动门控
+
+        Args:
+            threshold: 变化像素占比阈值（0-1）
+            pixel_threshold: 单个像素灰度变化的判定阈值
+            size: 差分使用的缩小尺寸 (width, height)
+            learning_rate: 背景更新速率（0-1）
+            force_interval: 最长未推理时间，超过后强制推理（秒）
+        """
+        self.threshold = threshold
+        self.pixel_threshold = pixel_threshold
+        self.size = tuple(size)
+        self.learning_rate = learning_rate
+        self.force_interval = force_interval
+
+        width, height = self.size
+        # 预分配缓冲区，避免每帧分配内存
+        self._small = np.empty((height, width, 3), dtype=np.uint8)
+        self._gray = np.empty((height, width), dtype=np.uint8)
+        self._gray_f = np.empty((height, width), dtype=np.float32)
+        self._diff = np.empty((height, width), dtype=np.float32)
+        self._background = None
+        self._last_run = 0
+        self.motion_score = 0.0
+        self.runs = 0
+        self.skips = 0
+
+    def reset(self):
+        """清除背景模型（ROI改变后调用）"""
+        self._background = None
+
+    def _measure_motion(self, roi_frame):
+        """计算ROI相对背景的变化像素占比，并更新背景
+
+        Args:
+            roi_frame: BGR格式的ROI图像
+
+        Returns:
+            float: 变化像素占比（0-1）
+        """
+        cv2.resize(roi_frame, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        self._gray_f[...] = self._gray
+
+        if self._background is None:
+            self._background = self._gray_f.copy()
+            return 1.0
+
+        cv2.absdiff(self._gray_f, self._background, dst=self._diff)
+        score = float(np.count_nonzero(self._diff > self.pixel_threshold)) / self._diff.size
+        cv2.accumulateWeighted(self._gray_f, self._background, self.learning_rate)
+        return score
+
+    def should_infer(self, roi_frame, current_time, active=False):
+        """判断本帧是否需要执行推理
+
+        Args:
+            roi_frame: BGR格式的ROI图像
+            current_time: 当前时间戳（秒）
+            active: 是否已有检测在进行中
+
+        Returns:
+            bool: 是否需要推理
+        """
+        self.motion_score = self._measure_motion(roi_frame)
+        forced = current_time - self._last_run >= self.force_interval
+        if active or forced or self.motion_score >= self.threshold:
+            self._last_run = current_time
+            self.runs += 1
+            return True
+        self.skips += 1
+        return False
+
+    def get_stats(self):
+        """获取门控统计信息
+
+        Returns:
+            dict: 推理执行次数、跳过次数和最近一次运动评分
+        """
+        return {
+            'inference_runs': self.runs,
+            'inference_skipped': self.skips,
+            'motion_score': self.motion_score
+        }
@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+# modules/process_runner.py
+# 多进程运行模式模块，每个摄像头在独立子进程中完成采集、推理和显示
+
+import logging
+import multiprocessing
+import queue
+import time
+import traceback
+from multiprocessing import shared_memory
+from threading import Thread, Lock
+from types import SimpleNamespace
+
+import numpy as np
+from config import CONFIG, init_system, create_process_log_listener
+from .status_snapshot import StatusSnapshot
+from .reconnect_supervisor import ReconnectSupervisor
+
+# 状态块字段布局
+STATUS_FPS = 0
+STATUS_DETECTION_START = 1
+STATUS_ALARM_ACTIVE = 2
+STATUS_PLAYED_COUNT = 3
+STATUS_DROPPED = 4
+STATUS_INFERENCES = 5
+STATUS_RECONNECTS = 6
+STATUS_LATENCY = 7
+STATUS_VERSION = 8
+STATUS_CONNECTION = 9
+STATUS_PLAYED_OFFSET = 10
+MAX_ALARM_LEVELS = 8
+STATUS_SIZE = STATUS_PLAYED_OFFSET + MAX_ALARM_LEVELS
+# 状态描述文本缓冲区长度（UTF-8字节，末尾以0填充）
+STATUS_TEXT_BYTES = 256
+
+class SharedRing:
+    """基于共享内存的环形缓冲区，写入方只保留最新的若干个槽位
+
+    缓冲区头部为int64序号数组：[最新序号, 槽位0序号, 槽位1序号, ...]。
+    写入时先将槽位序号置为-1，写完后再发布新序号；读取方在复制前后
+    校验槽位序号，序号变化则说明读到的是被覆盖中的数据，需要重试。
+    数据直接在共享内存中读写，不经过pickle序列化。
+    """
+
+    def __init__(self, shape, dtype, slots, name=None):
+        """创建或连接共享内存环形缓冲区
+
+        Args:
+            shape: 单个槽位的数组形状
+            dtype: 数组元素类型
+            slots: 槽位数量
+            name: 共享内存名称，为None时创建新的共享内存
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = max(1, slots)
+        self._owner = name is None
+        header_size = 8 * (self.slots + 1)
+        data_size = int(np.prod(self.shape)) * self.dtype.itemsize * self.slots
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=self._owner, size=header_size + data_size
+        )
+        self._seq = np.ndarray((self.slots + 1,), dtype=np.int64, buffer=self.shm.buf)
+        self._data = np.ndarray(
+            (self.slots,) + self.shape, dtype=self.dtype,
+            buffer=self.shm.buf, offset=header_size
+        )
+        if self._owner:
+            self._seq[:] = -1
+
+    @property
+    def name(self):
+        """共享内存名称，供子进程连接"""
+        return self.shm.name
+
+    def spec(self):
+        """返回在其他进程中重新连接该缓冲区所需的参数"""
+        return (self.shape, self.dtype.str, self.slots, self.shm.name)
+
+    @classmethod
+    def attach(cls, spec):
+        """根据spec()的返回值连接已存在的缓冲区"""
+        shape, dtype, slots, name = spec
+        return cls(shape, dtype, slots, name=name)
+
+    def write(self, array):
+        """写入一个新数据块
+
+        Args:
+            array: 形状与槽位一致的数组
+
+        Returns:
+            int: 新数据块的序号
+        """
+        seq = int(self._seq[0]) + 1
+        slot = seq % self.slots
+        self._seq[slot + 1] = -1
+        self._data[slot][...] = array
+        self._seq[slot + 1] = seq
+        self._seq[0] = seq
+        return seq
+
+    def read_latest(self, out=None, retries=3):
+        """读取最新的数据块
+
+        Args:
+            out: 可选的目标数组，避免每次分配内存
+            retries: 读到被覆盖中的数据时的重试次数
+
+        Returns:
+            tuple: (序号, 数组)，没有数据时返回(-1, None)
+        """
+        for _ in range(retries):
+            seq = int(self._seq[0])
+            if seq < 0:
+                return -1, None
+            slot = seq % self.slots
+            if int(self._seq[slot + 1]) != seq:
+                continue
+            if out is None:
+                result = self._data[slot].copy()
+            else:
+                out[...] = self._data[slot]
+                result = out
+            if int(self._seq[slot + 1]) == seq:
+                return seq, result
+        return -1, None
+
+    def close(self):
+        """断开共享内存，创建者同时负责释放"""
+        # 先释放numpy视图，否则共享内存无法关闭
+        self._seq = None
+        self._data = None
+        try:
+            self.shm.close()
+            if self._owner:
+                self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+class SharedStatusPublisher:
+    """子进程中的发布器，将处理器状态写入共享内存
+
+    子进程自己显示画面，父进程只读取状态，因此不跨进程复制图像帧和关键点。
+    状态描述文本由子进程的处理器生成（包含分区报警和连接状态），只在状态快照
+    版本变化时写入文本缓冲区。
+    """
+
+    def __init__(self, status_spec, text_spec):
+        self.status = SharedRing.attach(status_spec)
+        self.text = SharedRing.attach(text_spec)
+        self._lock = Lock()  # 处理线程和重连监督线程都会发布状态
+        self._text_version = None
+
+    def publish(self, processor):
+        """发布处理器状态，每帧处理后和连接状态变化时调用
+
+        Args:
+            processor: VideoProcessor
+        """
+        status = np.zeros(STATUS_SIZE, dtype=np.float64)
+        status[STATUS_FPS] = processor.fps_counter.get_average()
+        status[STATUS_DETECTION_START] = processor.detection_start_time
+        status[STATUS_ALARM_ACTIVE] = 1.0 if processor.alarm_active else 0.0
+        status[STATUS_DROPPED] = processor.grabber.dropped_frames
+        status[STATUS_INFERENCES] = processor.inference_count
+        status[STATUS_RECONNECTS] = processor.reconnect_count
+        status[STATUS_LATENCY] = processor.processing_latency
+        status[STATUS_VERSION] = processor.status_snapshot.version
+        status[STATUS_CONNECTION] = ReconnectSupervisor.STATE_CODES[processor.reconnector.state]
+        played = sorted(processor.played_sounds)[:MAX_ALARM_LEVELS]
+        status[STATUS_PLAYED_COUNT] = len(played)
+        status[STATUS_PLAYED_OFFSET:STATUS_PLAYED_OFFSET + len(played)] = played
+        snapshot = processor.status_snapshot
+        with self._lock:
+            # 先写文本再写状态，父进程看到新版本号时文本已经就绪
+            if snapshot.version != self._text_version:
+                self.text.write(encode_status_text(snapshot.status_text))
+                self._text_version = snapshot.version
+            self.status.write(status)
+
+    def close(self):
+        self.status.close()
+        self.text.close()
+
+def encode_status_text(text):
+    """将状态描述编码为定长的UTF-8字节数组，超长时按字符截断
+
+    Args:
+        text: 状态描述
+
+    Returns:
+        np.ndarray: 长度为STATUS_TEXT_BYTES的uint8数组
+    """
+    data = text.encode('utf-8')
+    if len(data) > STATUS_TEXT_BYTES:
+        data = data[:STATUS_TEXT_BYTES].decode('utf-8', errors='ignore').encode('utf-8')
+    buffer = np.zeros(STATUS_TEXT_BYTES, dtype=np.uint8)
+    buffer[:len(data)] = np.frombuffer(data, dtype=np.uint8)
+    return buffer
+
+def decode_status_text(buffer):
+    """encode_status_text的逆操作"""
+    return bytes(buffer).rstrip(b'\0').decode('utf-8', errors='ignore')
+
+def _command_loop(processor, command_queue, stop_event):
+    """子进程中的命令处理线程，执行父进程发来的控制命令"""
+    while not stop_event.is_set():
+        try:
+            command, payload = command_queue.get(timeout=0.2)
+        except queue.Empty:
+            continue
+        except (EOFError, OSError):
+            break
+        try:
+            if command == 'stop_alarm':
+                processor.stop_alarm()
+            elif command == 'reset_alarm':
+                processor.reset_alarm()
+            elif command == 'update_config':
+                # 不修改处理线程正在读取的CONFIG，只根据父进程的配置生成新的快照
+                processor.update_roi(SimpleNamespace(**payload))
+            elif command == 'set_stage_timing':
+                CONFIG.stage_timing_enabled = payload
+                processor.stage_timer.enabled = payload
+            elif command == 'dump_stage_timings':
+                # 子进程的日志由父进程写入，统计结果随日志汇总到同一个文件
+                for stage, stats in processor.stage_timer.summary().items():
+                    logging.info(
+                        "摄像头%s %s: p50=%.2fms p95=%.2fms p99=%.2fms",
+                        processor.camera_id, stage, stats['p50'], stats['p95'], stats['p99']
+                    )
+        except Exception as e:
+            logging.error("摄像头%s 执行命令 %s 失败: %s", processor.camera_id, command, e)
+
+def _camera_process_main(camera_id, settings, stop_event, command_queue, status_spec,
+                         text_spec, log_queue):
+    """子进程入口：在独立进程中运行一个摄像头的采集、推理和显示
+
+    Args:
+        camera_id: 摄像头ID
+        settings: 父进程的CONFIG属性快照
+        stop_event: 进程间停止事件
+        command_queue: 控制命令队列
+        status_spec: 状态共享缓冲区的连接参数
+        text_spec: 状态描述文本缓冲区的连接参数
+        log_queue: 日志队列，子进程不写日志文件，日志记录交给父进程输出
+    """
+    # 使用父进程的配置，每个子进程加载自己的模型
+    CONFIG.__dict__.update(settings)
+    CONFIG.execution_mode = "thread"
+    CONFIG.shared_inference = False
+    init_system(log_queue)
+
+    # 延迟导入，避免父进程在导入本模块时产生循环依赖
+    from .video_processor import VideoProcessor
+
+    publisher = SharedStatusPublisher(status_spec, text_spec)
+    try:
+        processor = VideoProcessor(camera_id, stop_event)
+        processor.status_publisher = publisher
+        Thread(
+            target=_command_loop,
+            args=(processor, command_queue, stop_event),
+            daemon=True
+        ).start()
+        processor.process_stream()
+    except Exception as e:
+        logging.error("摄像头%s 子进程异常: %s\n%s", camera_id, e, traceback.format_exc())
+    finally:
+        publisher.close()
+
+class ProcessCameraHandle:
+    """父进程中代表一个子进程摄像头的句柄
+
+    对外提供与VideoProcessor一致的状态查询接口（get_status、played_sounds等），
+    状态从共享内存读取，控制命令通过队列发送给子进程；画面由子进程自己显示。
+    """
+
+    def __init__(self, camera_id):
+        """创建共享内存缓冲区和子进程（尚未启动）
+
+        Args:
+            camera_id: 摄像头ID
+        """
+        self.camera_id = camera_id
+        self.config = CONFIG.cameras[camera_id]
+        self.status = SharedRing((STATUS_SIZE,), np.float64, 2)
+        self.status_text = SharedRing((STATUS_TEXT_BYTES,), np.uint8, 2)
+        self._snapshot = None
+
+        context = multiprocessing.get_context("spawn")
+        self.stop_event = context.Event()
+        self._commands = context.Queue()
+        self._log_queue = context.Queue(maxsize=CONFIG.log_queue_size)
+        self._log_listener = None
+        self.process = context.Process(
+            target=_camera_process_main,
+            args=(
+                camera_id,
+                dict(vars(CONFIG)),
+                self.stop_event,
+                self._commands,
+                self.status.spec(),
+                self.status_text.spec(),
+                self._log_queue
+            ),
+            name=f"Camera-{camera_id}",
+            daemon=True
+        )
+
+    def start(self):
+        """启动子进程和接收其日志的监听线程"""
+        self._log_listener = create_process_log_listener(self._log_queue)
+        self.process.start()
+        logging.info(f"摄像头{self.camera_id} 子进程已启动 (pid={self.process.pid})")
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def join(self, timeout=None):
+        """等待子进程退出并释放共享内存
+
+        Args:
+            timeout: 等待超时时间（秒），超时后强制结束子进程
+        """
+        self.process.join(timeout)
+        if self.process.is_alive():
+            logging.warning(f"摄像头{self.camera_id} 子进程未按时退出，强制结束")
+            self.process.terminate()
+            self.process.join(1)
+        self.release()
+
+    def release(self):
+        """释放命令队列、日志监听线程和共享内存"""
+        self._commands.close()
+        if self._log_listener is not None:
+            # 子进程已退出，stop()会先输出队列中剩余的日志
+            self._log_listener.stop()
+            self._log_listener = None
+        self._log_queue.close()
+        self.status.close()
+        self.status_text.close()
+
+    def _read_status(self):
+        """读取最新状态，每次返回新数组
+
+        UI线程和监控指标服务的线程会同时调用，不能共用同一个缓冲区。
+        """
+        seq, status = self.status.read_latest()
+        if seq < 0:
+            return np.zeros(STATUS_SIZE, dtype=np.float64)
+        return status
+
+    @property
+    def detection_start_time(self):
+        return float(self._read_status()[STATUS_DETECTION_START])
+
+    @property
+    def alarm_active(self):
+        return bool(self._read_status()[STATUS_ALARM_ACTIVE])
+
+    @property
+    def played_sounds(self):
+        status = self._read_status()
+        count = int(status[STATUS_PLAYED_COUNT])
+        return {int(v) for v in status[STATUS_PLAYED_OFFSET:STATUS_PLAYED_OFFSET + count]}
+
+    @property
+    def status_snapshot(self):
+        """当前状态快照，子进程状态版本不变时返回同一个对象"""
+        status = self._read_status()
+        version = int(status[STATUS_VERSION])
+        if self._snapshot is None or self._snapshot.version != version:
+            count = int(status[STATUS_PLAYED_COUNT])
+            played = frozenset(int(v) for v in status[STATUS_PLAYED_OFFSET:STATUS_PLAYED_OFFSET + count])
+            # 文本由子进程处理器生成，包含分区报警和连接状态
+            seq, text = self.status_text.read_latest()
+            text = decode_status_text(text) if seq >= 0 else "无报警"
+            self._snapshot = StatusSnapshot(
+                version, text or "无报警", bool(status[STATUS_ALARM_ACTIVE]),
+                float(status[STATUS_DETECTION_START]), played, int(status[STATUS_FPS])
+            )
+        return self._snapshot
+
+    def get_detection_duration(self):
+        """获取当前检测持续时间（秒）"""
+        start = self.detection_start_time
+        return time.time() - start if start > 0 else 0
+
+    def get_alarm_status(self):
+        """获取报警状态描述"""
+        return self.status_snapshot.status_text
+
+    def get_status(self):
+        """获取摄像头状态，格式与VideoProcessor.get_status一致"""
+        status = self._read_status()
+        states = {code: state for state, code in ReconnectSupervisor.STATE_CODES.items()}
+        return {
+            'status': self.get_alarm_status(),
+            'fps': float(status[STATUS_FPS]),
+            'connection_state': states.get(int(status[STATUS_CONNECTION])),
+            'reconnect_count': int(status[STATUS_RECONNECTS]),
+            'detection_time': self.get_detection_duration(),
+            'alarm_level': len(self.played_sounds),
+            'pid': self.process.pid
+        }
+
+    def get_metrics(self):
+        """获取监控指标，字段与VideoProcessor.get_metrics一致"""
+        status = self._read_status()
+        return {
+            'fps': float(status[STATUS_FPS]),
+            'processing_latency': float(status[STATUS_LATENCY]),
+            'dropped_frames': int(status[STATUS_DROPPED]),
+            'inference_count': int(status[STATUS_INFERENCES]),
+            'alarm_level': int(status[STATUS_PLAYED_COUNT]),
+            'detection_duration': self.get_detection_duration(),
+            'reconnect_count': int(status[STATUS_RECONNECTS]),
+            'connected': 1 if int(status[STATUS_CONNECTION]) == ReconnectSupervisor.STATE_CODES[ReconnectSupervisor.CONNECTED] else 0
+        }
+
+    def _send(self, command, payload=None):
+        try:
+            self._commands.put_nowait((command, payload))
+        except Exception as e:
+            logging.error(f"向摄像头{self.camera_id} 子进程发送命令失败: {str(e)}")
+
+    def stop_alarm(self):
+        """停止报警声音"""
+        self._send('stop_alarm')
+
+    def reset_alarm(self):
+        """重置报警状态"""
+        self._send('reset_alarm')
+
+    def set_stage_timing(self, enabled):
+        """开启或关闭子进程的阶段耗时统计"""
+        self._send('set_stage_timing', bool(enabled))
+
+    def dump_stage_timings(self):
+        """让子进程将阶段耗时统计输出到日志（经父进程写入日志文件）"""
+        self._send('dump_stage_timings')
+
+    def update_roi(self):
+        """将父进程中的最新配置同步到子进程"""
+        self.config = CONFIG.cameras[self.camera_id]
+        self._send('update_config', dict(vars(CONFIG)))
+        return True
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# modules/reconnect_supervisor.py
+# 断线重连监督模块
+
+import logging
+import random
+from threading import Thread, Event
+
+class ReconnectSupervisor:
+    """断线重连监督器类，每个摄像头一个，在后台线程中重新打开视频源
+
+    主要功能：
+    - 处理循环发现断流后只需调用report_failure，不在处理循环中等待或重试
+    - 按带随机抖动的指数退避间隔重试，避免频繁掉线的设备占满CPU，
+      也避免多个摄像头同时掉线后在同一时刻集中重连
+    - 遵循CameraConfig.auto_reconnect / reconnect_delay
+    - 提供连接状态和重连次数供状态显示和监控指标使用
+    """
+
+    CONNECTED = "connected"
+    RECONNECTING = "reconnecting"
+    DISCONNECTED = "disconnected"
+    STATE_CODES = {CONNECTED: 0, RECONNECTING: 1, DISCONNECTED: 2}
+
+    def __init__(self, camera_id, reopen, on_state_change=None, base_delay=1.0,
+                 max_delay=30.0, jitter=0.5, enabled=True):
+        """初始化重连监督器
+
+        Args:
+            camera_id: 摄像头ID，用于日志
+            reopen: 重新打开视频源的函数，失败时抛出异常
+            on_state_change: 连接状态变化时的回调 on_state_change(state)
+            base_delay: 首次重连前的等待时间（秒）
+            max_delay: 重连等待时间上限（秒）
+            jitter: 随机抖动比例，实际等待时间在 (1±jitter) 倍之间
+            enabled: 是否自动重连，为False时断流后保持断开状态
+        """
+        self.camera_id = camera_id
+        self._reopen = reopen
+        self._on_state_change = on_state_change
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self.enabled = enabled
+        self.state = self.CONNECTED
+        self.reconnect_count = 0  # 重连尝试次数（含失败）
+        self.disconnect_count = 0  # 断流次数
+        self._stop_event = Event()
+        self._thread = None
+
+    @property
+    def connected(self):
+        """是否处于已连接状态"""
+        return self.state == self.CONNECTED
+
+    def next_delay(self, attempt):
+        """计算第attempt次重试前的等待时间
+
+        Args:
+            attempt: 已失败的重试次数（从0开始）
+
+        Returns:
+            float: 等待时间（秒）
+        """
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def report_failure(self):
+        """报告断流，启动后台重连（非阻塞，重复报告会被忽略）"""
+        if self.state != self.CONNECTED or self._stop_event.is_set():
+            return
+        self.disconnect_count += 1
+        if not self.enabled:
+            logging.error("摄像头%s 断流，未启用自动重连", self.camera_id)
+            self._set_state(self.DISCONNECTED)
+            return
+        logging.warning("摄像头%s 断流，开始后台重连", self.camera_id)
+        self._set_state(self.RECONNECTING)
+        self._thread = Thread(
+            target=self._run,
+            name=f"Reconnect-{self.camera_id}",
+            daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        """重连线程主循环"""
+        attempt = 0
+        delay = self.next_delay(attempt)
+        while True:
+            if self._stop_event.wait(delay):
+                return
+            self.reconnect_count += 1
+            try:
+                self._reopen()
+            except Exception as e:
+                attempt += 1
+                delay = self.next_delay(attempt)
+                logging.warning(
+                    "摄像头%s 第%d次重连失败: %s，%.1f秒后重试",
+                    self.camera_id, attempt, e, delay
+                )
+                continue
+            logging.info("摄像头%s 重连成功（共尝试%d次）", self.camera_id, attempt + 1)
+            self._set_state(self.CONNECTED)
+            return
+
+    def _set_state(self, state):
+        """更新连接状态并通知回调"""
+        self.state = state
+        if self._on_state_change is not None:
+            try:
+                self._on_state_change(state)
+            except Exception as e:
+                logging.error(f"摄像头{self.camera_id} 连接状态回调失败: {str(e)}")
+
+    def stop(self, timeout=5.0):
+        """停止后台重连
+
+        Args:
+            timeout: 等待重连线程退出的时间（秒）
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def get_stats(self):
+        """获取连接状态统计
+
+        Returns:
+            dict: 连接状态、断流次数和重连尝试次数
+        """
+        return {
+            'connection_state': self.state,
+            'disconnect_count': self.disconnect_count,
+            'reconnect_count': self.reconnect_count
+        }
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# modules/region_alarm.py
+# 单个ROI的报警状态模块
+
+import time
+
+class RegionAlarm:
+    """单个命名ROI的检测与报警状态，只在处理线程中修改
+
+    主要功能：
+    - 记录该ROI的检测开始时间、已触发的报警级别和当前成立的手势
+    - 保存该ROI的手势数值平滑状态，不同ROI的手互不影响
+    - 生成该ROI的状态文本
+    """
+
+    def __init__(self, name):
+        """初始化报警状态
+
+        Args:
+            name: ROI名称
+        """
+        self.name = name
+        self.detection_start_time = 0
+        self.last_detection = 0
+        self.alarm_active = False
+        self.played_sounds = set()
+        self.gesture_values = None  # 平滑后的规则数值
+        self.active_gestures = ()  # 当前成立的手势名称
+        self.hand_count = 0  # 最近一次检测中位于该ROI的手数
+
+    @property
+    def alarm_level(self):
+        """已触发的报警级别数"""
+        return len(self.played_sounds)
+
+    def detection_duration(self, now=None):
+        """当前检测持续时间（秒），未在检测时为0"""
+        if self.detection_start_time <= 0:
+            return 0
+        return (now or time.time()) - self.detection_start_time
+
+    def status_text(self, continuous_trigger):
+        """生成状态文本
+
+        Args:
+            continuous_trigger: 持续报警的触发时长
+
+        Returns:
+            str: 状态文本
+        """
+        if self.alarm_active and self.played_sounds:
+            last_played = max(self.played_sounds)
+            if last_played == continuous_trigger:
+                return f"持续报警 ({last_played}秒)"
+            return f"报警触发 ({last_played}秒)"
+        elif self.detection_start_time > 0:
+            return "检测中"
+        return "无报警"
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# modules/runtime_config.py
+# 摄像头运行时配置快照模块
+
+from typing import NamedTuple, Optional, Tuple
+
+from config import CONFIG, GestureConfig
+
+class RuntimeConfig(NamedTuple):
+    """单个摄像头处理循环使用的配置快照（不可变）
+
+    UI线程修改CONFIG后为每个运行中的摄像头生成新快照，处理线程在两帧之间
+    整体替换引用，一帧内读取到的参数始终来自同一个快照，不会读到修改了一半的配置。
+    version在同一处理器内单调递增，处理线程据此判断是否需要重新计算缓存。
+    """
+    version: int
+    regions: Tuple[Tuple[str, Tuple[int, int, int, int]], ...]  # ((名称, (x, y, w, h)), ...)，主ROI在前
+    min_confidence: float
+    inference_size: Optional[int]
+    tracking_crop: bool
+    gesture_threshold: float
+    smooth_factor: float
+    alarm_triggers: Tuple[int, ...]  # 升序
+    alarm_sounds: Tuple[Tuple[int, str], ...]  # ((报警时长级别, 音频路径), ...)
+    fallback_sound: str
+    gestures: Tuple[GestureConfig, ...]
+
+    @property
+    def continuous_trigger(self):
+        """持续报警的触发时长（最后一级）"""
+        return self.alarm_triggers[-1] if self.alarm_triggers else None
+
+    def sound_path(self, duration):
+        """报警时长级别对应的音频路径，未配置时使用备用音"""
+        for key, path in self.alarm_sounds:
+            if key == duration:
+                return path
+        return self.fallback_sound
+
+    @classmethod
+    def from_config(cls, camera_id, version, config=None):
+        """根据配置生成指定摄像头的快照
+
+        Args:
+            camera_id: 摄像头ID
+            version: 快照版本号
+            config: 读取参数的配置对象，默认为CONFIG；
+                多进程模式下为父进程发来的配置，不修改子进程的CONFIG
+
+        Returns:
+            RuntimeConfig: 新快照
+        """
+        config = CONFIG if config is None else config
+        camera = config.cameras[camera_id]
+        return cls(
+            version=version,
+            regions=tuple(
+                (name, (roi["x"], roi["y"], roi["w"], roi["h"]))
+                for name, roi in camera.named_rois().items()
+            ),
+            min_confidence=camera.min_confidence,
+            inference_size=camera.inference_size,
+            tracking_crop=camera.tracking_crop,
+            gesture_threshold=config.gesture_threshold,
+            smooth_factor=config.smooth_factor,
+            alarm_triggers=tuple(sorted(config.alarm_triggers)),
+            alarm_sounds=tuple(sorted(config.alarm_sounds.items())),
+            fallback_sound=config.fallback_sound,
+            gestures=tuple(config.gestures)
+        )
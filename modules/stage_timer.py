@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# modules/stage_timer.py
+# 分阶段耗时统计模块
+
+import math
+import time
+
+class StageTimer:
+    """分阶段耗时统计类，记录处理循环中每个阶段的耗时分布
+
+    主要功能：
+    - 使用单调时钟（time.perf_counter）计时
+    - 每个阶段一个固定大小的对数分桶直方图，内存占用不随运行时间增长
+    - 根据直方图估算p50/p95/p99分位数
+    - 关闭时每次调用只做一次布尔判断，开销可以忽略
+
+    用法：
+        t = timer.mark()
+        ...  # 阶段A
+        t = timer.record('A', t)
+        ...  # 阶段B
+        t = timer.record('B', t)
+    """
+
+    STAGES = ('read', 'crop', 'convert', 'inference', 'gesture', 'draw', 'overlay', 'clip', 'display', 'total')
+
+    # 直方图范围：0.01ms ~ 10s，每个数量级20个桶
+    MIN_MS = 0.01
+    BINS_PER_DECADE = 20
+    NUM_BINS = 6 * BINS_PER_DECADE + 1
+
+    def __init__(self, enabled=False):
+        """初始化计时器
+
+        Args:
+            enabled: 是否启用计时
+        """
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        """清空所有统计数据"""
+        self._counts = {stage: [0] * self.NUM_BINS for stage in self.STAGES}
+        self._totals = {stage: 0.0 for stage in self.STAGES}
+        self._samples = {stage: 0 for stage in self.STAGES}
+        self._max = {stage: 0.0 for stage in self.STAGES}
+
+    def mark(self):
+        """返回当前时间点，未启用时返回0
+
+        Returns:
+            float: time.perf_counter()的值
+        """
+        return time.perf_counter() if self.enabled else 0.0
+
+    def record(self, stage, start):
+        """记录从start到现在的阶段耗时
+
+        Args:
+            stage: 阶段名称，必须在STAGES中
+            start: mark()或上一次record()的返回值
+
+        Returns:
+            float: 当前时间点，可直接作为下一阶段的起点
+        """
+        if not self.enabled or not start:
+            return self.mark()
+        now = time.perf_counter()
+        elapsed_ms = (now - start) * 1000
+        if elapsed_ms <= self.MIN_MS:
+            index = 0
+        else:
+            index = min(
+                self.NUM_BINS - 1,
+                int(math.log10(elapsed_ms / self.MIN_MS) * self.BINS_PER_DECADE) + 1
+            )
+        self._counts[stage][index] += 1
+        self._totals[stage] += elapsed_ms
+        self._samples[stage] += 1
+        if elapsed_ms > self._max[stage]:
+            self._max[stage] = elapsed_ms
+        return now
+
+    def _bin_upper_ms(self, index):
+        """第index个桶的上边界（毫秒）"""
+        return self.MIN_MS * 10 ** (index / self.BINS_PER_DECADE)
+
+    def _percentile(self, counts, total, fraction):
+        """根据直方图估算分位数，返回所在桶的上边界"""
+        target = fraction * total
+        cumulative = 0
+        for index, count in enumerate(counts):
+            cumulative += count
+            if cumulative >= target:
+                return self._bin_upper_ms(index)
+        return self._bin_upper_ms(len(counts) - 1)
+
+    def summary(self):
+        """获取各阶段耗时统计
+
+        Returns:
+            dict: {阶段: {'count', 'mean', 'p50', 'p95', 'p99', 'max'}}，单位为毫秒，
+                  只包含有数据的阶段
+        """
+        result = {}
+        for stage in self.STAGES:
+            total = self._samples[stage]
+            if not total:
+                continue
+            counts = list(self._counts[stage])
+            result[stage] = {
+                'count': total,
+                'mean': self._totals[stage] / total,
+                'p50': self._percentile(counts, total, 0.50),
+                'p95': self._percentile(counts, total, 0.95),
+                'p99': self._percentile(counts, total, 0.99),
+                'max': self._max[stage]
+            }
+        return result
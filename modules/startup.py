@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# modules/startup.py
+# 启动预热模块
+
+import importlib
+import logging
+import time
+from threading import Thread
+
+# 启动摄像头时才需要的重量级模块，按依赖顺序预加载
+HEAVY_MODULES = (
+    'numpy',
+    'cv2',
+    'mediapipe',
+    'pygame',
+    'modules.video_processor',
+    'modules.inference_service',
+    'modules.audio_engine',
+    'modules.hands_pool',
+)
+
+def warm_up(module_names=HEAVY_MODULES):
+    """依次导入重量级模块并记录耗时
+
+    导入失败只记录日志，真正启动摄像头时会再次导入并报告错误。
+
+    Args:
+        module_names: 需要预加载的模块名
+
+    Returns:
+        dict: {模块名: 导入耗时（秒）}，导入失败的模块值为None
+    """
+    timings = {}
+    for name in module_names:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+            timings[name] = time.perf_counter() - start
+        except Exception as e:
+            timings[name] = None
+            logging.warning(f"预加载模块 {name} 失败: {str(e)}")
+    loaded = sum(t for t in timings.values() if t is not None)
+    logging.info(f"后台预加载完成，耗时 {loaded:.2f}秒")
+    return timings
+
+def _warm_up_main(module_names, on_complete):
+    """预加载线程入口"""
+    warm_up(module_names)
+    if on_complete is not None:
+        try:
+            on_complete()
+        except Exception as e:
+            logging.error(f"启动预热失败: {str(e)}")
+
+def start_warm_up(module_names=HEAVY_MODULES, on_complete=None):
+    """在后台线程中预加载重量级模块
+
+    Python的导入锁保证用户在预加载完成前启动摄像头时，
+    只会等待同一模块加载完成，而不会重复导入。
+
+    Args:
+        module_names: 需要预加载的模块名
+        on_complete: 模块加载完成后在同一线程中调用的函数，如CameraManager.prewarm
+
+    Returns:
+        Thread: 预加载线程
+    """
+    thread = Thread(target=_warm_up_main, args=(module_names, on_complete), name="StartupWarmUp", daemon=True)
+    thread.start()
+    return thread
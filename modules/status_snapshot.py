@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# modules/status_snapshot.py
+# 摄像头状态快照模块
+
+import time
+from typing import FrozenSet, NamedTuple
+
+class StatusSnapshot(NamedTuple):
+    """摄像头状态快照（不可变）
+
+    处理线程只在状态发生变化时生成新快照并整体替换引用，
+    UI线程读取引用即可拿到一致的状态，无需加锁，也不会读到正在修改的集合。
+    version在同一处理器内单调递增，UI据此判断是否需要刷新。
+    """
+    version: int
+    status_text: str
+    alarm_active: bool
+    detection_start_time: float
+    played_sounds: FrozenSet[int]
+    fps: int
+
+    @property
+    def alarm_level(self):
+        """当前报警级别"""
+        return len(self.played_sounds)
+
+    def detection_duration(self, now=None):
+        """当前检测持续时间（秒）
+
+        Args:
+            now: 当前时间戳，默认使用time.time()
+        """
+        if self.detection_start_time <= 0:
+            return 0
+        return (now or time.time()) - self.detection_start_time
@@ -242,6 +242,16 @@ class ControlButtons:
                               command=self._on_reset)
         reset_btn.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
         
+        # 第三行：阶段耗时统计
+        self.timing_var = tk.BooleanVar(value=CONFIG.stage_timing_enabled)
+        timing_check = ttk.Checkbutton(button_grid, text="统计阶段耗时", 
+                                       variable=self.timing_var, command=self._on_timing_toggle)
+        timing_check.grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        
+        dump_btn = ttk.Button(button_grid, text="导出耗时统计", 
+                             command=self._on_timing_dump)
+        dump_btn.grid(row=2, column=1, padx=5, pady=5, sticky="ew")
+        
         # 配置网格列权重，使按钮均匀分布
         button_grid.columnconfigure(0, weight=1)
         button_grid.columnconfigure(1, weight=1)
@@ -262,6 +272,14 @@ class ControlButtons:
         if 'reset' in self.callbacks:
             self.callbacks['reset']()
     
+    def _on_timing_toggle(self):
+        if 'timing_toggle' in self.callbacks:
+            self.callbacks['timing_toggle'](self.timing_var.get())
+    
+    def _on_timing_dump(self):
+        if 'timing_dump' in self.callbacks:
+            self.callbacks['timing_dump']()
+    
     def pack(self, **kwargs):
         """打包组件"""
         self.frame.pack(**kwargs)
@@ -328,73 +346,107 @@ class StatusDisplay:
         self.status_label = ttk.Label(info_frame, text="系统就绪", font=UIStyles.FONTS['subtitle'])
         self.status_label.pack(anchor=tk.W, pady=5)
         
-        self.status_text = tk.Text(info_frame, height=8, wrap=tk.WORD, font=UIStyles.FONTS['body'])
-        self.status_text.pack(fill=tk.BOTH, expand=True)
-        self.status_text.config(state='disabled')
+        # 每个摄像头一行状态信息，只刷新状态发生变化的行
+        self.idle_label = ttk.Label(info_frame, text="无活动摄像头", font=UIStyles.FONTS['body'])
+        self.idle_label.pack(anchor=tk.W)
+        self.info_labels = []
+        for i in range(len(CONFIG.cameras)):
+            info_label = ttk.Label(info_frame, text="", font=UIStyles.FONTS['body'])
+            info_label.pack(anchor=tk.W)
+            self.info_labels.append(info_label)
+        
+        # 每行已应用的 (处理器, 快照版本)，用于跳过未变化的行
+        self._applied = [None] * len(CONFIG.cameras)
+        self._idle_shown = True
     
-    def update_status(self, camera_processors):
-        """更新摄像头状态显示"""
+    def update_status(self, camera_processors, transitions=None):
+        """更新摄像头状态显示
+        
+        读取各处理器发布的不可变状态快照，只刷新版本发生变化的行；
+        检测计时中的行每次只更新计时文本。
+        
+        Args:
+            camera_processors: 按摄像头ID排列的处理器列表，未运行的为None
+            transitions: {camera_id: 状态文本}，正在启动或停止的摄像头
+        """
+        transitions = transitions or {}
         try:
-            status_str = ""
-            self.status_text.config(state='normal')
-            self.status_text.delete(1.0, tk.END)
-            
+            active = False
             for i, processor in enumerate(camera_processors):
-                if processor:
-                    status = processor.get_status()
-                    
-                    # 更新状态指示器颜色
-                    if status['alarm_level'] > 0:
-                        status_color = UIStyles.get_alarm_level_color(status['alarm_level'])
-                        self.cam_status_labels[i].config(bg=status_color)
-                    elif status['detection_time'] > 0:
-                        self.cam_status_labels[i].config(bg=UIStyles.STATUS_COLORS['detecting'])
-                    else:
-                        self.cam_status_labels[i].config(bg=UIStyles.STATUS_COLORS['normal'])
-                    
-                    # 更新报警计数显示
-                    if i < len(self.alarm_count_labels):
-                        alarm_counts = {}
-                        for trigger in CONFIG.alarm_triggers:
-                            alarm_counts[trigger] = 0
-                        
-                        # 从processor获取已触发的报警
-                        for trigger in processor.played_sounds:
-                            if trigger in alarm_counts:
-                                alarm_counts[trigger] = 1
-                        
-                        # 更新显示
-                        for j, trigger in enumerate(CONFIG.alarm_triggers):
-                            if trigger in self.alarm_count_labels[i]:
-                                count = alarm_counts[trigger]
-                                level_color = UIStyles.get_alarm_level_color(j+1) if count > 0 else 'black'
-                                self.alarm_count_labels[i][trigger].config(
-                                    text=str(count),
-                                    foreground=level_color
-                                )
-                    
-                    # 格式化状态信息
-                    status_str += f"摄像头 {i}: "
-                    status_str += f"状态: {status['status']} "
-                    if status['fps'] > 0:
-                        status_str += f"FPS: {status['fps']:.1f} "
-                    if status['detection_time'] > 0:
-                        status_str += f"检测时间: {status['detection_time']:.1f}秒 "
-                    if status['alarm_level'] > 0:
-                        status_str += f"报警级别: {status['alarm_level']} "
-                    status_str += "\n"
-                else:
-                    # 摄像头未运行，显示为禁用状态
-                    self.cam_status_labels[i].config(bg=UIStyles.STATUS_COLORS['disabled'])
-            
-            if not status_str:
-                status_str = "无活动摄像头"
+                if i >= len(self._applied):
+                    break
+                if i in transitions:
+                    # 启动/停止过程中显示过渡状态
+                    active = True
+                    key = ('transition', transitions[i])
+                    if key != self._applied[i]:
+                        self.cam_status_labels[i].config(bg=UIStyles.STATUS_COLORS['transition'])
+                        self.info_labels[i].config(text=f"摄像头 {i}: {transitions[i]}...")
+                        self._applied[i] = key
+                    continue
+                if not processor:
+                    if self._applied[i] is not None:
+                        # 摄像头未运行，显示为禁用状态
+                        self.cam_status_labels[i].config(bg=UIStyles.STATUS_COLORS['disabled'])
+                        self.info_labels[i].config(text="")
+                        self._applied[i] = None
+                    continue
                 
-            self.status_text.insert(tk.END, status_str)
-            self.status_text.config(state='disabled')
+                active = True
+                snapshot = processor.status_snapshot
+                key = (id(processor), snapshot.version)
+                if key != self._applied[i]:
+                    self._apply_row(i, snapshot)
+                    self._applied[i] = key
+                elif snapshot.detection_start_time > 0:
+                    self.info_labels[i].config(text=self._format_row(i, snapshot))
+            
+            if active == self._idle_shown:
+                if active:
+                    self.idle_label.pack_forget()
+                else:
+                    self.idle_label.pack(anchor=tk.W, before=self.info_labels[0] if self.info_labels else None)
+                self._idle_shown = not active
         except Exception as e:
             logging.error(f"更新状态失败: {str(e)}")
     
+    def _apply_row(self, i, snapshot):
+        """根据状态快照刷新一行摄像头状态"""
+        # 更新状态指示器颜色
+        if snapshot.alarm_level > 0:
+            status_color = UIStyles.get_alarm_level_color(snapshot.alarm_level)
+            self.cam_status_labels[i].config(bg=status_color)
+        elif snapshot.detection_start_time > 0:
+            self.cam_status_labels[i].config(bg=UIStyles.STATUS_COLORS['detecting'])
+        else:
+            self.cam_status_labels[i].config(bg=UIStyles.STATUS_COLORS['normal'])
+        
+        # 更新报警计数显示
+        if i < len(self.alarm_count_labels):
+            for j, trigger in enumerate(CONFIG.alarm_triggers):
+                if trigger in self.alarm_count_labels[i]:
+                    count = 1 if trigger in snapshot.played_sounds else 0
+                    level_color = UIStyles.get_alarm_level_color(j+1) if count > 0 else 'black'
+                    self.alarm_count_labels[i][trigger].config(
+                        text=str(count),
+                        foreground=level_color
+                    )
+        
+        self.info_labels[i].config(text=self._format_row(i, snapshot))
+    
+    def _format_row(self, i, snapshot):
+        """格式化一行状态信息"""
+        status_str = f"摄像头 {i}: "
+        status_str += f"状态: {snapshot.status_text} "
+        if snapshot.fps > 0:
+            status_str += f"FPS: {snapshot.fps} "
+        detection_time = snapshot.detection_duration()
+        if detection_time > 0:
+            status_str += f"检测时间: {detection_time:.1f}秒 "
+        if snapshot.alarm_level > 0:
+            status_str += f"报警级别: {snapshot.alarm_level} "
+        return status_str
+    
     def set_status_text(self, text):
         """设置状态文本"""
         self.status_label.config(text=text)
@@ -6,6 +6,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import logging
 import datetime
+import queue
 import sv_ttk
 
 from config import CONFIG
@@ -36,9 +37,12 @@ class ControlPanel:
             self.root.title(CONFIG.window_title)
             self.root.geometry("800x1200")  # 增加窗口高度以适应新增的控件
             self.manager = CameraManager()
+            # 启动/停止在后台线程中执行，进度事件经队列交给Tk线程处理
+            self._lifecycle_events = queue.Queue()
             self._setup_ui()
             self._center_window()
             self._start_status_update()
+            self._poll_lifecycle_events()
             logging.info("控制面板初始化完成")
         except Exception as e:
             logging.critical(f"控制面板初始化失败: {str(e)}")
@@ -92,7 +96,9 @@ class ControlPanel:
                     'start': self.start_selected,
                     'stop': self.stop_all,
                     'pause': self.pause_alarm,
-                    'reset': self.reset_status
+                    'reset': self.reset_status,
+                    'timing_toggle': self.toggle_stage_timing,
+                    'timing_dump': self.dump_stage_timings
                 }
             )
             self.control_buttons.pack(fill=tk.X, pady=5)
@@ -125,25 +131,28 @@ class ControlPanel:
             # 获取设置面板的设置值
             settings = self.settings_panel.get_settings()
             
+            # CONFIG只在UI线程中修改，且每项都整体替换为新对象、不原地修改；
+            # 处理线程和音频引擎只使用update_roi生成的不可变快照（RuntimeConfig）
             # 更新手势检测灵敏度
             CONFIG.gesture_threshold = settings['gesture_threshold']
             
             # 更新报警间隔设置
-            new_triggers = settings['alarm_triggers']
+            new_triggers = sorted(settings['alarm_triggers'])
             if new_triggers:
-                new_triggers.sort()
-                CONFIG.alarm_triggers = new_triggers
-                # 更新报警音频映射
-                CONFIG.alarm_sounds = {
+                # 报警音频映射随报警间隔一起进入快照
+                new_sounds = {
                     t: f"sounds/{t}S报警音.wav" if t < 30 else "sounds/alarm.wav"
-                    for t in CONFIG.alarm_triggers
+                    for t in new_triggers
                 }
+                CONFIG.alarm_triggers = new_triggers
+                CONFIG.alarm_sounds = new_sounds
             
-            # 更新ROI设置 - 为每个摄像头单独更新
+            # 更新ROI设置 - 设置面板包含所有摄像头，只有数值变化的才算更新
             roi_updated = False
             for cam_id, roi in settings['roi_settings'].items():
-                CONFIG.cameras[cam_id].roi = roi
-                roi_updated = True
+                if roi != CONFIG.cameras[cam_id].roi:
+                    CONFIG.cameras[cam_id].roi = roi
+                    roi_updated = True
             
             # 如果ROI设置已更新且有摄像头正在运行，询问用户是否重启摄像头
             if roi_updated and running_cameras:
@@ -152,16 +161,9 @@ class ControlPanel:
                     "ROI设置已更新，是否重启摄像头以应用新设置？\n\n选择'是'将重启摄像头\n选择'否'将动态更新ROI设置（不中断监测）"
                 )
                 if restart:
-                    # 停止所有运行的摄像头
-                    self.manager.stop_all()
-                    # 重新启动之前运行的摄像头
-                    for cam_id in running_cameras:
-                        try:
-                            self.manager.start_camera(cam_id)
-                            logging.info(f"摄像头 {cam_id} 已重启以应用新的ROI设置")
-                        except Exception as e:
-                            logging.error(f"重启摄像头 {cam_id} 失败: {str(e)}")
-                            messagebox.showerror("重启错误", f"摄像头 {cam_id} 重启失败: {str(e)}")
+                    # 在后台停止并重新启动之前运行的摄像头，进度通过状态区域显示
+                    self.manager.restart_cameras(running_cameras, callback=self._on_camera_progress)
+                    logging.info(f"摄像头 {running_cameras} 正在重启以应用新的ROI设置")
                 else:
                     # 动态更新ROI设置，不重启摄像头
                     update_success = True
@@ -189,6 +191,12 @@ class ControlPanel:
                             messagebox.showwarning("部分更新", f"摄像头 {failed_str} 的ROI设置未能动态更新，建议重启这些摄像头以确保设置生效。")
                             self.status_display.set_status_text("ROI设置部分更新，建议重启部分摄像头")
                             logging.warning(f"摄像头 {failed_str} ROI设置更新失败")
+            elif running_cameras:
+                # ROI未变化，只需将灵敏度和报警间隔同步到运行中的摄像头
+                for cam_id in running_cameras:
+                    processor = self.manager.get_processor(cam_id)
+                    if processor:
+                        processor.update_roi()
             
             self.status_display.set_status_text("设置已更新")
             logging.info("参数设置已更新")
@@ -200,49 +208,65 @@ class ControlPanel:
             logging.error(f"参数设置更新失败: {str(e)}")
             
     def start_selected(self):
-        """启动选中的摄像头"""
+        """在后台并发启动选中的摄像头，界面不等待启动完成"""
         selected_cameras = self.camera_selector.get_selected()
-        started_cameras = []
-        
-        for i in selected_cameras:
-            try:
-                self.manager.start_camera(i)
-                started_cameras.append(i)
-                self.status_display.set_status_text(f"摄像头 {i} 运行中")
-                logging.info(f"摄像头 {i} 已启动")
-            except ValueError as e:
-                messagebox.showerror("配置错误", str(e))
-                logging.error(f"摄像头{i}配置错误: {str(e)}")
-            except RuntimeError as e:
-                messagebox.showerror("运行错误", str(e))
-                logging.error(f"摄像头{i}运行错误: {str(e)}")
-            except Exception as e:
-                messagebox.showerror("未知错误", f"摄像头{i}启动失败: {str(e)}")
-                logging.error(f"摄像头{i}启动失败: {str(e)}")
-        
-        if not started_cameras:
+        if not selected_cameras:
             self.status_display.set_status_text("请选择要启动的摄像头")
-        elif len(started_cameras) > 1:
-            self.status_display.set_status_text(f"已启动 {len(started_cameras)} 个摄像头")
+            return
+        
+        try:
+            self.manager.start_cameras(selected_cameras, callback=self._on_camera_progress)
+            self.status_display.set_status_text(f"正在启动 {len(selected_cameras)} 个摄像头...")
+            self._update_status()
+        except Exception as e:
+            messagebox.showerror("未知错误", f"摄像头启动失败: {str(e)}")
+            logging.error(f"摄像头启动失败: {str(e)}")
             
     def stop_all(self):
-        """停止所有摄像头"""
+        """在后台并发停止所有摄像头"""
         try:
-            self.manager.stop_all()
-            self.status_display.set_status_text("系统已停止")
+            self.manager.stop_cameras(callback=self._on_camera_progress)
+            self.status_display.set_status_text("正在停止摄像头...")
             self._update_status()
-            logging.info("所有摄像头已停止")
         except Exception as e:
             logging.error(f"停止摄像头失败: {str(e)}")
             messagebox.showerror("错误", f"停止摄像头失败: {str(e)}")
             
+    def _on_camera_progress(self, camera_id, state, message):
+        """摄像头启动/停止进度回调（在工作线程中调用，只入队不操作界面）"""
+        self._lifecycle_events.put((camera_id, state, message))
+        
+    def _poll_lifecycle_events(self):
+        """在Tk线程中处理启动/停止进度事件"""
+        try:
+            while True:
+                camera_id, state, message = self._lifecycle_events.get_nowait()
+                self._handle_lifecycle_event(camera_id, state, message)
+        except queue.Empty:
+            pass
+        self.root.after(100, self._poll_lifecycle_events)
+        
+    def _handle_lifecycle_event(self, camera_id, state, message):
+        """根据进度事件更新界面"""
+        state_name = CameraManager.STATE_NAMES.get(state, state)
+        self.status_display.set_status_text(f"摄像头 {camera_id} {state_name}")
+        if state == CameraManager.FAILED:
+            detail = message or "请查看日志了解详细原因"
+            messagebox.showerror("启动错误", f"摄像头{camera_id}启动失败: {detail}")
+            logging.error(f"摄像头{camera_id}启动失败: {detail}")
+        elif state == CameraManager.TIMEOUT:
+            logging.warning(f"摄像头{camera_id} 启动/停止超时")
+        elif state in (CameraManager.RUNNING, CameraManager.STOPPED):
+            logging.info(f"摄像头 {camera_id} {state_name}")
+        self._update_status()
+            
     def pause_alarm(self):
         """暂停所有报警声音"""
         try:
             for i in range(len(CONFIG.cameras)):
                 processor = self.manager.get_processor(i)
                 if processor:
-                    processor.alarm_channel.stop()
+                    processor.stop_alarm()
             self.status_display.set_status_text("报警已暂停")
             logging.info("报警已暂停")
         except Exception as e:
@@ -255,8 +279,7 @@ class ControlPanel:
             for i in range(len(CONFIG.cameras)):
                 processor = self.manager.get_processor(i)
                 if processor:
-                    processor._reset_alarm()
-                    processor.alarm_channel.stop()
+                    processor.reset_alarm()
             self.status_display.set_status_text("状态已重置")
             self._update_status()
             logging.info("所有摄像头状态已重置")
@@ -264,11 +287,29 @@ class ControlPanel:
             logging.error(f"重置状态失败: {str(e)}")
             messagebox.showerror("错误", f"重置状态失败: {str(e)}")
             
+    def toggle_stage_timing(self, enabled):
+        """开启或关闭阶段耗时统计"""
+        try:
+            self.manager.set_stage_timing(enabled)
+            self.status_display.set_status_text("阶段耗时统计已开启" if enabled else "阶段耗时统计已关闭")
+        except Exception as e:
+            logging.error(f"切换阶段耗时统计失败: {str(e)}")
+            messagebox.showerror("错误", f"切换阶段耗时统计失败: {str(e)}")
+            
+    def dump_stage_timings(self):
+        """导出阶段耗时统计"""
+        try:
+            path = self.manager.dump_stage_timings()
+            self.status_display.set_status_text(f"耗时统计已导出: {path}")
+        except Exception as e:
+            logging.error(f"导出阶段耗时统计失败: {str(e)}")
+            messagebox.showerror("错误", f"导出阶段耗时统计失败: {str(e)}")
+            
     def on_close(self):
         """窗口关闭事件处理"""
         try:
             logging.info("系统正在关闭...")
-            self.stop_all()
+            self.manager.shutdown()
             self.root.destroy()
         except Exception as e:
             logging.error(f"系统关闭异常: {str(e)}")
@@ -286,12 +327,16 @@ class ControlPanel:
     def _update_status(self):
         """更新摄像头状态显示"""
         try:
-            # 获取所有摄像头处理器
+            # 获取所有摄像头处理器，以及正在启动/停止或停止超时的摄像头
             processors = []
+            transitions = {}
             for i in range(len(CONFIG.cameras)):
                 processors.append(self.manager.get_processor(i))
+                state = self.manager.get_state(i)
+                if state in (CameraManager.STARTING, CameraManager.STOPPING, CameraManager.TIMEOUT):
+                    transitions[i] = CameraManager.STATE_NAMES[state]
             
             # 更新状态显示
-            self.status_display.update_status(processors)
+            self.status_display.update_status(processors, transitions)
         except Exception as e:
             logging.error(f"更新状态失败: {str(e)}")
\ No newline at end of file
@@ -4,18 +4,36 @@
 
 import cv2
 import mediapipe as mp
-import pygame
 import time
 import numpy as np
 import logging
 import traceback
 import os
 import wave
-from threading import Event
+import itertools
+from concurrent.futures import CancelledError, TimeoutError as FutureTimeoutError
+from threading import Event, Lock
 from config import CONFIG
 
 # 导入FPSCounter类，使用相对导入
 from .fps_counter import FPSCounter
+from .frame_grabber import FrameGrabber
+from .motion_gate import MotionGate
+from .detection_scheduler import DetectionScheduler
+from .stage_timer import StageTimer
+from .status_snapshot import StatusSnapshot
+from .audio_engine import AudioEngine
+from .runtime_config import RuntimeConfig
+from .reconnect_supervisor import ReconnectSupervisor
+from .clip_recorder import PreAlarmBuffer, ClipRecorder
+from .gesture_engine import GestureEngine, landmarks_to_array
+from .region_alarm import RegionAlarm
+from .landmark_filter import LandmarkFilter, PALM_POINTS
+from .landmark_predictor import LandmarkPredictor
+
+# OpenCV的FFmpeg后端在打开时读取该环境变量，并发打开网络流时需串行设置
+_FFMPEG_OPTIONS_ENV = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
+_ffmpeg_options_lock = Lock()
 
 class VideoProcessor:
     """视频处理器类，负责摄像头视频流的处理、手势检测和报警控制。
@@ -27,22 +45,43 @@ class VideoProcessor:
     - 资源管理和释放
     """
 
-    def __init__(self, camera_id: int, stop_event: Event):
+    def __init__(self, camera_id: int, stop_event: Event, inference_service=None, audio_engine=None,
+                 hands_pool=None, clip_recorder=None):
         """初始化视频处理器
 
         Args:
             camera_id: 摄像头ID
             stop_event: 停止事件，用于控制处理器的运行状态
+            inference_service: 共享推理服务，为None时使用独立的Hands模型
+            audio_engine: 共享音频引擎，为None时创建本处理器独占的引擎
+            hands_pool: 预热的Hands模型池，未使用共享推理服务时从中租用模型
+            clip_recorder: 共享报警录像编码器，为None且启用报警录像时创建本处理器独占的编码器
         """
         try:
             self.camera_id = camera_id
             self.config = CONFIG.cameras[camera_id]
             self.stop_event = stop_event
-            self.detection_start_time = 0
-            self.last_detection = 0
-            self.alarm_active = False
-            self.played_sounds = set()
-            self.fps_counter = FPSCounter()
+            self.inference_service = inference_service
+            self.audio_engine = audio_engine
+            self.hands_pool = hands_pool
+            self._owns_audio_engine = False
+            self.clip_recorder = clip_recorder
+            self._owns_clip_recorder = False
+            self.fps_counter = FPSCounter(CONFIG.fps_window)
+            # 状态快照，只在状态变化时整体替换，供UI线程无锁读取
+            self._status_versions = itertools.count()
+            self.status_snapshot = StatusSnapshot(next(self._status_versions), "无报警", False, 0, frozenset(), 0)
+            self.status_publisher = None  # 多进程模式下用于向父进程发布状态
+            # 运行时配置快照，UI线程生成新快照，处理线程在两帧之间替换
+            self._config_versions = itertools.count()
+            self.runtime = RuntimeConfig.from_config(camera_id, next(self._config_versions))
+            self._pending_runtime = self.runtime
+            # 每个命名ROI独立计时和报警，顺序与runtime.regions一致
+            self.regions = [RegionAlarm(name) for name, _ in self.runtime.regions]
+            self.stage_timer = StageTimer(CONFIG.stage_timing_enabled)
+            self.processing_latency = 0.0  # 单帧处理耗时的滑动平均（秒）
+            self.inference_count = 0
+            self.inference_timeouts = 0  # 等待共享推理结果超时而跳过的检测次数
             self._verify_resources()
             self._init_components()
             logging.info(f"摄像头{camera_id}初始化完成")
@@ -83,25 +122,92 @@ class VideoProcessor:
         try:
             # 初始化MediaPipe，使用更高效的配置
             self.mp_hands = mp.solutions.hands
-            self.hands = self.mp_hands.Hands(
-                static_image_mode=False,  # 视频模式
-                max_num_hands=1,  # 减少为1只手，提高性能
-                min_detection_confidence=self.config.min_confidence,
-                min_tracking_confidence=0.5,
-                model_complexity=0  # 使用最轻量级模型
-            )
+            self.hands = None
+            if self.inference_service is not None:
+                # 使用共享推理服务，不再单独加载模型
+                self.inference_service.register(self.camera_id, self.runtime.min_confidence)
+            else:
+                self.hands = self._create_hands(self.runtime.min_confidence)
+            
+            # 手势规则编译为向量化判定引擎，配置变化时重新编译
+            self.gesture_engine = GestureEngine(self.runtime.gestures, self.runtime.gesture_threshold)
+            # 关键点滤波，抑制抖动引起的误判，允许降低检测频率
+            self.landmark_filter = None
+            if CONFIG.landmark_filter_enabled:
+                self.landmark_filter = LandmarkFilter(
+                    CONFIG.landmark_min_cutoff, CONFIG.landmark_beta, CONFIG.landmark_d_cutoff,
+                    CONFIG.landmark_max_gap, CONFIG.landmark_match_distance
+                )
+            # 关键点外推，两次检测之间的帧也绘制骨架，画面流畅度不再依赖检测频率
+            self.landmark_predictor = None
+            if CONFIG.landmark_prediction:
+                self.landmark_predictor = LandmarkPredictor(
+                    CONFIG.landmark_max_extrapolation, CONFIG.landmark_hold_time
+                )
+            
+            # 关键点连线索引，用于绘制骨架
+            self._hand_connections = np.array(sorted(self.mp_hands.HAND_CONNECTIONS), dtype=np.int32)
+            
+            # 推理输入缓冲区，按ROI尺寸预分配
+            self._inference_dims = None
+            self._resize_buffer = None
+            self._rgb_buffer = None
+            
+            # 检测区域（所有ROI的外接矩形）和各ROI在帧中的坐标 (y1, y2, x1, x2)，
+            # 首帧或ROI变化后重新计算
+            self._cached_roi_coords = None
+            self._region_coords = None
+            
+            # 跟踪裁剪框 (y1, y2, x1, x2)，None表示使用完整ROI
+            self._track_box = None
             
             # 初始化摄像头
-            self.cap = self._init_capture()
-            # 设置摄像头缓冲区大小，减少延迟
-            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.config.buffer_size)
+            self.cap = self._open_capture()
+            # 独立采集线程持续读取设备，处理循环总是取最新帧
+            self.grabber = FrameGrabber(
+                self.cap,
+                self.config.buffer_size or CONFIG.frame_buffer_size,
+                name=f"FrameGrabber-{self.camera_id}"
+            )
+            # 等待新帧的最长时间，超时视为断流
+            self._read_timeout = (self.config.stream_read_timeout if self.config.is_network_stream
+                                  else self.config.read_timeout)
+            # 断流后由监督器在后台重连，处理循环不等待
+            self.reconnector = ReconnectSupervisor(
+                self.camera_id,
+                reopen=self._reopen_capture,
+                on_state_change=self._on_connection_change,
+                base_delay=self.config.reconnect_delay,
+                max_delay=CONFIG.reconnect_max_delay,
+                jitter=CONFIG.reconnect_jitter,
+                enabled=self.config.auto_reconnect
+            )
             
             # 初始化音频系统
-            if not pygame.mixer.get_init():
-                pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-            self.alarm_sounds = {}
-            self.alarm_channel = pygame.mixer.Channel(self.camera_id)
-            self._load_alarm_sounds()
+            self._init_audio()
+            
+            # 初始化报警录像缓冲区
+            self._init_clip_recording()
+            
+            # 初始化运动门控，ROI静止时跳过推理
+            self.motion_gate = None
+            if CONFIG.motion_gate_enabled:
+                self.motion_gate = MotionGate(
+                    threshold=CONFIG.motion_threshold,
+                    pixel_threshold=CONFIG.motion_pixel_threshold,
+                    size=CONFIG.motion_gate_size,
+                    learning_rate=CONFIG.motion_learning_rate,
+                    force_interval=CONFIG.motion_force_interval
+                )
+            
+            # 初始化检测调度器，空闲时降低检测频率
+            self.scheduler = DetectionScheduler(
+                self.camera_id,
+                active_interval=CONFIG.detection_interval,
+                idle_interval=(CONFIG.idle_detection_interval if CONFIG.adaptive_detection
+                               else CONFIG.detection_interval),
+                cooldown=CONFIG.active_detection_cooldown
+            )
             
             # 初始化性能监控变量
             self._last_fps_update = 0
@@ -129,6 +235,8 @@ class VideoProcessor:
             RuntimeError: 当无法打开视频源时抛出
         """
         source = self.config.source
+        if self.config.is_network_stream:
+            return self._init_stream_capture()
         cap = cv2.VideoCapture(source)
         if not cap.isOpened():
             logging.error(f"无法打开视频源: {source}")
@@ -140,18 +248,85 @@ class VideoProcessor:
         if actual_width != self.config.resolution[0] or actual_height != self.config.resolution[1]:
             logging.warning(f"摄像头{source} 分辨率设置失败，实际: ({actual_width}, {actual_height})")
         return cap
+    
+    def _init_stream_capture(self):
+        """使用FFmpeg后端打开RTSP/HTTP网络流
+        
+        网络流的分辨率由编码端决定，这里不设置分辨率；解码在FrameGrabber的采集线程中
+        持续进行，处理循环总是取最新帧，网络抖动造成的积压帧会被直接丢弃。
+        
+        Returns:
+            cv2.VideoCapture: 已打开的网络流对象
             
-    def _load_alarm_sounds(self):
-        """加载报警音频文件"""
-        for duration, path in CONFIG.alarm_sounds.items():
+        Raises:
+            RuntimeError: 在超时时间内无法打开网络流时抛出
+        """
+        source = self.config.source
+        params = [
+            cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, int(self.config.stream_open_timeout * 1000),
+            cv2.CAP_PROP_READ_TIMEOUT_MSEC, int(self.config.stream_read_timeout * 1000),
+        ]
+        with _ffmpeg_options_lock:
+            previous = os.environ.get(_FFMPEG_OPTIONS_ENV)
+            os.environ[_FFMPEG_OPTIONS_ENV] = self.config.ffmpeg_options
             try:
-                self.alarm_sounds[duration] = pygame.mixer.Sound(path)
-            except FileNotFoundError:
-                logging.warning(f"加载 {path} 失败，使用备用音")
-                self.alarm_sounds[duration] = pygame.mixer.Sound(CONFIG.fallback_sound)
-            except Exception as e:
-                logging.error(f"加载音频失败: {str(e)}")
-                raise
+                cap = cv2.VideoCapture(source, cv2.CAP_FFMPEG, params)
+            finally:
+                if previous is None:
+                    os.environ.pop(_FFMPEG_OPTIONS_ENV, None)
+                else:
+                    os.environ[_FFMPEG_OPTIONS_ENV] = previous
+        if not cap.isOpened():
+            cap.release()
+            logging.error(f"无法打开网络流: {source}")
+            raise RuntimeError(f"无法打开网络流: {source}")
+        logging.info(
+            f"摄像头{self.camera_id} 已连接网络流 {source}，实际分辨率: "
+            f"({cap.get(cv2.CAP_PROP_FRAME_WIDTH):.0f}, {cap.get(cv2.CAP_PROP_FRAME_HEIGHT):.0f})"
+        )
+        return cap
+            
+    def _open_capture(self):
+        """打开视频源并应用分辨率和缓冲区设置，首次打开和断线重连共用
+        
+        Returns:
+            cv2.VideoCapture: 已打开的摄像头对象
+        """
+        cap = self._init_capture()
+        if not self.config.is_network_stream:
+            # 设置摄像头缓冲区大小，减少延迟（FFmpeg后端不支持，网络流由FrameGrabber丢弃过期帧）
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, self.config.buffer_size)
+        return cap
+            
+    def _init_audio(self):
+        """初始化音频，从音频引擎获取本摄像头的报警声道
+        
+        音频文件由引擎统一加载，处理线程只发送播放/停止命令。
+        """
+        if self.audio_engine is None:
+            # 独立运行（如子进程模式）时使用自己的引擎
+            self.audio_engine = AudioEngine()
+            self.audio_engine.start()
+            self._owns_audio_engine = True
+        self.alarm_channel = self.audio_engine.open_channel(self.camera_id)
+
+    def _init_clip_recording(self):
+        """初始化报警前帧缓冲区，未启用报警录像时不做任何事"""
+        self.clip_buffer = None
+        self._pending_clip = None  # (触发时间, 报警级别)，等待报警后的帧录制完成
+        if not CONFIG.clip_recording_enabled:
+            return
+        if self.clip_recorder is None:
+            # 独立运行（如子进程模式）时使用自己的编码器
+            self.clip_recorder = ClipRecorder()
+            self.clip_recorder.start()
+            self._owns_clip_recorder = True
+        # 多保留一个采样间隔，保证报警后的最后一帧仍在缓冲区中
+        window = CONFIG.clip_pre_seconds + CONFIG.clip_post_seconds + 1.0 / CONFIG.clip_fps
+        self.clip_buffer = PreAlarmBuffer(
+            window, CONFIG.clip_fps, CONFIG.clip_max_width,
+            int(CONFIG.clip_buffer_max_mb * 1024 * 1024)
+        )
 
     def process_stream(self):
         """处理视频流的主循环"""
@@ -160,57 +335,73 @@ class VideoProcessor:
             frame_count = 0
             skip_count = 0
             target_interval = 1.0 / 30 if CONFIG.max_fps is None else 1.0 / CONFIG.max_fps  # 目标帧间隔时间
+            self.grabber.start()
             
-            with self.hands:
-                while not self.stop_event.is_set():
-                    try:
-                        # 帧率控制 - 如果距离上一帧时间太短，则等待
-                        current_time = time.time()
-                        elapsed = current_time - prev_time
-                        if elapsed < target_interval:
-                            # 使用短暂睡眠而不是忙等待，减少CPU占用
-                            sleep_time = target_interval - elapsed
-                            if sleep_time > 0.001:  # 避免过短的睡眠
-                                time.sleep(sleep_time)
-                            continue
-                            
-                        # 读取帧
-                        ret, frame = self.cap.read()
-                        if not ret:
-                            self._handle_stream_error()
-                            continue
-                            
-                        # 跳帧处理 - 在高负载时跳过部分帧的处理
-                        frame_count += 1
-                        if frame_count % (skip_count + 1) != 0:
-                            # 即使跳过处理，也要显示原始帧以保持流畅
-                            self._display_frame(frame)
-                            continue
-                            
-                        # 动态调整跳帧数量 - 根据处理时间自适应
-                        if elapsed > 2 * target_interval and skip_count < 2:
-                            skip_count += 1
-                            logging.debug(f"性能优化: 增加跳帧数量至 {skip_count}")
-                        elif elapsed < target_interval * 0.8 and skip_count > 0:
-                            skip_count -= 1
-                            logging.debug(f"性能优化: 减少跳帧数量至 {skip_count}")
-                            
-                        # 处理帧
-                        processed_frame = self._process_frame(frame)
-                        self._display_frame(processed_frame)
+            while not self.stop_event.is_set():
+                try:
+                    # 断线期间由监督器在后台重连，处理循环只需等待
+                    if not self.reconnector.connected:
+                        self.stop_event.wait(0.1)
+                        continue
+                    
+                    # 帧率控制 - 如果距离上一帧时间太短，则等待
+                    current_time = time.time()
+                    elapsed = current_time - prev_time
+                    if elapsed < target_interval:
+                        # 使用短暂睡眠而不是忙等待，减少CPU占用
+                        sleep_time = target_interval - elapsed
+                        if sleep_time > 0.001:  # 避免过短的睡眠
+                            time.sleep(sleep_time)
+                        continue
                         
-                        # 更新FPS计数
-                        current_time = time.time()
-                        self.fps_counter.update(1 / (current_time - prev_time))
-                        prev_time = current_time
+                    # 读取最新帧（采集线程已丢弃过期帧）
+                    timer = self.stage_timer
+                    frame_start = timer.mark()
+                    ret, frame = self.grabber.read(self._read_timeout)
+                    if not ret:
+                        self._handle_stream_error()
+                        continue
+                    timer.record('read', frame_start)
                         
-                        if cv2.waitKey(1) & 0xFF == ord('q'):
-                            break
-                    except Exception as e:
-                        logging.error(f"帧处理错误: {str(e)}")
+                    # 跳帧处理 - 在高负载时跳过部分帧的处理
+                    frame_count += 1
+                    if frame_count % (skip_count + 1) != 0:
+                        # 即使跳过处理，也要显示原始帧（含外推的骨架）以保持流畅
+                        self._draw_predicted_landmarks(frame, time.time())
+                        self._display_frame(frame)
                         continue
+                        
+                    # 动态调整跳帧数量 - 根据处理时间自适应
+                    if elapsed > 2 * target_interval and skip_count < 2:
+                        skip_count += 1
+                        logging.debug("性能优化: 增加跳帧数量至 %d", skip_count)
+                    elif elapsed < target_interval * 0.8 and skip_count > 0:
+                        skip_count -= 1
+                        logging.debug("性能优化: 减少跳帧数量至 %d", skip_count)
+                        
+                    # 处理帧
+                    process_start = time.perf_counter()
+                    processed_frame = self._process_frame(frame)
+                    self.processing_latency += 0.1 * (
+                        time.perf_counter() - process_start - self.processing_latency
+                    )
+                    t = timer.mark()
+                    self._display_frame(processed_frame)
+                    timer.record('display', t)
+                    timer.record('total', frame_start)
+                    
+                    # 更新FPS计数
+                    current_time = time.time()
+                    self.fps_counter.add_interval(current_time - prev_time)
+                    prev_time = current_time
+                    
+                    if cv2.waitKey(1) & 0xFF == ord('q'):
+                        break
+                except Exception as e:
+                    logging.error("帧处理错误: %s", e)
+                    continue
         except Exception as e:
-            logging.error(f"视频流处理错误: {str(e)}\n{traceback.format_exc()}")
+            logging.error("视频流处理错误: %s\n%s", e, traceback.format_exc())
         finally:
             self._release_resources()
 
@@ -223,101 +414,415 @@ class VideoProcessor:
         Returns:
             处理后的图像帧
         """
+        timer = self.stage_timer
+        t = timer.mark()
+        
+        # 在两帧之间应用UI提交的新配置
+        if self._pending_runtime is not self.runtime:
+            self._apply_runtime_config()
+        
         # 避免不必要的复制，直接在原始帧上操作
         roi_frame = self._safe_crop(frame)
+        t = timer.record('crop', t)
         
-        # 检查是否需要进行手势检测（基于时间间隔）
+        # 检查是否需要进行手势检测（由调度器根据检测状态决定间隔）
         current_time = time.time()
-        should_detect = (current_time - self.last_detection) >= CONFIG.detection_interval
+        should_detect = self.scheduler.should_detect(current_time)
+        points = None
+        if should_detect:
+            self.scheduler.mark_run(current_time)
+        
+        # 运动门控：检测区域静止且没有进行中的检测时跳过推理
+        if should_detect and self.motion_gate is not None:
+            should_detect = self.motion_gate.should_infer(
+                roi_frame, current_time, active=self.detection_start_time > 0
+            )
         
         if should_detect:
-            # 转换颜色空间并进行手势检测
-            rgb_frame = cv2.cvtColor(roi_frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(rgb_frame)
-            gesture_detected = self._detect_gesture(results)
-
-            if gesture_detected:
-                self.last_detection = current_time
-                self._update_alarm_state()
-                self._draw_landmarks(frame, results)
-            else:
-                self._reset_alarm()
+            # 跟踪模式下只对手部附近的区域推理，否则一次推理覆盖所有ROI
+            region = self._track_box or self._cached_roi_coords
+            y1, y2, x1, x2 = region
+            inference_frame = frame[y1:y2, x1:x2] if self._track_box else roi_frame
+            
+            # 缩放到推理尺寸、转换颜色空间并进行手势检测
+            t = timer.mark()
+            rgb_frame = self._prepare_inference_input(inference_frame)
+            t = timer.record('convert', t)
+            results = self._run_inference(rgb_frame)
+            t = timer.record('inference', t)
+            if results is None:
+                # 推理超时：本帧没有检测结果，报警计时、滤波和外推状态都保持不变
+                should_detect = False
+        
+        if should_detect:
+            # 关键点只转换一次，后续换算、判定和绘制都使用数组
+            points = landmarks_to_array(results.multi_hand_landmarks)
+            if self._track_box:
+                self._remap_landmarks(points, region)
+            if self.runtime.tracking_crop and len(self.regions) == 1:
+                # 多个ROI时裁剪到某只手附近会漏掉其他ROI，因此只在单个ROI时跟踪
+                self._update_track_box(results, points)
+            if self.landmark_filter is not None:
+                points = self.landmark_filter(points, current_time)
+            detected = self._detect_gesture(points)
+            
+            for region_alarm, hit in zip(self.regions, detected):
+                if hit:
+                    region_alarm.last_detection = current_time
+                    self._update_alarm_state(region_alarm)
+                else:
+                    self._reset_alarm(region_alarm)
+            gesture_detected = bool(detected.any())
+            t = timer.record('gesture', t)
+            if self.landmark_predictor is not None:
+                # 只保存检测到手势时的关键点，与直接绘制时一样只在手势成立时显示骨架
+                velocity = self.landmark_filter.velocity if self.landmark_filter is not None else None
+                self.landmark_predictor.update(points if gesture_detected else None, current_time, velocity)
+            elif gesture_detected:
+                self._draw_landmarks(frame, points)
+                timer.record('draw', t)
+            self.scheduler.update(current_time, gesture_detected, self.detection_start_time > 0)
+        
+        if self.landmark_predictor is not None:
+            # 每帧按当前时间外推并绘制，检测帧上即为本次检测的位置
+            t = timer.mark()
+            self._draw_predicted_landmarks(frame, current_time)
+            timer.record('draw', t)
         
         # 添加叠加信息（ROI框、FPS等）
+        t = timer.mark()
         self._add_overlay(frame)
+        t = timer.record('overlay', t)
+        
+        if self.clip_buffer is not None:
+            self._record_clip_frame(frame, current_time)
+            timer.record('clip', t)
+        
+        if self.status_publisher is not None:
+            self.status_publisher.publish(self)
         return frame
 
+    def _prepare_inference_input(self, roi_frame):
+        """将ROI缩放到推理尺寸并转换为RGB，结果写入预分配的缓冲区
+        
+        Args:
+            roi_frame: BGR格式的ROI图像
+            
+        Returns:
+            numpy.ndarray: RGB格式的推理输入图像
+        """
+        h, w = roi_frame.shape[:2]
+        if self._inference_dims is None or self._inference_dims[0] != (w, h):
+            target = (w, h)
+            size = self.runtime.inference_size
+            if size and max(w, h) > size:
+                # 按长边等比缩放，保持宽高比以免影响检测精度
+                scale = size / max(w, h)
+                target = (max(1, round(w * scale)), max(1, round(h * scale)))
+            self._inference_dims = ((w, h), target)
+            self._resize_buffer = (np.empty((target[1], target[0], 3), dtype=np.uint8)
+                                   if target != (w, h) else None)
+            self._rgb_buffer = np.empty((target[1], target[0], 3), dtype=np.uint8)
+        
+        if self._resize_buffer is not None:
+            cv2.resize(roi_frame, self._inference_dims[1], dst=self._resize_buffer,
+                       interpolation=cv2.INTER_AREA)
+            roi_frame = self._resize_buffer
+        return cv2.cvtColor(roi_frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
+
+    def _remap_landmarks(self, points, region):
+        """将跟踪裁剪区域内的归一化关键点换算为相对完整ROI的归一化坐标
+        
+        换算后手势判定阈值、绘制和发布都与未裁剪时保持一致。
+        
+        Args:
+            points: 形状为(手数, 21, 3)的关键点数组（原地修改）
+            region: 推理区域在帧中的坐标 (y1, y2, x1, x2)
+        """
+        if not len(points):
+            return
+        ry1, ry2, rx1, rx2 = region
+        y1, y2, x1, x2 = self._cached_roi_coords
+        roi_w, roi_h = x2 - x1, y2 - y1
+        points[..., 0] *= (rx2 - rx1) / roi_w
+        points[..., 0] += (rx1 - x1) / roi_w
+        points[..., 1] *= (ry2 - ry1) / roi_h
+        points[..., 1] += (ry1 - y1) / roi_h
+
+    def _update_track_box(self, results, points):
+        """根据最新关键点更新跟踪裁剪框，跟踪丢失或置信度过低时回退到完整ROI
+        
+        裁剪框覆盖所有置信度足够的手。
+        
+        Args:
+            results: MediaPipe手部检测结果，用于读取置信度
+            points: 已换算为ROI坐标的关键点数组
+        """
+        confident = [
+            i for i, handedness in enumerate(results.multi_handedness or ())
+            if i < len(points) and handedness.classification[0].score >= CONFIG.tracking_min_confidence
+        ]
+        if not confident:
+            if self._track_box is not None:
+                logging.debug("摄像头%s 跟踪丢失，恢复完整ROI检测", self.camera_id)
+            self._track_box = None
+            return
+        
+        pixels = self._landmarks_to_frame(points[confident]).reshape(-1, 2)
+        (px1, py1), (px2, py2) = pixels.min(axis=0), pixels.max(axis=0)
+        # 正方形裁剪框，四周留出余量；边长按32像素取整，减少推理缓冲区的重新分配
+        side = max(px2 - px1, py2 - py1) * (1 + 2 * CONFIG.tracking_padding)
+        side = int(np.ceil(max(side, CONFIG.tracking_min_size) / 32) * 32)
+        
+        y1, y2, x1, x2 = self._cached_roi_coords
+        box_w, box_h = min(side, x2 - x1), min(side, y2 - y1)
+        if box_w == x2 - x1 and box_h == y2 - y1:
+            # 裁剪框已覆盖整个ROI，直接使用ROI
+            self._track_box = None
+            return
+        cx, cy = (px1 + px2) // 2, (py1 + py2) // 2
+        bx1 = int(min(max(cx - box_w // 2, x1), x2 - box_w))
+        by1 = int(min(max(cy - box_h // 2, y1), y2 - box_h))
+        self._track_box = (by1, by1 + box_h, bx1, bx1 + box_w)
+
+    def _create_hands(self, min_confidence):
+        """创建独立使用的Hands模型，有模型池时从池中租用预热好的模型
+
+        Args:
+            min_confidence: 该摄像头的最小检测置信度
+
+        Returns:
+            Hands: 以该置信度创建的视频模式模型
+        """
+        if self.hands_pool is not None:
+            return self.hands_pool.lease(min_confidence)
+        return self.mp_hands.Hands(
+            static_image_mode=False,  # 视频模式
+            max_num_hands=CONFIG.max_num_hands,  # 所有ROI中的手在一次推理中检测
+            min_detection_confidence=min_confidence,
+            min_tracking_confidence=0.5,
+            model_complexity=0  # 使用最轻量级模型
+        )
+
+    def _release_hands(self):
+        """归还或关闭独立使用的Hands模型"""
+        if self.hands is None:
+            return
+        if self.hands_pool is not None:
+            self.hands_pool.release(self.hands)
+        else:
+            self.hands.close()
+        self.hands = None
+
+    def _run_inference(self, rgb_frame):
+        """执行手部检测，优先使用共享推理服务
+
+        Args:
+            rgb_frame: RGB格式的ROI图像
+
+        Returns:
+            MediaPipe手部检测结果；等待共享推理结果超时时为None
+        """
+        self.inference_count += 1
+        if self.inference_service is not None:
+            future = self.inference_service.submit(self.camera_id, rgb_frame)
+            try:
+                return future.result(timeout=CONFIG.inference_timeout)
+            except (FutureTimeoutError, CancelledError):
+                # 推理线程卡住或已退出时不阻塞处理循环；超时不代表没有手，
+                # 由调用方跳过本帧的检测，不能据此重置报警计时
+                future.cancel()
+                self.inference_timeouts += 1
+                logging.warning("摄像头%s 等待推理结果超时（%.1f秒），跳过本帧检测",
+                                self.camera_id, CONFIG.inference_timeout)
+                return None
+        return self.hands.process(rgb_frame)
+
+    def _apply_runtime_config(self):
+        """切换到最新的配置快照，只重新计算发生变化的缓存
+        
+        只在处理线程中调用，因此可以安全地修改缓存和检测状态。
+        """
+        previous, runtime = self.runtime, self._pending_runtime
+        self.runtime = runtime
+        if runtime.regions != previous.regions:
+            # ROI改变后重新计算坐标和推理缓冲区，重新建立背景模型，并放弃旧的跟踪框
+            names = [name for name, _ in runtime.regions]
+            if names != [region_alarm.name for region_alarm in self.regions]:
+                # ROI增减或改名时结束原有的计时和报警
+                self._reset_alarm()
+                self.regions = [RegionAlarm(name) for name in names]
+            self._cached_roi_coords = None
+            self._region_coords = None
+            if self.landmark_filter is not None:
+                self.landmark_filter.reset()
+            if self.landmark_predictor is not None:
+                self.landmark_predictor.reset()
+            self._inference_dims = None
+            self._track_box = None
+            if self.motion_gate is not None:
+                self.motion_gate.reset()
+        if runtime.inference_size != previous.inference_size:
+            self._inference_dims = None
+        if not runtime.tracking_crop:
+            self._track_box = None
+        if runtime.gestures != previous.gestures or runtime.gesture_threshold != previous.gesture_threshold:
+            self.gesture_engine = GestureEngine(runtime.gestures, runtime.gesture_threshold)
+            for region_alarm in self.regions:
+                region_alarm.gesture_values = None
+        if runtime.min_confidence != previous.min_confidence:
+            # 检测阈值在模型创建时确定，置信度变化后换用以新置信度创建的模型
+            if self.inference_service is not None:
+                self.inference_service.register(self.camera_id, runtime.min_confidence)
+            else:
+                self._release_hands()
+                self.hands = self._create_hands(runtime.min_confidence)
+        logging.info("摄像头%s 已应用配置版本 %d", self.camera_id, runtime.version)
+
     def _safe_crop(self, frame):
         """安全裁剪图像，确保ROI在图像范围内
         
+        多个ROI时裁剪它们的外接矩形，所有ROI只需一次推理。
+        
         Args:
             frame: 原始图像
             
         Returns:
-            裁剪后的ROI区域图像
+            裁剪后的检测区域图像
         """
-        # 使用缓存的ROI坐标，避免每帧重新计算
-        if not hasattr(self, '_cached_roi_coords'):
+        # 使用缓存的ROI坐标，避免每帧重新计算；配置版本变化时缓存会被清空
+        if self._cached_roi_coords is None:
             h, w = frame.shape[:2]
-            roi = self.config.roi
-            x1 = max(0, min(roi["x"], w - 1))
-            y1 = max(0, min(roi["y"], h - 1))
-            x2 = min(x1 + roi["w"], w)
-            y2 = min(y1 + roi["h"], h)
-            self._cached_roi_coords = (y1, y2, x1, x2)
+            coords = []
+            for _, (x, y, roi_w, roi_h) in self.runtime.regions:
+                x1 = max(0, min(x, w - 1))
+                y1 = max(0, min(y, h - 1))
+                coords.append((y1, min(y1 + roi_h, h), x1, min(x1 + roi_w, w)))
+            self._region_coords = np.array(coords, dtype=np.int32)
+            self._cached_roi_coords = (
+                min(c[0] for c in coords), max(c[1] for c in coords),
+                min(c[2] for c in coords), max(c[3] for c in coords)
+            )
         
         y1, y2, x1, x2 = self._cached_roi_coords
         return frame[y1:y2, x1:x2]
 
-    def _detect_gesture(self, results):
-        """检测特定手势（拇指和小指靠近）
+    def _assign_hands(self, points):
+        """判断每只手属于哪些ROI（以手掌中心所在位置为准，重叠的ROI可同时包含一只手）
         
         Args:
-            results: MediaPipe手部检测结果
+            points: 形状为(手数, 21, 3)的关键点数组
             
         Returns:
-            bool: 是否检测到目标手势
+            numpy.ndarray: 形状为(手数, ROI数)的布尔数组
         """
-        # 快速路径：如果没有检测到手，直接返回False
-        if not results.multi_hand_landmarks:
-            return False
+        centers = self._landmarks_to_frame(points[:, PALM_POINTS].mean(axis=1, keepdims=True))[:, 0]
+        boxes = self._region_coords
+        x, y = centers[:, None, 0], centers[:, None, 1]
+        return (boxes[:, 2] <= x) & (x < boxes[:, 3]) & (boxes[:, 0] <= y) & (y < boxes[:, 1])
+
+    def _points_in_regions(self, points):
+        """将检测区域归一化坐标的关键点分别换算为每个ROI的归一化坐标
+        
+        多个ROI时检测区域是它们的外接矩形，直接使用会让手势数值随外接矩形的大小变化。
+        
+        Args:
+            points: 形状为(手数, 21, 3)的关键点数组
             
-        # 只检查第一只检测到的手（因为我们设置了max_num_hands=1）
-        hand_landmarks = results.multi_hand_landmarks[0]
+        Returns:
+            tuple: (形状为(ROI数, 手数, 21, 3)的关键点数组, 形状为(ROI数,)的ROI宽高比)
+        """
+        y1, y2, x1, x2 = self._cached_roi_coords
+        box = np.array([x2 - x1, y2 - y1], dtype=np.float32)
+        boxes = self._region_coords
+        origin = (boxes[:, [2, 0]] - (x1, y1)).astype(np.float32)  # ROI左上角在检测区域中的像素位置
+        size = np.maximum(boxes[:, [3, 1]] - boxes[:, [2, 0]], 1).astype(np.float32)
+        region_points = np.empty((len(boxes),) + points.shape, dtype=np.float32)
+        region_points[..., :2] = ((points[None, ..., :2] * box - origin[:, None, None, :])
+                                  / size[:, None, None, :])
+        # z与x一样按宽度归一化
+        region_points[..., 2] = points[None, ..., 2] * (box[0] / size[:, 0])[:, None, None]
+        return region_points, size[:, 0] / size[:, 1]
+
+    def _detect_gesture(self, points):
+        """按配置的手势规则分别判定每个ROI是否存在目标手势
+        
+        每只手先换算为所属ROI的归一化坐标，距离阈值只与该ROI的大小有关，
+        增加相邻ROI不会改变已有ROI的判定；所有手、所有规则的数值一次算出，再按ROI分组。
         
-        # 只获取需要的关键点，避免不必要的计算
-        thumb = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-        pinky = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP]
+        Args:
+            points: 形状为(手数, 21, 3)的关键点数组
+            
+        Returns:
+            numpy.ndarray: 形状为(ROI数,)的布尔数组，表示各ROI是否有手势规则成立
+        """
+        engine = self.gesture_engine
+        detected = np.zeros(len(self.regions), dtype=bool)
+        # 快速路径：如果没有检测到手，直接返回
+        if not len(points) or not len(engine):
+            for region_alarm in self.regions:
+                region_alarm.hand_count = 0
+                region_alarm.active_gestures = ()
+                region_alarm.gesture_values = None
+            return detected
         
-        # 使用曼哈顿距离计算，比欧氏距离计算更快
-        distance = abs(thumb.x - pinky.x) + abs(thumb.y - pinky.y)
+        membership = self._assign_hands(points)
+        region_points, aspects = self._points_in_regions(points)
+        region_values = engine.reduce_by_group(engine.measure(region_points, aspects), membership)
+        hand_counts = membership.sum(axis=0)
         
-        # 应用平滑因子，减少抖动
-        if not hasattr(self, '_last_distance'):
-            self._last_distance = distance
-        else:
-            # 平滑处理，减少误触发
-            distance = CONFIG.smooth_factor * distance + (1 - CONFIG.smooth_factor) * self._last_distance
-            self._last_distance = distance
+        # 关键点已滤波时直接使用规则数值，否则对规则数值做指数平滑
+        smooth = self.runtime.smooth_factor if self.landmark_filter is None else 1.0
+        for i, region_alarm in enumerate(self.regions):
+            region_alarm.hand_count = int(hand_counts[i])
+            if not hand_counts[i]:
+                # 手离开ROI后清空平滑状态，下次出现时不会受旧数值影响
+                region_alarm.active_gestures = ()
+                region_alarm.gesture_values = None
+                continue
+            values = region_values[i]
+            if region_alarm.gesture_values is not None and smooth < 1.0:
+                values = smooth * values + (1 - smooth) * region_alarm.gesture_values
+            region_alarm.gesture_values = values
             
-        return distance < CONFIG.gesture_threshold
+            hits = engine.detect(values)
+            active = engine.active_names(hits)
+            if active != region_alarm.active_gestures:
+                logging.debug("摄像头%s %s 成立的手势: %s", self.camera_id, region_alarm.name, active)
+                region_alarm.active_gestures = active
+            detected[i] = hits.any()
+        return detected
 
-    def _update_alarm_state(self):
-        """更新报警状态，根据检测持续时间触发不同级别的报警"""
+    def _update_alarm_state(self, region_alarm):
+        """更新ROI的报警状态，根据检测持续时间触发不同级别的报警
+        
+        Args:
+            region_alarm: 检测到手势的ROI的报警状态
+        """
         current_time = time.time()
-        if self.detection_start_time == 0:
-            self.detection_start_time = current_time
-            self.played_sounds.clear()
-            logging.debug(f"Camera {self.camera_id} 开始计时")
-        detection_duration = current_time - self.detection_start_time
-        logging.debug(f"Camera {self.camera_id} 检测时长: {detection_duration:.1f}秒")
-
-        for duration in sorted(CONFIG.alarm_triggers):
-            if detection_duration >= duration and duration not in self.played_sounds:
-                logging.info(f"Camera {self.camera_id} 触发 {duration}秒 报警")
-                self.alarm_active = True
-                self._trigger_alarm(duration, continuous=(duration == CONFIG.alarm_triggers[-1]))
-                self.played_sounds.add(duration)
+        changed = False
+        if region_alarm.detection_start_time == 0:
+            region_alarm.detection_start_time = current_time
+            region_alarm.played_sounds.clear()
+            changed = True
+            logging.debug("Camera %s %s 开始计时", self.camera_id, region_alarm.name)
+        detection_duration = current_time - region_alarm.detection_start_time
+        logging.debug("Camera %s %s 检测时长: %.1f秒", self.camera_id, region_alarm.name, detection_duration)
+
+        runtime = self.runtime
+        for duration in runtime.alarm_triggers:
+            if detection_duration >= duration and duration not in region_alarm.played_sounds:
+                logging.info("Camera %s %s 触发 %s秒 报警", self.camera_id, region_alarm.name, duration)
+                region_alarm.alarm_active = True
+                self._trigger_alarm(duration, continuous=(duration == runtime.continuous_trigger))
+                region_alarm.played_sounds.add(duration)
+                if self.clip_buffer is not None and self._pending_clip is None:
+                    # 录制期间触发的更高级别报警已包含在当前片段中
+                    self._pending_clip = (current_time, duration)
+                changed = True
+        
+        if changed:
+            self._publish_status()
 
     def _trigger_alarm(self, duration, continuous=False):
         """触发报警声音
@@ -326,42 +831,118 @@ class VideoProcessor:
             duration: 报警触发的时长级别
             continuous: 是否持续播放
         """
-        if not self.alarm_channel.get_busy():
-            loops = -1 if continuous else 0
-            self.alarm_channel.play(self.alarm_sounds[duration], loops=loops)
+        loops = -1 if continuous else 0
+        # 音频路径随配置快照一起传给音频引擎，引擎线程不读取CONFIG
+        self.alarm_channel.play(self.runtime.sound_path(duration), loops=loops)
 
-    def _reset_alarm(self):
-        """重置报警状态"""
-        if self.detection_start_time > 0:
-            logging.debug(f"Camera {self.camera_id} 检测到手部消失，立即重置状态")
-        self.detection_start_time = 0
-        self.alarm_active = False
-        self.played_sounds.clear()
+    def _record_clip_frame(self, frame, timestamp):
+        """按采样帧率把叠加信息后的帧存入缓冲区，报警后的帧录制完成时提交片段
+        
+        Args:
+            frame: 处理后的图像帧
+            timestamp: 帧时间戳
+        """
+        if self.clip_buffer.should_sample(timestamp):
+            self.clip_buffer.add(frame, timestamp)
+        if self._pending_clip is not None and timestamp >= self._pending_clip[0] + CONFIG.clip_post_seconds:
+            self._submit_clip()
+
+    def _submit_clip(self):
+        """将等待中的片段交给编码器，只做一次非阻塞入队"""
+        trigger_time, level = self._pending_clip
+        self._pending_clip = None
+        frames = self.clip_buffer.frames_between(
+            trigger_time - CONFIG.clip_pre_seconds, trigger_time + CONFIG.clip_post_seconds
+        )
+        self.clip_recorder.submit(self.camera_id, level, trigger_time, frames, CONFIG.clip_fps)
+
+    def _reset_alarm(self, region_alarm=None):
+        """重置报警状态，所有ROI都不再报警时停止报警音
+        
+        Args:
+            region_alarm: 需要重置的ROI，为None时重置所有ROI
+        """
+        targets = self.regions if region_alarm is None else (region_alarm,)
+        changed = False
+        for target in targets:
+            if target.detection_start_time > 0 or target.alarm_active or target.played_sounds:
+                changed = True
+            if target.detection_start_time > 0:
+                logging.debug("Camera %s %s 检测到手部消失，立即重置状态", self.camera_id, target.name)
+            target.detection_start_time = 0
+            target.alarm_active = False
+            target.played_sounds.clear()
+        if not self.alarm_active:
+            self.alarm_channel.stop()
+        if changed:
+            self._publish_status()
+
+    def _publish_status(self):
+        """生成新的状态快照并整体替换引用"""
+        self.status_snapshot = StatusSnapshot(
+            version=next(self._status_versions),
+            status_text=self.get_alarm_status(),
+            alarm_active=self.alarm_active,
+            detection_start_time=self.detection_start_time,
+            played_sounds=self.played_sounds,
+            fps=self._cached_fps
+        )
+
+    def stop_alarm(self):
+        """停止当前报警声音，不改变检测状态"""
         self.alarm_channel.stop()
 
-    def _draw_landmarks(self, frame, results):
+    def reset_alarm(self):
+        """重置报警状态并停止报警声音"""
+        self._reset_alarm()
+
+    def _landmarks_to_frame(self, hand_points):
+        """将检测区域归一化坐标的关键点映射为原始帧的像素坐标
+        
+        关键点坐标相对于送入模型的图像归一化，缩放后的检测区域与原始区域
+        归一化坐标一致，因此只需按检测区域在帧中的位置和尺寸还原。
+        
+        Args:
+            hand_points: 关键点数组，形状为(..., 3)，如单只手(21, 3)或多只手(手数, 21, 3)
+            
+        Returns:
+            numpy.ndarray: 形状为(..., 2)的int32像素坐标
+        """
+        y1, y2, x1, x2 = self._cached_roi_coords
+        pixels = hand_points[..., :2] * (x2 - x1, y2 - y1)
+        pixels += (x1, y1)
+        return pixels.astype(np.int32)
+
+    def _draw_landmarks(self, frame, points):
         """在图像上绘制手部关键点
         
         Args:
             frame: 图像帧
-            results: MediaPipe手部检测结果
+            points: 形状为(手数, 21, 3)的关键点数组
         """
         # 如果没有检测到手，直接返回
-        if not results.multi_hand_landmarks:
+        if not len(points):
             return
             
-        # 使用简化的绘制样式，减少计算量
-        landmark_spec = mp.solutions.drawing_styles.get_default_hand_landmarks_style()
-        connection_spec = mp.solutions.drawing_styles.get_default_hand_connections_style()
-        
-        # 只绘制第一只检测到的手（因为我们设置了max_num_hands=1）
-        mp.solutions.drawing_utils.draw_landmarks(
-            frame,
-            results.multi_hand_landmarks[0],
-            self.mp_hands.HAND_CONNECTIONS,
-            landmark_drawing_spec=landmark_spec,
-            connection_drawing_spec=connection_spec
-        )
+        # 所有手的骨架连线一次绘制
+        pixels = self._landmarks_to_frame(points)
+        cv2.polylines(frame, list(pixels[:, self._hand_connections].reshape(-1, 2, 2)),
+                      False, (224, 224, 224), 2)
+        for x, y in pixels.reshape(-1, 2):
+            cv2.circle(frame, (int(x), int(y)), 4, (0, 0, 255), -1)
+
+    def _draw_predicted_landmarks(self, frame, timestamp):
+        """绘制外推到当前时刻的手部关键点，没有有效的检测结果时不绘制
+        
+        Args:
+            frame: 图像帧
+            timestamp: 当前帧时间戳（秒）
+        """
+        if self.landmark_predictor is None:
+            return
+        points = self.landmark_predictor.predict(timestamp)
+        if points is not None:
+            self._draw_landmarks(frame, points)
 
     def _add_overlay(self, frame):
         """添加图像叠加信息（ROI框、FPS等）
@@ -369,12 +950,13 @@ class VideoProcessor:
         Args:
             frame: 图像帧
         """
-        # 仅在需要时绘制ROI框
+        # 仅在需要时绘制ROI框，正在报警的ROI显示为红色
         if CONFIG.show_roi:
             # 使用缓存的ROI坐标
-            if hasattr(self, '_cached_roi_coords'):
-                y1, y2, x1, x2 = self._cached_roi_coords
-                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+            if self._region_coords is not None:
+                for region_alarm, (y1, y2, x1, x2) in zip(self.regions, self._region_coords):
+                    color = (0, 0, 255) if region_alarm.alarm_active else (0, 255, 0)
+                    cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), color, 2)
             else:
                 roi = self.config.roi
                 cv2.rectangle(frame, (roi["x"], roi["y"]), (roi["x"] + roi["w"], roi["y"] + roi["h"]), (0, 255, 0), 2)
@@ -388,6 +970,9 @@ class VideoProcessor:
         else:
             self._cached_fps = int(self.fps_counter.get_average())
             self._last_fps_update = time.time()
+        
+        if self._cached_fps != self.status_snapshot.fps:
+            self._publish_status()
             
         if CONFIG.show_fps:
             cv2.putText(frame, f"FPS: {self._cached_fps}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
@@ -410,28 +995,92 @@ class VideoProcessor:
         cv2.imshow(f'Camera {self.camera_id}', display_frame)
 
     def _handle_stream_error(self):
-        """处理视频流错误，尝试重新连接摄像头"""
-        logging.warning(f"摄像头{self.camera_id} 断流，尝试重连...")
+        """处理视频流错误，交给重连监督器在后台处理"""
+        self.reconnector.report_failure()
+
+    def _reopen_capture(self):
+        """重新打开视频源（在重连线程中调用，此时处理循环不读取帧）
+        
+        采集线程退出之后才释放旧的视频源；线程仍阻塞在读取中时本次重连失败，
+        由重连监督器退避后重试。
+        
+        Raises:
+            RuntimeError: 当采集线程未退出或无法打开视频源时
+        """
+        if not self.grabber.stop():
+            raise RuntimeError("采集线程仍在读取旧视频源")
         self.cap.release()
-        time.sleep(1)
-        try:
-            self.cap = cv2.VideoCapture(self.config.source)
-            if not self.cap.isOpened():
-                raise RuntimeError("摄像头打开失败")
-            logging.info(f"摄像头{self.camera_id} 重连成功")
-        except Exception as e:
-            logging.error(f"摄像头{self.camera_id} 重连失败: {str(e)}")
+        self.cap = self._open_capture()
+        self.grabber.restart(self.cap)
+
+    def _on_connection_change(self, state):
+        """连接状态变化时发布新的状态快照"""
+        self._publish_status()
+        if self.status_publisher is not None:
+            self.status_publisher.publish(self)
+
+    @property
+    def detection_start_time(self):
+        """最早开始检测的ROI的开始时间，没有ROI在检测时为0"""
+        return min((r.detection_start_time for r in self.regions if r.detection_start_time > 0), default=0)
+
+    @property
+    def last_detection(self):
+        """最近一次检测到手势的时间"""
+        return max(r.last_detection for r in self.regions)
+
+    @property
+    def alarm_active(self):
+        """是否有ROI正在报警"""
+        return any(r.alarm_active for r in self.regions)
+
+    @property
+    def played_sounds(self):
+        """所有ROI已触发的报警级别"""
+        return frozenset().union(*(r.played_sounds for r in self.regions))
+
+    @property
+    def reconnect_count(self):
+        """重连尝试次数"""
+        return self.reconnector.reconnect_count
+
+    def _release_audio(self):
+        """归还报警声道，独占的音频引擎随处理器一起关闭"""
+        self.alarm_channel.close()
+        if self._owns_audio_engine:
+            self.audio_engine.shutdown()
+
+    def _release_clip_recording(self):
+        """提交未录制完的片段，独占的编码器写完后关闭"""
+        if self.clip_buffer is None:
+            return
+        if self._pending_clip is not None:
+            self._submit_clip()
+        if self._owns_clip_recorder:
+            self.clip_recorder.shutdown()
+
+    def _release_display(self):
+        """关闭显示窗口"""
+        cv2.destroyAllWindows()
 
     def _release_resources(self):
         """释放所有资源"""
         try:
-            self.cap.release()
-            self.hands.close()
-            pygame.mixer.quit()
-            cv2.destroyAllWindows()
-            logging.info(f"摄像头{self.camera_id} 资源已释放")
+            self.reconnector.stop()
+            if self.grabber.stop():
+                self.cap.release()
+            else:
+                # 采集线程仍在读取，释放视频源会导致其访问已释放的对象
+                logging.warning("摄像头%s 采集线程未退出，跳过释放视频源", self.camera_id)
+            self._release_hands()
+            if self.inference_service is not None:
+                self.inference_service.unregister(self.camera_id)
+            self._release_audio()
+            self._release_clip_recording()
+            self._release_display()
+            logging.info("摄像头%s 资源已释放", self.camera_id)
         except Exception as e:
-            logging.error(f"资源释放失败: {str(e)}")
+            logging.error("摄像头%s 资源释放失败: %s", self.camera_id, e)
             
     def get_detection_duration(self):
         """Get current detection duration
@@ -453,28 +1102,85 @@ class VideoProcessor:
             'status': self.get_alarm_status(),
             'fps': self.fps_counter.get_average(),
             'detection_time': self.get_detection_duration(),
-            'alarm_level': len(self.played_sounds)
+            'alarm_level': len(self.played_sounds),
+            'dropped_frames': self.grabber.dropped_frames,
+            'frame_time_ms': self.fps_counter.get_frame_time_percentiles()
         }
+        status['tracking'] = self._track_box is not None
+        if self.landmark_filter is not None:
+            status['landmark_filter_resets'] = self.landmark_filter.reset_count
+        status['gestures'] = list(dict.fromkeys(g for r in self.regions for g in r.active_gestures))
+        if len(self.regions) > 1:
+            now = time.time()
+            status['regions'] = {
+                r.name: {
+                    'status': r.status_text(self.runtime.continuous_trigger),
+                    'detection_time': r.detection_duration(now),
+                    'alarm_level': r.alarm_level,
+                    'hands': r.hand_count,
+                    'gestures': list(r.active_gestures)
+                }
+                for r in self.regions
+            }
+        status.update(self.reconnector.get_stats())
+        if self.stage_timer.enabled:
+            status['stage_latency_ms'] = self.stage_timer.summary()
+        status.update(self.scheduler.get_stats())
+        if self.motion_gate is not None:
+            status.update(self.motion_gate.get_stats())
+        if self.clip_buffer is not None:
+            status.update(self.clip_buffer.get_stats())
         return status
 
+    def get_metrics(self):
+        """获取监控指标的原始数值
+        
+        只读取计数器和简单属性，不加锁，供监控指标接口在其他线程中调用。
+        
+        Returns:
+            dict: 帧率、处理耗时、丢帧数、推理次数、推理超时次数、报警级别、检测时长和重连次数
+        """
+        return {
+            'fps': self.fps_counter.get_average(),
+            'processing_latency': self.processing_latency,
+            'dropped_frames': self.grabber.dropped_frames,
+            'inference_count': self.inference_count,
+            'inference_timeouts': self.inference_timeouts,
+            'alarm_level': self.status_snapshot.alarm_level,
+            'detection_duration': self.status_snapshot.detection_duration(),
+            'reconnect_count': self.reconnect_count,
+            'connected': 1 if self.reconnector.connected else 0
+        }
+
     def get_alarm_status(self):
-        if self.alarm_active and self.played_sounds:
-            last_played = max(self.played_sounds)
-            if last_played == CONFIG.alarm_triggers[-1]:
-                return f"持续报警 ({last_played}秒)"
-            return f"报警触发 ({last_played}秒)"
-        elif self.detection_start_time > 0:
-            return "检测中"
-        return "无报警"
-        
-    def update_roi(self):
-        """更新ROI设置，从CONFIG重新加载当前摄像头的ROI配置"""
+        if self.reconnector.state == ReconnectSupervisor.RECONNECTING:
+            return "摄像头断线，重连中"
+        if self.reconnector.state == ReconnectSupervisor.DISCONNECTED:
+            return "摄像头已断开"
+        continuous = self.runtime.continuous_trigger
+        if len(self.regions) == 1:
+            return self.regions[0].status_text(continuous)
+        texts = [
+            f"{r.name}: {r.status_text(continuous)}"
+            for r in self.regions if r.detection_start_time > 0
+        ]
+        return "；".join(texts) if texts else "无报警"
+        
+    def update_roi(self, config=None):
+        """从配置重新加载当前摄像头的配置（ROI、检测灵敏度、报警间隔等）
+        
+        在UI线程（多进程模式下为子进程的命令线程）中调用：校验ROI后生成新的配置快照，
+        处理线程在下一帧开始前切换到新快照，无需重启摄像头。
+        
+        Args:
+            config: 读取参数的配置对象，默认为CONFIG；多进程模式下为父进程发来的配置
+        
+        Returns:
+            bool: ROI设置是否有效
+        """
+        config = CONFIG if config is None else config
         # 更新配置对象引用
-        self.config = CONFIG.cameras[self.camera_id]
-        # 确保更新后的ROI设置被正确应用
-        if hasattr(self, 'hands') and self.hands:
-            # 如果需要，可以根据新的ROI设置更新手部检测参数
-            self.hands.min_detection_confidence = self.config.min_confidence
+        self.config = config.cameras[self.camera_id]
             
         # 验证ROI设置的有效性
         roi = self.config.roi
@@ -496,6 +1202,9 @@ class VideoProcessor:
                 self.config.roi['h'] = min(roi['h'], frame_height - self.config.roi['y'])
                 logging.info(f"摄像头{self.camera_id} ROI已自动调整为: {self.config.roi}")
         
+        # 提交新快照，由处理线程在两帧之间切换
+        self._pending_runtime = RuntimeConfig.from_config(self.camera_id, next(self._config_versions), config)
+        
         # 记录日志
         logging.info(f"摄像头{self.camera_id} ROI设置已更新: {self.config.roi}")
         return True
\ No newline at end of file
@@ -76,6 +76,7 @@ class UIStyles:
         "normal": "#43a047",  # 绿色
         "detecting": "#ff9800",  # 橙色
         "alarm": "#e53935",  # 红色
+        "transition": "#1e88e5",  # 蓝色 - 启动/停止中
         "disabled": "#9e9e9e"  # 灰色
     }
     
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+# tests/conftest.py
+# 测试公共设置：把项目根目录加入导入路径，直接运行pytest时也能导入config和modules
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
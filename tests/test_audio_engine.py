@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# tests/test_audio_engine.py
+# 报警音频引擎测试：用记录调用的混音器替身代替pygame.mixer，不需要声卡
+
+import importlib
+import sys
+import threading
+import types
+
+import pytest
+
+class FakeSound:
+    def __init__(self, path):
+        self.path = path
+
+class FakeChannel:
+    def __init__(self, index):
+        self.index = index
+        self.volume = None
+        self.busy = False
+        self.played = []
+        self.stopped = 0
+
+    def set_volume(self, volume):
+        self.volume = volume
+
+    def get_busy(self):
+        return self.busy
+
+    def play(self, sound, loops=0):
+        self.played.append((sound, loops))
+        self.busy = True
+
+    def stop(self):
+        self.stopped += 1
+        self.busy = False
+
+class FakeMixer:
+    """pygame.mixer的替身，记录解码和声道操作"""
+
+    def __init__(self, missing=(), fail_init=False):
+        self.missing = set(missing)
+        self.fail_init = fail_init
+        self.initialized = False
+        self.loaded = []
+        self.channels = {}
+        self.num_channels = 8
+        self.quit_calls = 0
+        self.threads = set()
+
+    def _record_thread(self):
+        self.threads.add(threading.get_ident())
+
+    def get_init(self):
+        return self.initialized
+
+    def init(self, **kwargs):
+        self._record_thread()
+        if self.fail_init:
+            raise RuntimeError("No available audio device")
+        self.initialized = True
+
+    def quit(self):
+        self._record_thread()
+        self.quit_calls += 1
+        self.initialized = False
+
+    def Sound(self, path):
+        self._record_thread()
+        if path in self.missing:
+            raise FileNotFoundError(path)
+        self.loaded.append(path)
+        return FakeSound(path)
+
+    def get_num_channels(self):
+        return self.num_channels
+
+    def set_num_channels(self, count):
+        self.num_channels = count
+
+    def Channel(self, index):
+        self._record_thread()
+        return self.channels.setdefault(index, FakeChannel(index))
+
+@pytest.fixture
+def make_engine(monkeypatch):
+    """创建使用混音器替身的AudioEngine，测试结束时停止引擎线程"""
+    monkeypatch.setitem(sys.modules, 'pygame', types.ModuleType('pygame'))
+    audio_engine = importlib.import_module('modules.audio_engine')
+    monkeypatch.setenv('SDL_AUDIODRIVER', 'dummy')
+    engines = []
+
+    def factory(sound_paths=('a.wav', 'b.wav'), **mixer_options):
+        mixer = FakeMixer(**mixer_options)
+        monkeypatch.setattr(audio_engine, 'pygame', types.SimpleNamespace(mixer=mixer))
+        engine = audio_engine.AudioEngine(driver='dummy', sound_paths=sound_paths)
+        engine.fallback_sound = 'fallback.wav'
+        engine.volume = 0.5
+        engine.start()
+        engines.append(engine)
+        return engine, mixer
+
+    yield factory
+    for engine in engines:
+        engine.shutdown()
+
+def test_sounds_decoded_once_and_shared(make_engine):
+    engine, mixer = make_engine()
+    first = engine.open_channel(0)
+    second = engine.open_channel(1)
+    first.play('a.wav')
+    second.play('a.wav', loops=-1)
+    engine.shutdown()
+
+    assert mixer.loaded == ['a.wav', 'b.wav']
+    sound0, loops0 = mixer.channels[0].played[0]
+    sound1, loops1 = mixer.channels[1].played[0]
+    assert sound0 is sound1
+    assert (loops0, loops1) == (0, -1)
+    assert mixer.channels[0].volume == 0.5
+
+def test_mixer_used_only_on_engine_thread(make_engine):
+    engine, mixer = make_engine()
+    engine.open_channel(0).play('b.wav')
+    engine.shutdown()
+
+    assert mixer.quit_calls == 1
+    assert len(mixer.threads) == 1
+    assert threading.get_ident() not in mixer.threads
+
+def test_busy_channel_is_not_interrupted(make_engine):
+    engine, mixer = make_engine()
+    channel = engine.open_channel(0)
+    channel.play('a.wav')
+    channel.play('b.wav')
+    channel.stop()
+    channel.play('b.wav')
+    engine.shutdown()
+
+    played = [sound.path for sound, _ in mixer.channels[0].played]
+    assert played == ['a.wav', 'b.wav']
+    assert mixer.channels[0].stopped == 1
+
+def test_closed_channel_index_is_reused(make_engine):
+    engine, mixer = make_engine()
+    engine.open_channel(0)
+    engine.open_channel(1).close()
+    engine.open_channel(2).play('a.wav')
+    engine.shutdown()
+
+    assert set(mixer.channels) == {0, 1}
+    assert mixer.channels[1].played[0][0].path == 'a.wav'
+
+def test_channels_grow_past_mixer_default(make_engine):
+    engine, mixer = make_engine()
+    for camera_id in range(10):
+        engine.open_channel(camera_id)
+    engine.shutdown()
+
+    assert mixer.num_channels == 10
+    assert set(mixer.channels) == set(range(10))
+
+def test_missing_sound_uses_fallback(make_engine):
+    engine, mixer = make_engine(sound_paths=(), missing={'gone.wav'})
+    engine.open_channel(0).play('gone.wav')
+    engine.shutdown()
+
+    assert mixer.loaded == ['fallback.wav']
+    assert mixer.channels[0].played[0][0].path == 'fallback.wav'
+
+def test_init_failure_ignores_commands(make_engine):
+    engine, mixer = make_engine(fail_init=True)
+    engine.open_channel(0).play('a.wav')
+    engine.shutdown()
+
+    assert mixer.channels == {}
+    assert mixer.loaded == []
+    assert mixer.quit_calls == 0
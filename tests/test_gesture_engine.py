@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# tests/test_gesture_engine.py
+# 手势判定引擎测试：非正方形ROI中的角度和弯曲数值
+
+import numpy as np
+import pytest
+
+from config import GestureConfig
+from modules.gesture_engine import GestureEngine
+
+ROI_W, ROI_H = 800, 600  # 默认ROI尺寸
+
+def hand_from_pixels(pixels, roi_w=ROI_W, roi_h=ROI_H):
+    """由ROI内的像素坐标构造一只手的ROI归一化关键点，未给出的点位于原点"""
+    points = np.zeros((1, 21, 3), dtype=np.float32)
+    for index, (x, y) in pixels.items():
+        points[0, index] = (x / roi_w, y / roi_h, 0.0)
+    return points
+
+def test_angle_on_non_square_roi():
+    engine = GestureEngine([GestureConfig("angle", "angle", (1, 0, 2), 60.0)], 0.3)
+    # 像素空间中两条边的夹角为45度
+    points = hand_from_pixels({0: (400, 300), 1: (500, 300), 2: (500, 200)})
+
+    assert engine.measure(points, ROI_W / ROI_H)[0, 0] == pytest.approx(45.0, abs=1e-3)
+    # 不按宽高比换算时归一化坐标中的夹角约为53度
+    assert engine.measure(points)[0, 0] == pytest.approx(53.13, abs=1e-2)
+    assert engine.detect(engine.measure(points, ROI_W / ROI_H))[0, 0]
+
+def test_same_pose_same_angle_for_any_roi_shape():
+    engine = GestureEngine([GestureConfig("angle", "angle", (1, 0, 2), 60.0)], 0.3)
+    pose = {0: (100, 100), 1: (160, 100), 2: (130, 40)}
+    values = [
+        engine.measure(hand_from_pixels(pose, w, h), w / h)[0, 0]
+        for w, h in ((800, 600), (600, 800), (400, 400), (1280, 360))
+    ]
+    assert values == pytest.approx([values[0]] * len(values), abs=1e-3)
+
+def test_curl_ratio_uses_pixel_lengths():
+    engine = GestureEngine([GestureConfig("curl", "curl", (0, 5, 8), 1.2)], 0.3)
+    # 手腕到指根100像素（竖直），手腕到指尖100像素（水平），像素长度之比为1
+    points = hand_from_pixels({0: (400, 300), 5: (400, 200), 8: (500, 300)})
+
+    assert engine.measure(points, ROI_W / ROI_H)[0, 0] == pytest.approx(1.0, abs=1e-4)
+    assert engine.measure(points)[0, 0] == pytest.approx(0.75, abs=1e-4)
+
+def test_distance_stays_roi_normalised():
+    engine = GestureEngine([GestureConfig("distance", "distance", (4, 20), None)], 0.3)
+    points = hand_from_pixels({4: (400, 300), 20: (480, 360)})
+
+    expected = 80 / ROI_W + 60 / ROI_H
+    assert engine.measure(points, ROI_W / ROI_H)[0, 0] == pytest.approx(expected, abs=1e-5)
+    assert engine.measure(points)[0, 0] == pytest.approx(expected, abs=1e-5)
+
+def test_per_group_aspect_broadcast():
+    engine = GestureEngine([GestureConfig("angle", "angle", (1, 0, 2), 60.0)], 0.3)
+    pose = {0: (100, 100), 1: (160, 100), 2: (160, 40)}
+    stacked = np.concatenate([hand_from_pixels(pose, 800, 600)[None],
+                              hand_from_pixels(pose, 300, 600)[None]])
+    values = engine.measure(stacked, np.array([800 / 600, 300 / 600]))
+
+    assert values.shape == (2, 1, 1)
+    assert values[:, 0, 0] == pytest.approx([45.0, 45.0], abs=1e-3)
+
+def test_reduce_by_group_with_per_group_values():
+    engine = GestureEngine([GestureConfig("distance", "distance", (4, 20), 0.3)], 0.3)
+    # 两只手在两个ROI中分别换算后的数值，(组数, 手数, 规则数)
+    values = np.array([[[0.2], [0.9]], [[0.5], [0.1]]], dtype=np.float32)
+    membership = np.array([[True, False], [True, True]])
+
+    reduced = engine.reduce_by_group(values, membership)
+    assert reduced[:, 0] == pytest.approx([0.2, 0.1])
+    assert engine.detect(reduced)[:, 0].tolist() == [True, True]
+
+    # 所有组共用的(手数, 规则数)数值仍然可用，没有手的组不成立
+    shared = engine.reduce_by_group(values[0], np.array([[True, False], [False, False]]))
+    assert shared[0, 0] == pytest.approx(0.2)
+    assert np.isinf(shared[1, 0])
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# tests/test_metrics_server.py
+# 监控指标接口测试：在系统分配的端口上启动服务并抓取 /metrics
+
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+
+from modules.metrics_server import METRICS, MetricsServer
+
+class FakeProcessor:
+    """只提供get_metrics()的处理器替身"""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def get_metrics(self):
+        return self.metrics
+
+class BrokenProcessor:
+    def get_metrics(self):
+        raise RuntimeError("处理器已停止")
+
+@pytest.fixture
+def server():
+    processors = {
+        1: FakeProcessor({'fps': 24.5, 'processing_latency': 0.012, 'dropped_frames': 3,
+                          'inference_count': 120, 'alarm_level': 0, 'detection_duration': 0.0,
+                          'reconnect_count': 1, 'connected': True}),
+        0: FakeProcessor({'fps': 30.0, 'dropped_frames': 0}),
+        2: BrokenProcessor(),
+    }
+    metrics_server = MetricsServer(SimpleNamespace(processors=processors), port=0)
+    metrics_server.start()
+    yield metrics_server
+    metrics_server.stop()
+
+def scrape(server, path='/metrics'):
+    url = f"http://{server.host}:{server.port}{path}"
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.headers, response.read().decode('utf-8')
+
+def test_port_zero_is_resolved(server):
+    assert server.port != 0
+
+def test_exposition_format(server):
+    headers, body = scrape(server)
+    assert headers['Content-Type'].startswith('text/plain; version=0.0.4')
+    assert body.endswith("\n")
+
+    lines = body.splitlines()
+    for name, metric_type, _, _ in METRICS:
+        help_index = lines.index(next(line for line in lines if line.startswith(f"# HELP {name} ")))
+        assert lines[help_index + 1] == f"# TYPE {name} {metric_type}"
+
+    # 样本行为 "名称{标签} 数值"，数值可以按浮点数解析
+    for line in lines:
+        if line.startswith('#'):
+            continue
+        name, value = line.rsplit(' ', 1)
+        float(value)
+        assert name.split('{', 1)[0].startswith('icu_')
+
+def test_samples_per_camera(server):
+    _, body = scrape(server)
+    lines = body.splitlines()
+    assert 'icu_camera_fps{camera="0"} 30' in lines
+    assert 'icu_camera_fps{camera="1"} 24.5' in lines
+    assert 'icu_camera_connected{camera="1"} 1' in lines
+    assert 'icu_camera_dropped_frames_total{camera="1"} 3' in lines
+    # 缺少的字段不输出样本，读取失败的摄像头整体跳过
+    assert not any(line.startswith('icu_camera_processing_latency_seconds{camera="0"}') for line in lines)
+    assert not any('camera="2"' in line for line in lines)
+    # 按摄像头ID排序输出
+    assert lines.index('icu_camera_fps{camera="0"} 30') < lines.index('icu_camera_fps{camera="1"} 24.5')
+    assert 'icu_cameras_running 2' in lines
+    assert 'icu_log_dropped_total 0' in lines
+
+def test_unknown_path_returns_404(server):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        scrape(server, '/other')
+    assert excinfo.value.code == 404
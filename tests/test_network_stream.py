@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+# tests/test_network_stream.py
+# 网络流接入测试：FFmpeg选项，以及通过本地MJPEG服务（benchmarks.stream_server）的采集和断流重连
+
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from config import CameraConfig
+
+STREAM_PATH = "/stream.mjpg"
+RESOLUTION = (320, 240)
+
+def make_camera(source, **kwargs):
+    return CameraConfig(source=source, roi={"x": 0, "y": 0, "w": 10, "h": 10},
+                        min_confidence=0.5, resolution=(640, 480), **kwargs)
+
+@pytest.mark.parametrize("source, transport, expected", [
+    ("rtsp://10.0.0.2/stream1", "tcp", "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay"),
+    ("RTSPS://10.0.0.2/stream1", "udp", "rtsp_transport;udp|fflags;nobuffer|flags;low_delay"),
+    ("http://10.0.0.3:8081/video.mjpg", "tcp", "fflags;nobuffer|flags;low_delay"),
+])
+def test_ffmpeg_options(source, transport, expected):
+    camera = make_camera(source, stream_transport=transport)
+    assert camera.is_network_stream
+    assert camera.ffmpeg_options == expected
+
+def test_local_source_is_not_a_stream():
+    assert not make_camera(0).is_network_stream
+    assert not make_camera("recordings/bed1.mp4").is_network_stream
+
+@pytest.fixture
+def stream_server():
+    """在系统分配的端口上启动本地MJPEG服务，每秒断开一次所有客户端（--drop-every 1）"""
+    pytest.importorskip("cv2")
+    pytest.importorskip("mediapipe")
+    pytest.importorskip("pygame")
+    from benchmarks.replay import generate_frames
+    from benchmarks.stream_server import FrameSource, encode_frames, make_handler
+
+    source = FrameSource(encode_frames(generate_frames(30, RESOLUTION), 80), fps=20, drop_every=1.0)
+    clock = threading.Thread(target=source.run, name="StreamClock", daemon=True)
+    clock.start()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(source, STREAM_PATH))
+    server.daemon_threads = True
+    serve = threading.Thread(target=server.serve_forever, name="StreamServer", daemon=True)
+    serve.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}{STREAM_PATH}"
+    source.stop()
+    server.shutdown()
+    server.server_close()
+
+def test_stream_frames_and_reconnect(stream_server):
+    from modules.frame_grabber import FrameGrabber
+    from modules.reconnect_supervisor import ReconnectSupervisor
+    from modules.video_processor import VideoProcessor
+
+    camera = make_camera(stream_server, stream_open_timeout=5.0, stream_read_timeout=2.0)
+    # 只使用打开网络流所需的属性，不初始化模型和音频
+    opener = SimpleNamespace(config=camera, camera_id=0)
+    grabber = FrameGrabber(VideoProcessor._init_stream_capture(opener), name="TestGrabber")
+    connected = threading.Event()
+
+    def reopen():
+        grabber.restart(VideoProcessor._init_stream_capture(opener))
+
+    def on_state_change(state):
+        if state == ReconnectSupervisor.CONNECTED:
+            connected.set()
+
+    supervisor = ReconnectSupervisor(0, reopen, on_state_change=on_state_change,
+                                     base_delay=0.1, jitter=0.0)
+    grabber.start()
+    frames_before = frames_after = 0
+    deadline = time.monotonic() + 15
+    try:
+        while time.monotonic() < deadline and not frames_after:
+            ret, frame = grabber.read(2.0)
+            if ret:
+                assert frame.shape == (RESOLUTION[1], RESOLUTION[0], 3)
+                if supervisor.disconnect_count:
+                    frames_after += 1
+                else:
+                    frames_before += 1
+                continue
+            # 与处理循环相同：读取失败时报告断流，由监督器在后台重连
+            assert grabber.stream_error
+            supervisor.report_failure()
+            assert connected.wait(10)
+            connected.clear()
+    finally:
+        supervisor.stop()
+        if grabber.stop():
+            grabber.cap.release()
+
+    assert frames_before > 0
+    assert supervisor.disconnect_count >= 1
+    assert supervisor.reconnect_count >= 1
+    assert frames_after > 0
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# tests/test_process_runner.py
+# 多进程运行模式测试：状态文本共享缓冲区、子进程日志经父进程输出
+
+import logging
+import queue
+
+import numpy as np
+
+from config import ProcessQueueHandler, create_process_log_listener
+from modules.process_runner import (
+    STATUS_TEXT_BYTES, SharedRing, encode_status_text, decode_status_text
+)
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+def test_status_text_round_trip_through_shared_ring():
+    ring = SharedRing((STATUS_TEXT_BYTES,), np.uint8, 2)
+    reader = SharedRing.attach(ring.spec())
+    try:
+        ring.write(encode_status_text("床头区 持续报警 (15秒)"))
+        seq, data = reader.read_latest()
+        assert seq == 0
+        assert decode_status_text(data) == "床头区 持续报警 (15秒)"
+    finally:
+        reader.close()
+        ring.close()
+
+def test_status_text_truncated_on_character_boundary():
+    text = "报警" * STATUS_TEXT_BYTES
+    decoded = decode_status_text(encode_status_text(text))
+    assert len(decoded.encode('utf-8')) <= STATUS_TEXT_BYTES
+    assert text.startswith(decoded)
+
+def test_child_records_forwarded_to_parent_logger():
+    log_queue = queue.Queue()
+    child_handler = ProcessQueueHandler(log_queue)
+    logger = logging.getLogger("test_process_runner.child")
+    logger.propagate = False
+    recorder = RecordingHandler()
+    logger.addHandler(recorder)
+    listener = create_process_log_listener(log_queue)
+    try:
+        record = logging.LogRecord(
+            logger.name, logging.INFO, __file__, 1, "摄像头%s 已启动", (3,), None
+        )
+        child_handler.handle(record)
+    finally:
+        listener.stop()
+        logger.removeHandler(recorder)
+    assert [r.getMessage() for r in recorder.records] == ["摄像头3 已启动"]
+    # 跨进程传递前已格式化，参数不再需要序列化
+    assert recorder.records[0].args is None
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# tests/test_reconnect_supervisor.py
+# 断线重连监督器测试：退避间隔和抖动范围、后台重连流程
+
+import threading
+
+import pytest
+
+from modules.reconnect_supervisor import ReconnectSupervisor
+
+def make_supervisor(reopen=lambda: None, **kwargs):
+    return ReconnectSupervisor(0, reopen, **kwargs)
+
+@pytest.mark.parametrize("attempt", range(8))
+def test_next_delay_within_jitter_bounds(attempt):
+    supervisor = make_supervisor(base_delay=1.0, max_delay=30.0, jitter=0.5)
+    expected = min(30.0, 2 ** attempt)
+    for _ in range(200):
+        delay = supervisor.next_delay(attempt)
+        assert expected * 0.5 <= delay <= expected * 1.5
+
+def test_next_delay_capped_at_max_delay():
+    supervisor = make_supervisor(base_delay=1.0, max_delay=30.0, jitter=0.5)
+    delays = [supervisor.next_delay(20) for _ in range(200)]
+    assert max(delays) <= 45.0
+    assert min(delays) >= 15.0
+
+def test_next_delay_without_jitter_is_exponential():
+    supervisor = make_supervisor(base_delay=0.5, max_delay=4.0, jitter=0.0)
+    assert [supervisor.next_delay(n) for n in range(5)] == [0.5, 1.0, 2.0, 4.0, 4.0]
+
+def test_jitter_spreads_delays():
+    supervisor = make_supervisor(base_delay=1.0, jitter=0.5)
+    assert len({supervisor.next_delay(0) for _ in range(20)}) > 1
+
+def test_parameters_are_clamped():
+    supervisor = make_supervisor(base_delay=-1.0, max_delay=-5.0, jitter=3.0)
+    assert supervisor.base_delay == 0.0
+    assert supervisor.max_delay == 0.0
+    assert supervisor.jitter == 1.0
+    assert supervisor.next_delay(3) == 0.0
+
+def test_reconnects_in_background_until_reopen_succeeds():
+    calls = []
+    states = []
+    connected = threading.Event()
+    reported = threading.Event()
+
+    def reopen():
+        # 等重复报告发出后再继续，否则重连可能先于第二次报告完成
+        reported.wait(5)
+        calls.append(threading.get_ident())
+        if len(calls) < 3:
+            raise RuntimeError("无法打开网络流")
+
+    def on_state_change(state):
+        states.append(state)
+        if state == ReconnectSupervisor.CONNECTED:
+            connected.set()
+
+    supervisor = make_supervisor(reopen, on_state_change=on_state_change,
+                                 base_delay=0.0, jitter=0.0)
+    supervisor.report_failure()
+    supervisor.report_failure()  # 重连期间的重复报告被忽略
+    reported.set()
+    assert connected.wait(5)
+    supervisor.stop()
+
+    assert len(calls) == 3
+    assert threading.get_ident() not in calls
+    assert states == [ReconnectSupervisor.RECONNECTING, ReconnectSupervisor.CONNECTED]
+    assert supervisor.get_stats() == {
+        'connection_state': ReconnectSupervisor.CONNECTED,
+        'disconnect_count': 1,
+        'reconnect_count': 3,
+    }
+
+def test_disabled_supervisor_stays_disconnected():
+    calls = []
+    supervisor = make_supervisor(calls.append, enabled=False)
+    supervisor.report_failure()
+
+    assert supervisor.state == ReconnectSupervisor.DISCONNECTED
+    assert supervisor.disconnect_count == 1
+    assert calls == []
+
+def test_stop_interrupts_backoff_wait():
+    supervisor = make_supervisor(base_delay=60.0, jitter=0.0)
+    supervisor.report_failure()
+    thread = supervisor._thread
+    supervisor.stop(timeout=2)
+
+    assert not thread.is_alive()
+    assert supervisor.reconnect_count == 0